@@ -0,0 +1,44 @@
+"""add typed database status columns
+
+Revision ID: 9549a83193ac
+Revises: 1e625232ad35
+Create Date: 2026-10-17 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9549a83193ac'
+down_revision = '1e625232ad35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("maintenance_information", sa.Column("maintenance_mode", sa.Boolean, nullable=True))
+    op.add_column("maintenance_information", sa.Column("last_update", sa.BigInteger, nullable=True))
+
+    connection = op.get_bind()
+    # Move maintenance mode and last update from the JSON values of the database status into the new columns.
+    # Older versions stored the last update as float (e.g. 1792253912.694471), which can only be cast to bigint via numeric.
+    connection.execute(sa.text(
+        "UPDATE maintenance_information SET "
+        "maintenance_mode = COALESCE((values->>'maintenance_mode')::boolean, false), "
+        "last_update = COALESCE((values->>'last_update')::numeric::bigint, 0), "
+        "values = values - 'maintenance_mode' - 'last_update' "
+        "WHERE key = 'database_status';"
+    ))
+
+
+def downgrade():
+    connection = op.get_bind()
+    connection.execute(sa.text(
+        "UPDATE maintenance_information SET "
+        "values = values || jsonb_build_object('maintenance_mode', maintenance_mode, 'last_update', last_update) "
+        "WHERE key = 'database_status';"
+    ))
+
+    op.drop_column("maintenance_information", "last_update")
+    op.drop_column("maintenance_information", "maintenance_mode")
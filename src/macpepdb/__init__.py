@@ -1,5 +1,9 @@
 # std imports
+import sys
 from multiprocessing import get_context as get_process_context
 
-# Library wide process context
-process_context = get_process_context('spawn')
\ No newline at end of file
+# Library wide process context.
+# On Linux `fork` is used, so child processes inherit already initialized objects (e.g. digestion enzymes with compiled regexes) copy-on-write
+# instead of re-importing the modules and unpickling every argument. Processes must not inherit open database connections
+# and have to (re-)register their signal handlers at the beginning of `run()`, see `GenericProcess.activate_signal_handling()`.
+process_context = get_process_context("fork" if sys.platform == "linux" else "spawn")
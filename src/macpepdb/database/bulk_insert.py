@@ -0,0 +1,38 @@
+# std imports
+from typing import Any, Optional, Sequence
+
+# external imports
+from psycopg2.extras import execute_values
+
+DEFAULT_PAGE_SIZE: int = 1000
+"""Number of rows per statement. Larger pages reduce round trips, but very large statements are expensive to parse.
+"""
+
+def execute_values_with_rowcount(database_cursor, query: str, rows: Sequence[Any], template: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE) -> int:
+    """
+    Executes `psycopg2.extras.execute_values()` in pages of `page_size` rows and sums up the affected rows.
+    `cursor.rowcount` after `execute_values()` only covers the last page, so the pages are executed one by one here.
+
+    Parameters
+    ----------
+    database_cursor
+        Database cursor with open transaction.
+    query : str
+        Query with a single `%s` placeholder for the values, e.g. `INSERT INTO table (a, b) VALUES %s;`
+    rows : Sequence[Any]
+        Rows to insert
+    template : Optional[str]
+        Template for each row, see `psycopg2.extras.execute_values()`
+    page_size : int
+        Number of rows per statement
+
+    Returns
+    -------
+    Number of affected rows
+    """
+    rowcount = 0
+    for page_start in range(0, len(rows), page_size):
+        page = rows[page_start:page_start + page_size]
+        execute_values(database_cursor, query, page, template=template, page_size=len(page))
+        rowcount += database_cursor.rowcount
+    return rowcount
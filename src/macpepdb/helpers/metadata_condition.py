@@ -1,8 +1,9 @@
 # std imports
 from dataclasses import dataclass
-from typing import Any, Iterable, List, Optional
+from typing import Any, ClassVar, Iterable, List, Optional
 
 # internal imports
+from macpepdb.database.query_helpers.where_condition import WhereCondition
 from macpepdb.models.peptide_metadata import PeptideMetadata
 
 @dataclass
@@ -16,14 +17,24 @@ class MetadataCondition:
         "__is_trembl",
         "__taxonomy_ids",
         "__unique_taxonomy_ids",
-        "__proteome_id"
+        "__proteome_id",
+        "__condition_mask"
     ]
 
+    IS_SWISS_PROT_CONDITION: ClassVar[int] = 1
+    IS_TREMBL_CONDITION: ClassVar[int] = 1 << 1
+    TAXONOMY_IDS_CONDITION: ClassVar[int] = 1 << 2
+    UNIQUE_TAXONOMY_IDS_CONDITION: ClassVar[int] = 1 << 3
+    PROTEOME_ID_CONDITION: ClassVar[int] = 1 << 4
+    """Bits of the condition mask, a bit is set if the condition is set
+    """
+
     __is_swiss_prot: Optional[bool]
     __is_trembl: Optional[bool]
     __taxonomy_ids: Optional[List[int]]
     __unique_taxonomy_ids: Optional[List[int]]
     __proteome_id: Optional[str]
+    __condition_mask: int
 
     def __init__(self):
         self.__is_swiss_prot = None
@@ -31,6 +42,7 @@ class MetadataCondition:
         self.__taxonomy_ids = None
         self.__unique_taxonomy_ids = None
         self.__proteome_id = None
+        self.__condition_mask = 0
 
     @property
     def is_swiss_prot(self) -> Optional[bool]:
@@ -55,23 +67,52 @@ class MetadataCondition:
     @is_swiss_prot.setter
     def is_swiss_prot(self, value: Optional[bool]):
         self.__is_swiss_prot = value
+        self.__update_condition_mask(self.__class__.IS_SWISS_PROT_CONDITION, value)
 
     @is_trembl.setter
     def is_trembl(self, value: Optional[bool]):
         self.__is_trembl = value
+        self.__update_condition_mask(self.__class__.IS_TREMBL_CONDITION, value)
 
     @taxonomy_ids.setter
     def taxonomy_ids(self, value: Optional[List[int]]):
         self.__taxonomy_ids = value
+        self.__update_condition_mask(self.__class__.TAXONOMY_IDS_CONDITION, value)
 
     @unique_taxonomy_ids.setter
     def unique_taxonomy_ids(self, value: Optional[List[int]]):
         self.__unique_taxonomy_ids = value
+        self.__update_condition_mask(self.__class__.UNIQUE_TAXONOMY_IDS_CONDITION, value)
 
     @proteome_id.setter
     def proteome_id(self, value: Optional[str]):
         self.__proteome_id = value
+        self.__update_condition_mask(self.__class__.PROTEOME_ID_CONDITION, value)
 
+    @property
+    def condition_mask(self) -> int:
+        """
+        Returns
+        -------
+        Bit mask of the set conditions, see `*_CONDITION` class constants
+        """
+        return self.__condition_mask
+
+    def __update_condition_mask(self, condition_bit: int, value: Any):
+        """
+        Sets the bit of a condition if the value is set, otherwise clears it.
+
+        Parameters
+        ----------
+        condition_bit : int
+            Bit of the condition
+        value : Any
+            New value of the condition
+        """
+        if value is not None:
+            self.__condition_mask |= condition_bit
+        else:
+            self.__condition_mask &= ~condition_bit
 
     def validate(self, metadata: PeptideMetadata) -> bool:
         if self.__is_swiss_prot is not None and metadata.is_swiss_prot != self.__is_swiss_prot:
@@ -95,16 +136,36 @@ class MetadataCondition:
         bool
             False if no check is needed (not metadata condition)
         """
-        return self.__is_swiss_prot is not None \
-            or self.__is_trembl is not None \
-            or self.__taxonomy_ids is not None \
-            or self.__unique_taxonomy_ids is not None \
-            or self.__proteome_id is not None \
-        
+        return self.__condition_mask != 0
+
+    def to_where_condition(self) -> WhereCondition:
+        """
+        Creates a SQL-query WHERE-clause for the peptide metadata table, so the conditions are applied by the database
+        instead of validating each streamed peptide.
+
+        Returns
+        -------
+        WhereCondition
+            Condition for the columns of the metadata table, empty if there are no conditions
+        """
+        where_condition = WhereCondition([], [])
+        conditions = [
+            ("is_swiss_prot = %s", self.__is_swiss_prot),
+            ("is_trembl = %s", self.__is_trembl),
+            # `&&` is true if the arrays have at least one element in common
+            ("taxonomy_ids && %s::INT[]", self.__taxonomy_ids),
+            ("unique_taxonomy_ids && %s::INT[]", self.__unique_taxonomy_ids),
+            ("proteome_ids @> %s::VARCHAR[]", [self.__proteome_id] if self.__proteome_id is not None else None)
+        ]
+        for condition, value in conditions:
+            if value is not None:
+                where_condition.concatenate(WhereCondition([condition], [value]), "AND")
+        return where_condition
+
     @classmethod
     def is_intersecting(cls, iterable_x: Iterable[Any], iterable_y: Iterable[Any]) -> bool:
         """
-        Checks if two iterables are intersecting by checking if one element of iterable x is contained by iterable y.
+        Checks if two iterables are intersecting. Iterable x is converted to a frozenset, so each element of iterable y is a hashed lookup.
 
         Arguments
         ---------
@@ -117,7 +178,4 @@ class MetadataCondition:
         -------
         True if intersect
         """
-        for x_element in iterable_x:
-            if x_element in iterable_y:
-                return True
-        return False
+        return not frozenset(iterable_x).isdisjoint(iterable_y)
@@ -1,7 +1,7 @@
 # std imports
 from __future__ import annotations
 import json
-from typing import ClassVar
+from typing import ClassVar, Dict, Iterable
 
 class MaintenanceInformation:
     """
@@ -13,16 +13,36 @@ class MaintenanceInformation:
         Key of the maintenance information
     value : dict
         Actual information
+    maintenance_mode : bool
+        Indicates if the database is in maintenance mode, only used for the database status (optional)
+    last_update : int
+        UTC timestamp (seconds) of the last database update, only used for the database status (optional)
     """
 
     DATABASE_STATUS_KEY = 'database_status'
     DIGESTION_PARAMTERS_KEY = 'digestion_parameters'
     COMMENT_KEY: ClassVar[str] = 'comment'
     TABLE_NAME = "maintenance_information"
+    TYPED_COLUMN_KEYS: ClassVar[tuple] = ('maintenance_mode', 'last_update')
+    """Keys which are stored in typed columns instead of the JSON values
+    """
 
-    def __init__(self, key: str, values: dict):
+    def __init__(self, key: str, values: dict, maintenance_mode: bool = None, last_update: int = None):
         self.key = key
-        self.values = values
+        # Copy the values, so the caller's dictionary is not modified
+        self.values = dict(values)
+        # Keep the typed status columns accessible through `values` as well, which is what clients (e.g. the web API) expect.
+        # If they are only given in `values`, take them from there, so the typed columns and the values can not diverge.
+        if maintenance_mode is None:
+            maintenance_mode = self.values.get('maintenance_mode')
+        else:
+            self.values['maintenance_mode'] = maintenance_mode
+        if last_update is None:
+            last_update = self.values.get('last_update')
+        else:
+            self.values['last_update'] = last_update
+        self.maintenance_mode = maintenance_mode
+        self.last_update = last_update
 
     @staticmethod
     def select(database_cursor, key: str) -> MaintenanceInformation:
@@ -40,17 +60,42 @@ class MaintenanceInformation:
         -------
         Returns MaintenanceInformation if the SELECT returns something, otherwise None
         """
-        SELECT_QUERY = f"SELECT values FROM {MaintenanceInformation.TABLE_NAME} WHERE key = %s;"
+        SELECT_QUERY = f"SELECT values, maintenance_mode, last_update FROM {MaintenanceInformation.TABLE_NAME} WHERE key = %s;"
         database_cursor.execute(
             SELECT_QUERY,
             (key,)
         )
         row = database_cursor.fetchone()
         if row:
-            return MaintenanceInformation(key, row[0])
+            return MaintenanceInformation(key, row[0], row[1], row[2])
         else:
             return None
 
+    @staticmethod
+    def select_many(database_cursor, keys: Iterable[str]) -> Dict[str, MaintenanceInformation]:
+        """
+        Selects multiple maintenance information with a single query.
+
+        Parameters
+        ----------
+        database_cursor
+            Database cursor with open transaction.
+        keys : Iterable[str]
+            Keys for identification
+
+        Returns
+        -------
+        Dictionary with key => MaintenanceInformation, keys which are not found are missing
+        """
+        SELECT_QUERY = f"SELECT key, values, maintenance_mode, last_update FROM {MaintenanceInformation.TABLE_NAME} WHERE key = ANY(%s);"
+        database_cursor.execute(
+            SELECT_QUERY,
+            (list(keys),)
+        )
+        return {
+            row[0]: MaintenanceInformation(row[0], row[1], row[2], row[3]) for row in database_cursor.fetchall()
+        }
+
     @staticmethod
     def insert(database_cursor, maintenance_information: MaintenanceInformation):
         """
@@ -63,10 +108,15 @@ class MaintenanceInformation:
         mainenance_infromation : MaintenanceInformation
             MaintenanceInformation to insert
         """
-        INSERT_QUERY = f"INSERT INTO {MaintenanceInformation.TABLE_NAME} (key, values) VALUES (%s, %s);"
+        INSERT_QUERY = f"INSERT INTO {MaintenanceInformation.TABLE_NAME} (key, values, maintenance_mode, last_update) VALUES (%s, %s, %s, %s);"
         database_cursor.execute(
             INSERT_QUERY,
-            (maintenance_information.key, maintenance_information.value)
+            (
+                maintenance_information.key,
+                json.dumps(maintenance_information.json_values),
+                maintenance_information.maintenance_mode,
+                maintenance_information.last_update
+            )
         )
 
     @staticmethod
@@ -81,8 +131,22 @@ class MaintenanceInformation:
         mainenance_infromation : MaintenanceInformation
             MaintenanceInformation to insert
         """
-        UPDATE_QUERY = f"UPDATE {MaintenanceInformation.TABLE_NAME} SET values = %s WHERE key = %s;"
+        UPDATE_QUERY = f"UPDATE {MaintenanceInformation.TABLE_NAME} SET values = %s, maintenance_mode = %s, last_update = %s WHERE key = %s;"
         database_cursor.execute(
             UPDATE_QUERY,
-            (json.dumps(maintenance_information.values), MaintenanceInformation.DATABASE_STATUS_KEY)
-        )
\ No newline at end of file
+            (
+                json.dumps(maintenance_information.json_values),
+                maintenance_information.maintenance_mode,
+                maintenance_information.last_update,
+                maintenance_information.key
+            )
+        )
+
+    @property
+    def json_values(self) -> dict:
+        """
+        Returns
+        -------
+        Values which are stored as JSON, without the ones stored in typed columns.
+        """
+        return {key: value for key, value in self.values.items() if key not in self.__class__.TYPED_COLUMN_KEYS}
\ No newline at end of file
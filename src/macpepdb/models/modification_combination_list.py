@@ -1,12 +1,15 @@
 # std imports
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import lru_cache
 from math import floor
-from typing import List
+from operator import attrgetter
+from typing import Iterator, List, Tuple
 
 # inner imports
 from macpepdb.proteomics.modification_collection import ModificationCollection
-from macpepdb.proteomics.mass.precursor_range import PrecursorRange
+from macpepdb.proteomics.mass.convert import to_float as mass_to_float
+from macpepdb.proteomics.mass.precursor_range import PrecursorRange, get_precursor_range
 from macpepdb.models.peptide import Peptide
 from macpepdb.database.query_helpers.column_condition import ColumnCondition
 from macpepdb.database.query_helpers.database_index_where_clause_builder import DatabaseIndexWhereClauseBuilder
@@ -57,15 +60,17 @@ class ModificationCombination:
     upper_precursor_tolerance_ppm : int
         Upper precursor tolerance
     """
-    __slots__ = ["__column_conditions", "__precursor_range"]
+    __slots__ = ["__column_conditions", "__sorted_column_conditions", "__precursor_range"]
 
     __column_conditions: List[ColumnCondition]
+    __sorted_column_conditions: List[ColumnCondition]
     __precursor_range: PrecursorRange
 
     def __init__(self, modification_counters: list, precursor: int, lower_precursor_tolerance_ppm: int, upper_precursor_tolerance_ppm: int):
         self.__column_conditions = []
         self.__precursor_range = None
         self.__calculate_columns_and_precursor_range(modification_counters, precursor, lower_precursor_tolerance_ppm, upper_precursor_tolerance_ppm)
+        self.__sorted_column_conditions = sorted(self.__column_conditions, key=attrgetter("column_name"))
 
     @property
     def where_conditions(self) -> List[ColumnCondition]:
@@ -74,6 +79,13 @@ class ModificationCombination:
         """
         return self.__column_conditions
 
+    @property
+    def sorted_where_conditions(self) -> List[ColumnCondition]:
+        """
+        Returns the list of condition columns, sorted by column name.
+        """
+        return self.__sorted_column_conditions
+
     @property
     def precursor_range(self):
         """
@@ -156,7 +168,7 @@ class ModificationCombination:
             )
 
         # Add the mass between condition
-        self.__precursor_range = PrecursorRange(precursor - delta_sum, lower_precursor_tolerance_ppm, upper_precursor_tolerance_ppm)
+        self.__precursor_range = get_precursor_range(precursor - delta_sum, lower_precursor_tolerance_ppm, upper_precursor_tolerance_ppm)
 
         self.__column_conditions.append(
             ColumnCondition(
@@ -203,6 +215,10 @@ class ModificationCombinationList:
     A instance of this class is iterable, the iterator will return the combinations.
     """
 
+    BETWEEN_OPERATOR = "BETWEEN %s AND %s"
+    """Operator of range conditions
+    """
+
     def __init__(self, modification_collection: ModificationCollection, precursor: int, lower_precursor_tolerance_ppm: int, upper_precursor_tolerance_ppm: int, variable_modification_maximum: int):
         """
         Parameters
@@ -367,6 +383,54 @@ class ModificationCombinationList:
     def __len__(self):
         return len(self.__modification_combinations)
 
+    def format_rows(self, with_partition: bool) -> Iterator[Tuple[str, str]]:
+        """
+        Formats the mass range and amino acid conditions of each combination for the output.
+
+        Parameters
+        ----------
+        with_partition : bool
+            If true the partition condition is added to the amino acid conditions
+
+        Returns
+        -------
+        Iterator of tuples (mass range, amino acid conditions joined by ` & `), one for each combination
+        """
+        # Combinations with the same modification mass delta have the same mass range, so convert each mass only once
+        cached_mass_to_float = lru_cache(maxsize=None)(mass_to_float)
+        for combination in self.__modification_combinations:
+            mass = ""
+            amino_acid_counts = []
+            # Conditions are sorted by column name, so the amino acid counts are already in order
+            for condition in combination.sorted_where_conditions:
+                if condition.column_name == "mass":
+                    mass = self.__class__.__format_condition(condition.column_name, condition.operator, tuple(cached_mass_to_float(mass) for mass in condition.values))
+                elif with_partition or condition.column_name != "partition":
+                    amino_acid_counts.append(self.__class__.__format_condition(condition.column_name, condition.operator, condition.values))
+            yield mass, " & ".join(amino_acid_counts)
+
+    @classmethod
+    def __format_condition(cls, column_name: str, operator: str, values: tuple) -> str:
+        """
+        Formats a condition for the output. Ranges are formatted as `column: lower - upper`, other conditions as SQL, e.g. `c_count = 2`.
+
+        Parameters
+        ----------
+        column_name : str
+            Column name
+        operator : str
+            SQL operator with placeholders, e.g. `= %s`
+        values : tuple
+            Values for the placeholders
+
+        Returns
+        -------
+        Formatted condition
+        """
+        if operator == cls.BETWEEN_OPERATOR:
+            return f"{column_name}: {values[0]} - {values[1]}"
+        return f"{column_name} {operator % values}"
+
     def to_where_condition(self) -> WhereCondition:
         """
         Returns a where condition, containing the WHERE-part of a SQL-query and the values for the query,
@@ -382,7 +446,7 @@ class ModificationCombinationList:
                 finished_where_condition.concatenate(combination.to_where_condition(), "OR")
             return finished_where_condition
         else:
-            precursor_range = PrecursorRange(self.__precursor, self.__lower_precursor_tolerance_ppm, self.__upper_precursor_tolerance_ppm)
+            precursor_range = get_precursor_range(self.__precursor, self.__lower_precursor_tolerance_ppm, self.__upper_precursor_tolerance_ppm)
             return WhereCondition(
                 ["partition BETWEEN %s AND %s", "AND", "mass BETWEEN %s AND %s"],
                 [
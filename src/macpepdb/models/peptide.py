@@ -1,6 +1,6 @@
 # std imports
 from __future__ import annotations
-from typing import ByteString, ClassVar, Iterator, Optional, List, Union
+from typing import ByteString, Callable, ClassVar, Iterator, Optional, List, Tuple, Union
 
 # 3rd party imports
 from psycopg2.extensions import cursor as DatabaseCursor
@@ -13,6 +13,8 @@ from macpepdb.models import protein
 # Do no import PeptideMetadata directly to prevent circula import
 from macpepdb.models import peptide_metadata as metadata_module
 from macpepdb.helpers.metadata_condition import MetadataCondition
+from macpepdb.proteomics.mass.convert import to_float as mass_to_float
+from macpepdb.utilities.json_serialization import dumps as json_dumps
 
 class Peptide(PeptideBase):
     """
@@ -26,8 +28,12 @@ class Peptide(PeptideBase):
         Number of missed cleavages
     metadata : metadata_module.PeptideMetadata
         Peptide metadata (optional)
+    mass : Optional[int]
+        Precalculated mass, e.g. from the digestion (optional)
     """
 
+    __slots__ = ["__metadata"]
+
     TABLE_NAME: ClassVar[str] = 'peptides'
     """Database table name
     """
@@ -35,9 +41,17 @@ class Peptide(PeptideBase):
     METADATA_CSV_HEADER: ClassVar[List[str]] = ["in_swiss_prot", "in_trembl", "taxonomy_ids", "unique_for_taxonomy_ids", "proteome_ids"]
     """Additional CSV header for metadata
     """
+
+    CSV_ROW_FORMAT: ClassVar[str] = "%s,\"%s\",%d"
+    """Format of a CSV row (mass, sequence, number of missed cleavages), see `csv_row_formatter()`
+    """
+
+    METADATA_CSV_ROW_FORMAT: ClassVar[str] = CSV_ROW_FORMAT + ",\"%s\",\"%s\",\"%s\",\"%s\",\"%s\""
+    """Format of a CSV row including metadata, see `csv_row_formatter()`
+    """
     
-    def __init__(self, sequence: str, number_of_missed_cleavages: int, metadata: metadata_module.PeptideMetadata = None):
-        PeptideBase.__init__(self, sequence, number_of_missed_cleavages)
+    def __init__(self, sequence: str, number_of_missed_cleavages: int, metadata: metadata_module.PeptideMetadata = None, mass: Optional[int] = None):
+        PeptideBase.__init__(self, sequence, number_of_missed_cleavages, mass)
         self.__metadata = metadata
 
     @property
@@ -49,10 +63,33 @@ class Peptide(PeptideBase):
         """
         return self.__metadata
 
+    @classmethod
+    def _from_row(cls, row: tuple) -> Peptide:
+        """
+        Creates a peptide from a row of the metadata select (partition, mass, sequence, number_of_missed_cleavages, is_swiss_prot, is_trembl, taxonomy_ids, unique_taxonomy_ids, proteome_ids).
+        The stored mass is reused, so it is not recalculated from the sequence.
+
+        Parameters
+        ----------
+        row : tuple
+            Row from `select(..., include_metadata=True)`
+
+        Returns
+        -------
+        Peptide
+        """
+        return cls(
+            row[2],
+            row[3],
+            metadata_module.PeptideMetadata(row[4], row[5], row[6], row[7], row[8]) if row[4] is not None else None,
+            row[1]
+        )
+
     @classmethod
     # pylint: disable=arguments-differ
     def select(cls, database_cursor, where_condition: Optional[WhereCondition] = None,
-        order_by: Optional[str] = None, fetchall: bool = False, stream: bool = False, include_metadata: bool = False) -> Optional[Union[PeptideBase, List[PeptideBase], Iterator[PeptideBase]]]:
+        order_by: Optional[str] = None, fetchall: bool = False, stream: bool = False, include_metadata: bool = False,
+        metadata_condition: Optional[MetadataCondition] = None, raw: bool = False) -> Optional[Union[PeptideBase, List[PeptideBase], Iterator[PeptideBase]]]:
         """
         Selects peptides.
         
@@ -68,54 +105,86 @@ class Peptide(PeptideBase):
             If true, a generator is returned which yields all matching PeptideBase records
         include_metadata : bool
             Indicates if peptides is returned with metadata (is_swiss_prot, is_trembl, taxonomy_ids, unique_taxonomy_ids, proteome_ids)
+        metadata_condition : Optional[MetadataCondition]
+            Conditions for the metadata, which are added to the query. Only applied if `include_metadata` is true (optional)
+        raw : bool
+            If true the rows `(sequence, number_of_missed_cleavages, mass)` are returned instead of peptides.
+            Not supported in combination with `include_metadata` (optional)
         
         Returns
         -------
         None, Petide, list of peptides or generator which yield peptides
+
+        Raises
+        ------
+        ValueError
+            If `raw` and `include_metadata` are both true
         """
         if not include_metadata:
-            return super().select(database_cursor, where_condition, order_by, fetchall, stream)
+            return super().select(database_cursor, where_condition, order_by, fetchall, stream, raw)
+        elif raw:
+            raise ValueError("raw rows are not supported when metadata is included")
         else:
-            select_query = (
-                f"SELECT peps.partition, peps.mass, peps.sequence, peps.number_of_missed_cleavages, meta.is_swiss_prot, meta.is_trembl, meta.taxonomy_ids, meta.unique_taxonomy_ids, meta.proteome_ids FROM {cls.TABLE_NAME} as peps "
-                f"LEFT JOIN {metadata_module.PeptideMetadata.TABLE_NAME} as meta ON meta.partition = peps.partition AND meta.mass = peps.mass AND meta.sequence = peps.sequence"
-            )
-            select_values = ()
-            if where_condition is not None:
-                select_query += f" WHERE {where_condition.get_condition_str(table='peps')}"
-                select_values = where_condition.values
+            from_clause, select_values = cls.__metadata_from_clause(where_condition, metadata_condition)
+            select_query = f"SELECT peps.partition, peps.mass, peps.sequence, peps.number_of_missed_cleavages, meta.is_swiss_prot, meta.is_trembl, meta.taxonomy_ids, meta.unique_taxonomy_ids, meta.proteome_ids {from_clause}"
             if order_by is not None:
                 select_query += f" ORDER BY peps.{order_by}"
             select_query += ";"
             database_cursor.execute(select_query, select_values)
             if not stream:
                 if fetchall:
-                    return [
-                        cls(
-                            row[2],
-                            row[3],
-                            metadata_module.PeptideMetadata(row[4], row[5], row[6], row[7], row[8]) if row[4] is not None else None
-                        ) for row in database_cursor.fetchall()]
+                    return [cls._from_row(row) for row in database_cursor.fetchall()]
                 else:
                     row = database_cursor.fetchone()
                     if row:
-                        return cls(
-                            row[2],
-                            row[3],
-                            metadata_module.PeptideMetadata(row[4], row[5], row[6], row[7], row[8]) if row[4] is not None else None
-                        )
+                        return cls._from_row(row)
                     else:
                         return None
             else:
                 def gen():
-                    for row in database_cursor:
-                        yield cls(
-                            row[2],
-                            row[3],
-                            metadata_module.PeptideMetadata(row[4], row[5], row[6], row[7], row[8]) if row[4] is not None else None
-                        )
+                    # Fetch the rows in batches of the cursor's itersize. Peptides are still created lazily,
+                    # so consumers which stop early (e.g. on a limit) do not pay for the rest of the batch.
+                    rows = database_cursor.fetchmany(database_cursor.itersize)
+                    while rows:
+                        for row in rows:
+                            yield cls._from_row(row)
+                        rows = database_cursor.fetchmany(database_cursor.itersize)
                 return gen()
 
+    @classmethod
+    def __metadata_from_clause(cls, where_condition: Optional[WhereCondition], metadata_condition: Optional[MetadataCondition]) -> Tuple[str, list]:
+        """
+        Builds the FROM- and WHERE-clause for querying peptides joined with their metadata.
+
+        Parameters
+        ----------
+        where_condition : Optional[WhereCondition]
+            Where condition for the peptide table
+        metadata_condition : Optional[MetadataCondition]
+            Conditions for the metadata
+
+        Returns
+        -------
+        Tuple[str, list]
+            FROM- and WHERE-clause with the peptide table aliased as `peps` and the metadata table as `meta`, and the query values
+        """
+        from_clause = (
+            f"FROM {cls.TABLE_NAME} as peps "
+            f"LEFT JOIN {metadata_module.PeptideMetadata.TABLE_NAME} as meta ON meta.partition = peps.partition AND meta.mass = peps.mass AND meta.sequence = peps.sequence"
+        )
+        conditions = []
+        values = []
+        if where_condition is not None:
+            conditions.append(f"({where_condition.get_condition_str(table='peps')})")
+            values += where_condition.values
+        if metadata_condition is not None and metadata_condition.has_conditions():
+            metadata_where_condition = metadata_condition.to_where_condition()
+            conditions.append(metadata_where_condition.get_condition_str(table='meta'))
+            values += metadata_where_condition.values
+        if conditions:
+            from_clause += f" WHERE {' AND '.join(conditions)}"
+        return from_clause, values
+
     def proteins(self, database_cursor):
         """
         Selects the proteins which contain this peptide.
@@ -186,28 +255,6 @@ class Peptide(PeptideBase):
             )
 
         
-    @classmethod
-    def __taxonomy_ids_to_json(cls, taxonomy_ids: List[int]) -> Iterator[ByteString]:
-        """
-        Generator which yields array of taxonomy IDs as json formatted string.
-
-        Parameters
-        ----------
-        taxonomy_ids : List[int]
-            Taxonomy IDs
-
-        Yields
-        ------
-        Iterator[ByteString]
-            JSON formatted string
-        """
-        yield b"["
-        for idx, taxonomy_id in enumerate(taxonomy_ids):
-            if idx > 0:
-                yield b","
-            yield str(taxonomy_id).encode("utf-8")
-        yield b"]"
-
     def to_json(self) -> Iterator[ByteString]:
         """
         Generator which yields the peptides as a json formatted string including metadata if present
@@ -217,30 +264,23 @@ class Peptide(PeptideBase):
         Iterator[ByteString]
             JSON formatted string.
         """
-        yield from super().to_json(False)
-        yield b",\"metadata\":"
+        metadata = None
         if self.metadata is not None:
-            yield b"{\"is_swiss_prot\":"
-            yield b"true" if self.metadata.is_swiss_prot else b"false"
-            yield b",\"is_trembl\":"
-            yield b"true" if self.metadata.is_trembl else b"false"
-            yield b",\"taxonomy_ids\":"
-            for taxonomy_id_chunk in self.__class__.__taxonomy_ids_to_json(self.metadata.taxonomy_ids):
-                yield taxonomy_id_chunk
-            yield b",\"unique_taxonomy_ids\":"
-            for taxonomy_id_chunk in self.__class__.__taxonomy_ids_to_json(self.metadata.unique_taxonomy_ids):
-                yield taxonomy_id_chunk
-            yield b",\"proteome_ids\":["
-            for idx, proteome_id in enumerate(self.metadata.proteome_ids):
-                if idx > 0:
-                    yield b","
-                yield b"\""
-                yield proteome_id.encode("utf-8")
-                yield b"\""
-            yield b"]}"
-        else:
-            yield b"null"
-        yield b"}"
+            metadata = {
+                "is_swiss_prot": self.metadata.is_swiss_prot,
+                "is_trembl": self.metadata.is_trembl,
+                "taxonomy_ids": self.metadata.taxonomy_ids,
+                "unique_taxonomy_ids": self.metadata.unique_taxonomy_ids,
+                "proteome_ids": self.metadata.proteome_ids
+            }
+        # Serialize the whole peptide at once, which is much faster than yielding each part
+        yield json_dumps({
+            "mass": mass_to_float(self.mass),
+            "sequence": self.sequence,
+            "length": self.length,
+            "number_of_missed_cleavages": self.number_of_missed_cleavages,
+            "metadata": metadata
+        })
 
     def to_csv_row(self) -> Iterator[ByteString]:
         """
@@ -249,21 +289,46 @@ class Peptide(PeptideBase):
         Yields
         ------
         Iterator[ByteString]
-            CSV row with 2 or 7 columns, depending if the peptide was queried with metadata
+            CSV row with 3 or 8 columns, depending if the peptide was queried with metadata
         """
-        yield from super().to_csv_row()
-        if self.metadata is not None:
-            yield ",\""
-            yield b"true" if self.metadata.is_swiss_prot else b"false"
-            yield b"\",\""
-            yield b"true" if self.metadata.is_trembl else b"false"
-            yield b"\",\""
-            yield ",".join([str(taxonomy_id) for taxonomy_id in self.metadata.taxonomy_ids]).encode()
-            yield b"\",\""
-            yield ",".join([str(taxonomy_id) for taxonomy_id in self.metadata.unique_taxonomy_ids]).encode()
-            yield b"\",\""
-            yield ",".join([f"{proteome_id}" for proteome_id in self.metadata.proteome_ids]).encode()
-            yield b"\""
+        yield self.__class__.csv_row_formatter(self.metadata is not None)(self)
+
+    @classmethod
+    def csv_row_formatter(cls, include_metadata: bool) -> Callable[[Peptide], bytes]:
+        """
+        Returns a function which formats a peptide as CSV row with a precompiled format string.
+        Choose it once before formatting many peptides, so the decision about the metadata columns is not made for each peptide.
+
+        Parameters
+        ----------
+        include_metadata : bool
+            If true the metadata columns are added for peptides with metadata
+
+        Returns
+        -------
+        Callable[[Peptide], bytes]
+            Function which returns the CSV row of a peptide
+        """
+        row_format = cls.CSV_ROW_FORMAT
+        if not include_metadata:
+            return lambda peptide: (row_format % (mass_to_float(peptide.mass), peptide.sequence, peptide.number_of_missed_cleavages)).encode("utf-8")
+
+        metadata_row_format = cls.METADATA_CSV_ROW_FORMAT
+        def format_with_metadata(peptide: Peptide) -> bytes:
+            metadata = peptide.metadata
+            if metadata is None:
+                return (row_format % (mass_to_float(peptide.mass), peptide.sequence, peptide.number_of_missed_cleavages)).encode("utf-8")
+            return (metadata_row_format % (
+                mass_to_float(peptide.mass),
+                peptide.sequence,
+                peptide.number_of_missed_cleavages,
+                "true" if metadata.is_swiss_prot else "false",
+                "true" if metadata.is_trembl else "false",
+                ",".join(map(str, metadata.taxonomy_ids)),
+                ",".join(map(str, metadata.unique_taxonomy_ids)),
+                ",".join(metadata.proteome_ids)
+            )).encode("utf-8")
+        return format_with_metadata
 
     @classmethod
     def count_on_stream(
@@ -274,6 +339,7 @@ class Peptide(PeptideBase):
     ) -> int:
         """
         Returns the peptide count for the given where condition and metadata condition.
+        The peptides are counted by the database, so the matching rows are not transferred.
 
         Parameters
         ----------
@@ -289,7 +355,8 @@ class Peptide(PeptideBase):
         int
             Number of peptide
         """
-        if metadata_condition:
-            return sum(1 if metadata_condition.validate(peptide.metadata) else 0 for peptide in cls.select(database_cursor, where_condition, include_metadata=True, stream=True))
-        else:
-            return sum(1 for _ in cls.select(database_cursor, where_condition, stream=True))
+        if metadata_condition is None or not metadata_condition.has_conditions():
+            return cls.count(database_cursor, where_condition)
+        from_clause, count_values = cls.__metadata_from_clause(where_condition, metadata_condition)
+        database_cursor.execute(f"SELECT count(*) {from_clause};", count_values)
+        return database_cursor.fetchone()[0]
@@ -5,13 +5,12 @@ from collections import Counter
 from typing import ByteString, Iterator, Optional, Union, List, ClassVar
 import zlib
 
-# external imports
-from psycopg2.extras import execute_values
-
 # internal imports
+from macpepdb.database.binary_copy import BinaryCopyBuffer
+from macpepdb.database.bulk_insert import execute_values_with_rowcount
 from macpepdb.database.query_helpers.where_condition import WhereCondition
 from macpepdb.proteomics.neutral_loss import H2O
-from macpepdb.proteomics.amino_acid import AminoAcid
+from macpepdb.proteomics.amino_acid import AminoAcid, MONO_MASS_LOOKUP
 from macpepdb.proteomics.mass.convert import to_float as mass_to_float
 
 # This class is only a super class acutal peptide classes e.g. Peptide
@@ -25,8 +24,19 @@ class PeptideBase:
         Amino acid sequence
     number_of_missed_cleavages : int
         Number of missed cleavages
+    mass : Optional[int]
+        Precalculated mass, e.g. from the digestion (optional)
     """
 
+    __slots__ = [
+        "__sequence",
+        "__number_of_missed_cleavages",
+        "__sequence_with_modification_markers",
+        "__mass",
+        "__partition",
+        "__amino_acid_counter"
+    ]
+
     TABLE_NAME: ClassVar[str] = 'peptide_base'
     """Name of the database table
     """
@@ -35,10 +45,27 @@ class PeptideBase:
     """Prefix for FASTA entries
     """
 
+    FASTA_ENTRY_HEADER_START: ClassVar[bytes] = f">{FASTA_HEADER_PREFIX}|".encode("utf-8")
+    """Encoded beginning of the FASTA header, followed by the accession
+    """
+
     CSV_HEADER: ClassVar[List[str]] = ["mass", "sequence", "number_of_missed_cleavages"]
     """Header for CSV output
     """
 
+    INSERT_COLUMNS: ClassVar[List[str]] = [
+        "partition", "mass", "sequence", "length", "number_of_missed_cleavages",
+        "a_count", "b_count", "c_count", "d_count", "e_count", "f_count", "g_count", "h_count", "i_count", "j_count", "k_count", "l_count", "m_count",
+        "n_count", "o_count", "p_count", "q_count", "r_count", "s_count", "t_count", "u_count", "v_count", "w_count", "y_count", "z_count",
+        "n_terminus", "c_terminus"
+    ]
+    """Columns which are written on insert
+    """
+
+    INSERT_COLUMN_TYPES: ClassVar[str] = "hqsh" + "h" * 26 + "hh"
+    """Column types of `INSERT_COLUMNS` for `macpepdb.database.binary_copy.BinaryCopyBuffer`
+    """
+
     PARTITONS = [
         853375237186,
         913477000136,
@@ -144,11 +171,11 @@ class PeptideBase:
     """Upper limit of peptide partition (partition are balanced)
     """
 
-    def __init__(self, sequence: str, number_of_missed_cleavages: int):
+    def __init__(self, sequence: str, number_of_missed_cleavages: int, mass: Optional[int] = None):
         self.__sequence = sequence.upper()
         self.__number_of_missed_cleavages = number_of_missed_cleavages
         self.__sequence_with_modification_markers = None
-        self.__mass = self.__class__.calculate_mass(self.__sequence)
+        self.__mass = mass if mass is not None else self.__class__.calculate_mass(self.__sequence)
         self.__partition = self.__class__.get_partition(self.__mass)
         # On demand values
         self.__amino_acid_counter = None
@@ -533,10 +560,14 @@ class PeptideBase:
         sequence: str
             Amino acid sequence
         """
-        mass = H2O.mono_mass
-        for amino_acid_one_letter_code in sequence:
-            mass += AminoAcid.get_by_one_letter_code(amino_acid_one_letter_code).mono_mass
-        return mass
+        try:
+            return H2O.mono_mass + sum(map(MONO_MASS_LOOKUP.__getitem__, sequence))
+        except KeyError:
+            # Lower case or unknown one letter codes, the latter raises a NameError
+            mass = H2O.mono_mass
+            for amino_acid_one_letter_code in sequence:
+                mass += AminoAcid.get_by_one_letter_code(amino_acid_one_letter_code).mono_mass
+            return mass
 
     def __count_amino_acids(self):
         """
@@ -557,19 +588,10 @@ class PeptideBase:
         """
         return self.sequence == other.sequence
 
-    def __get_fasta_header(self):
-        return self.__class__.FASTA_HEADER_PREFIX
-
-    def to_fasta_entry(self):
-        """
-        Creates a fasta entry for the peptides.
-        """
-        return "{}\n{}\n".format(self.__get_fasta_header(), self.sequence)
-
 
     @classmethod
     def select(cls, database_cursor, where_condition: Optional[WhereCondition] = None, 
-        order_by: Optional[str] = None, fetchall: bool = False, stream: bool = False) -> Optional[Union[PeptideBase, List[PeptideBase], Iterator[PeptideBase]]]:
+        order_by: Optional[str] = None, fetchall: bool = False, stream: bool = False, raw: bool = False) -> Optional[Union[PeptideBase, List[PeptideBase], Iterator[PeptideBase]]]:
         """
         Selects peptides.
 
@@ -585,12 +607,16 @@ class PeptideBase:
             Indicates if multiple rows should be fetched
         stream : bool
             If true, a generator is returned which yields all matching PeptideBase records
+        raw : bool
+            If true the rows `(sequence, number_of_missed_cleavages, mass)` are returned instead of peptides,
+            e.g. for output formats which do not need peptide objects (optional)
 
         Returns
         -------
         None, Petide, list of peptides or generator which yield peptides
         """
-        select_query = f"SELECT sequence, number_of_missed_cleavages FROM {cls.TABLE_NAME} as peps"
+        # Select the stored mass too, so it is not recalculated for each peptide
+        select_query = f"SELECT sequence, number_of_missed_cleavages, mass FROM {cls.TABLE_NAME} as peps"
         select_values = []
         if where_condition is not None:
             select_query += f" WHERE {where_condition.get_condition_str()}"
@@ -600,19 +626,34 @@ class PeptideBase:
         select_query += ";"
         database_cursor.execute(select_query, select_values)
 
+        # Pass the mass as keyword, because subclasses may have other positional parameters, e.g. Peptide's metadata
         if not stream:
             if fetchall:
-                return [cls(row[0], row[1]) for row in database_cursor.fetchall()]
+                if raw:
+                    return database_cursor.fetchall()
+                return [cls(row[0], row[1], mass=row[2]) for row in database_cursor.fetchall()]
             else:
                 row = database_cursor.fetchone()
                 if row:
-                    return cls(row[0], row[1])
+                    return cls(row[0], row[1], mass=row[2]) if not raw else row
                 else:
                     return None
+        elif raw:
+            def raw_gen():
+                rows = database_cursor.fetchmany(database_cursor.itersize)
+                while rows:
+                    yield from rows
+                    rows = database_cursor.fetchmany(database_cursor.itersize)
+            return raw_gen()
         else:
             def gen():
-                for row in database_cursor:
-                    yield cls(row[0], row[1])
+                # Fetch the rows in batches of the cursor's itersize. Peptides are still created lazily,
+                # so consumers which stop early (e.g. on a limit) do not pay for the rest of the batch.
+                rows = database_cursor.fetchmany(database_cursor.itersize)
+                while rows:
+                    for row in rows:
+                        yield cls(row[0], row[1], mass=row[2])
+                    rows = database_cursor.fetchmany(database_cursor.itersize)
             return gen()
 
     @classmethod
@@ -686,49 +727,99 @@ class PeptideBase:
             "VALUES %s ON CONFLICT DO NOTHING;"
         )
         # Bulk insert the new peptides
-        execute_values(
+        return execute_values_with_rowcount(
             database_cursor,
             BULK_INSERT_QUERY,
-            [
-                (
-                    peptide.partition,
-                    peptide.mass,
-                    peptide.sequence,
-                    peptide.length,
-                    peptide.number_of_missed_cleavages,
-                    peptide.a_count,
-                    peptide.b_count,
-                    peptide.c_count,
-                    peptide.d_count,
-                    peptide.e_count,
-                    peptide.f_count,
-                    peptide.g_count,
-                    peptide.h_count,
-                    peptide.i_count,
-                    peptide.j_count,
-                    peptide.k_count,
-                    peptide.l_count,
-                    peptide.m_count,
-                    peptide.n_count,
-                    peptide.o_count,
-                    peptide.p_count,
-                    peptide.q_count,
-                    peptide.r_count,
-                    peptide.s_count,
-                    peptide.t_count,
-                    peptide.u_count,
-                    peptide.v_count,
-                    peptide.w_count,
-                    peptide.y_count,
-                    peptide.z_count,
-                    peptide.get_n_terminus_ascii_dec(),
-                    peptide.get_c_terminus_ascii_dec()
-                ) for peptide in peptides
-            ],
-            page_size=len(peptides)
+            [cls.__to_insert_row(peptide) for peptide in peptides]
+        )
+
+    @classmethod
+    def bulk_copy(cls, database_cursor, peptides: list) -> int:
+        """
+        Bulk inserts many peptides with `COPY`, which is considerably faster than `bulk_insert()` for large numbers of peptides.
+        Because `COPY` does not support `ON CONFLICT`, the peptides are copied into a temporary staging table first
+        and moved into the actual table with `INSERT ... SELECT ... ON CONFLICT DO NOTHING`.
+
+        Parameters
+        ----------
+        database_cursor
+            Database cursor with open transaction.
+        peptides : List[Peptide]
+            Peptides for bulk insert.
+
+        Returns
+        -------
+        Number of inserted peptides
+        """
+        staging_table_name = f"{cls.TABLE_NAME}_stage"
+        columns = ", ".join(cls.INSERT_COLUMNS)
+        # The staging table only lives as long as the connection, so it is created once per connection.
+        # Checking for it is a cheap catalog lookup, while `CREATE TABLE IF NOT EXISTS` emits a notice on each call.
+        # The table is not remembered on the client side, because it is gone if the creating transaction is rolled back.
+        database_cursor.execute("SELECT to_regclass(%s) IS NULL;", (f"pg_temp.{staging_table_name}",))
+        if database_cursor.fetchone()[0]:
+            database_cursor.execute(f"CREATE TEMPORARY TABLE {staging_table_name} (LIKE {cls.TABLE_NAME} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS;")
+        copy_buffer = BinaryCopyBuffer(cls.INSERT_COLUMN_TYPES)
+        copy_buffer.write_rows(cls.__to_insert_row(peptide) for peptide in peptides)
+        copy_buffer.copy_to(database_cursor, staging_table_name, cls.INSERT_COLUMNS)
+        # Insert the rows in the order of the primary key, so concurrent digestion processes lock conflicting rows in the same order,
+        # which reduces the risk of deadlocks. A plain INSERT ... SELECT also works on the distributed Citus table, unlike a data-modifying CTE.
+        database_cursor.execute(
+            f"INSERT INTO {cls.TABLE_NAME} ({columns}) SELECT {columns} FROM {staging_table_name} ORDER BY partition, mass, sequence ON CONFLICT DO NOTHING;"
+        )
+        inserted_peptide_count = database_cursor.rowcount
+        # Empty the staging table for the next call in the same transaction. On commit the rows are deleted anyway (ON COMMIT DELETE ROWS).
+        database_cursor.execute(f"TRUNCATE {staging_table_name};")
+        return inserted_peptide_count
+
+    @staticmethod
+    def __to_insert_row(peptide) -> tuple:
+        """
+        Returns the values for inserting the given peptide, in the order of `INSERT_COLUMNS`.
+
+        Parameters
+        ----------
+        peptide : PeptideBase
+            Peptide
+
+        Returns
+        -------
+        Tuple with insert values
+        """
+        return (
+            peptide.partition,
+            peptide.mass,
+            peptide.sequence,
+            peptide.length,
+            peptide.number_of_missed_cleavages,
+            peptide.a_count,
+            peptide.b_count,
+            peptide.c_count,
+            peptide.d_count,
+            peptide.e_count,
+            peptide.f_count,
+            peptide.g_count,
+            peptide.h_count,
+            peptide.i_count,
+            peptide.j_count,
+            peptide.k_count,
+            peptide.l_count,
+            peptide.m_count,
+            peptide.n_count,
+            peptide.o_count,
+            peptide.p_count,
+            peptide.q_count,
+            peptide.r_count,
+            peptide.s_count,
+            peptide.t_count,
+            peptide.u_count,
+            peptide.v_count,
+            peptide.w_count,
+            peptide.y_count,
+            peptide.z_count,
+            peptide.get_n_terminus_ascii_dec(),
+            peptide.get_c_terminus_ascii_dec()
         )
-        # rowcount is only accurate, because the page size is as high as the number of inserted data. If the page size would be smaller rowcount would only return the rowcount of the last processed page.
-        return database_cursor.rowcount
 
     @classmethod
     def get_partition(cls, mass: int) -> int:
@@ -786,16 +877,34 @@ class PeptideBase:
         Iterator[ByteString]
             FASTA entry
         """
-        # Begin FASTA entry with '>macpepdb|' ...
-        yield f">{self.FASTA_HEADER_PREFIX}|".encode("utf-8")
-        encoded_seqeunce = self.sequence.encode()
+        yield from self.__class__.sequence_to_fasta_entry(self.sequence, accession)
+
+    @classmethod
+    def sequence_to_fasta_entry(cls, sequence: str, accession: Optional[ByteString] = None) -> Iterator[ByteString]:
+        """
+        Sequence as FASTA entry, e.g. for peptides which were selected as raw rows.
+
+        Parameters
+        ----------
+        sequence : str
+            Amino acid sequence
+        accession : Optional[ByteString]
+            Accession for fasta entry. If none, the base64 encoded, zlib compression of the encoded sequence is used.
+
+        Yields
+        ------
+        Iterator[ByteString]
+            FASTA entry
+        """
+        encoded_sequence = sequence.encode()
         # Use 'P' + index or base64 encoded, zlib compression if sequence as accession
-        yield accession if accession is not None else base64.b64encode(zlib.compress(encoded_seqeunce))
-        yield b"|"
-        # ... add the sequence in chunks of 60 amino acids ...
-        for chunk_start in range(0, len(encoded_seqeunce), 60):
-            yield b"\n"
-            yield encoded_seqeunce[chunk_start : chunk_start+60]
+        if accession is None:
+            accession = base64.b64encode(zlib.compress(encoded_sequence))
+        # Slices of the memoryview reference the encoded sequence, so the lines are only copied once by join()
+        sequence_view = memoryview(encoded_sequence)
+        sequence_lines = [sequence_view[chunk_start : chunk_start+60] for chunk_start in range(0, len(encoded_sequence), 60)]
+        # '>macpepdb|<accession>|' followed by the sequence in lines of 60 amino acids
+        yield b"".join((cls.FASTA_ENTRY_HEADER_START, accession, b"|\n" if sequence_lines else b"|", b"\n".join(sequence_lines)))
 
     def to_json(self, close: bool = True) -> Iterator[ByteString]:
         """
@@ -811,16 +920,14 @@ class PeptideBase:
         Iterator[ByteString]
             JSON formatted string.
         """
-        yield b"{\"mass\":"
-        yield str(mass_to_float(self.mass)).encode("utf-8")
-        yield b",\"sequence\":\""
-        yield self.sequence.encode("utf-8")
-        yield b"\",\"length\":"
-        yield str(self.length).encode("utf-8")
-        yield b",\"number_of_missed_cleavages\":"
-        yield str(self.number_of_missed_cleavages).encode("utf-8")#
-        if close:
-            yield b"}"
+        # Format integers directly into the bytes, without intermediate strings
+        json_entry = b"{\"mass\":%s,\"sequence\":\"%s\",\"length\":%d,\"number_of_missed_cleavages\":%d" % (
+            str(mass_to_float(self.mass)).encode("utf-8"),
+            self.sequence.encode("utf-8"),
+            self.length,
+            self.number_of_missed_cleavages
+        )
+        yield json_entry + b"}" if close else json_entry
 
     def to_csv_row(self) -> Iterator[ByteString]:
         """
@@ -831,12 +938,12 @@ class PeptideBase:
         Iterator[ByteString]
             CSV row with 2 or 7 columns, depending if the peptide was queried with metadata
         """
-        yield str(mass_to_float(self.mass)).encode("utf-8")
         # At this point only string values are added to the cssv, so we quote them for better compatibility
-        yield b",\""
-        yield self.sequence.encode("utf-8")
-        yield b"\","
-        yield str(self.number_of_missed_cleavages).encode("utf-8")
+        yield b"%s,\"%s\",%d" % (
+            str(mass_to_float(self.mass)).encode("utf-8"),
+            self.sequence.encode("utf-8"),
+            self.number_of_missed_cleavages
+        )
 
     def to_plain_text(self) -> Iterator[ByteString]:
         yield self.sequence.encode("utf-8")
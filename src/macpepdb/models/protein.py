@@ -1,16 +1,18 @@
 from __future__ import annotations
 import re
 from datetime import datetime
-from typing import ByteString, List, Tuple, Iterator
+from typing import ByteString, Dict, List, Optional, Tuple, Iterator
 
 # external imports
 from psycopg2.extras import execute_values
+from macpepdb.database.bulk_insert import DEFAULT_PAGE_SIZE
 from macpepdb.database.query_helpers.where_condition import WhereCondition
 
 
 # internal imports
 from macpepdb.models.protein_peptide_association import ProteinPeptideAssociation
 from macpepdb.models import peptide as peptide_module
+from macpepdb.utilities.json_serialization import dumps as json_dumps
 
 class Protein:
     """
@@ -35,6 +37,19 @@ class Protein:
     is_reviewed : bool
         Review status
     """
+
+    __slots__ = [
+        "accession",
+        "secondary_accessions",
+        "entry_name",
+        "name",
+        "sequence",
+        "taxonomy_id",
+        "proteome_id",
+        "is_reviewed",
+        "updated_at"
+    ]
+
     EMBL_AMINO_ACID_GROUPS_PER_LINE = 6
     EMBL_AMINO_ACID_GROUP_LEN = 10
     EMBL_ACCESSIONS_PER_LINE = 8
@@ -130,7 +145,8 @@ class Protein:
             return False
         return self.accession == other.accession
 
-    def peptides(self, database_cursor, order_by = None, order_descending: bool = False, offset: int = None, limit: int = None):
+    def peptides(self, database_cursor, order_by = None, order_descending: bool = False, offset: int = None, limit: int = None,
+        minimum_length: Optional[int] = None, maximum_length: Optional[int] = None, maximum_number_of_missed_cleavages: Optional[int] = None):
         """
         Selects the associated peptides of this protein.
 
@@ -146,6 +162,12 @@ class Protein:
             Adds an offset to the query.
         limit : int
             Adds a limit to the query.
+        minimum_length : Optional[int]
+            Minimum peptide length (optional)
+        maximum_length : Optional[int]
+            Maximum peptide length (optional)
+        maximum_number_of_missed_cleavages : Optional[int]
+            Maximum number of missed cleavages (optional)
 
         Returns
         -------
@@ -156,6 +178,17 @@ class Protein:
             f"FROM {peptide_module.Peptide.TABLE_NAME} "
             f"WHERE (partition, mass, sequence) IN (SELECT partition, peptide_mass, peptide_sequence FROM {ProteinPeptideAssociation.TABLE_NAME} WHERE protein_accession = %s)"
         )
+        query_values = [self.accession]
+        # Let the database discard peptides which are not requested
+        if minimum_length is not None:
+            referenced_peptides_query += " AND length >= %s"
+            query_values.append(minimum_length)
+        if maximum_length is not None:
+            referenced_peptides_query += " AND length <= %s"
+            query_values.append(maximum_length)
+        if maximum_number_of_missed_cleavages is not None:
+            referenced_peptides_query += " AND number_of_missed_cleavages <= %s"
+            query_values.append(maximum_number_of_missed_cleavages)
         if order_by:
             order_type = "ASC" if not order_descending else "DESC"
             referenced_peptides_query += f" ORDER BY {order_by} {order_type}"
@@ -166,7 +199,7 @@ class Protein:
         referenced_peptides_query += ";"
         database_cursor.execute(
             referenced_peptides_query,
-            (self.accession,)
+            query_values
         )
         return [
             peptide_module.Peptide(
@@ -209,6 +242,40 @@ class Protein:
             else:
                 return None
 
+    @staticmethod
+    def select_by_accessions(database_cursor, accessions: List[str]) -> Dict[str, Protein]:
+        """
+        Selects the proteins with the given accessions in one query.
+
+        Parameters
+        ----------
+        database_cursor
+            Active database cursor
+        accessions : List[str]
+            Accessions, e.g. the primary and secondary accessions of many proteins
+
+        Returns
+        -------
+        Dictionary with accession as key and protein as value
+        """
+        if not accessions:
+            return {}
+        # %s after VALUES is substituted by "(accession), (accession)"
+        SELECT_QUERY = (
+            "SELECT accession, secondary_accessions, entry_name, name, sequence, taxonomy_id, proteome_id, is_reviewed, updated_at "
+            f"FROM {Protein.TABLE_NAME} WHERE accession IN (VALUES %s);"
+        )
+        return {
+            row[0]: Protein.from_sql_row(row) for row in execute_values(
+                database_cursor,
+                SELECT_QUERY,
+                [(accession,) for accession in set(accessions)],
+                # fetch=True collects the results of all pages
+                page_size=DEFAULT_PAGE_SIZE,
+                fetch=True
+            )
+        }
+
     @staticmethod
     def from_sql_row(sql_row: Tuple[str, List[str], str, str, str, int, str, bool, int]) -> Protein:
         """
@@ -327,13 +394,13 @@ class Protein:
             new_peptides = list(new_peptides.values())
 
             if len(new_peptides):
-                inserted_peptide_count = peptide_module.Peptide.bulk_insert(database_cursor, new_peptides)
+                inserted_peptide_count = peptide_module.Peptide.bulk_copy(database_cursor, new_peptides)
 
                 for peptide in new_peptides:
                     protein_peptide_associations.append(ProteinPeptideAssociation(protein, peptide))
 
             if len(protein_peptide_associations):
-                ProteinPeptideAssociation.bulk_insert(database_cursor, protein_peptide_associations)
+                ProteinPeptideAssociation.bulk_copy(database_cursor, protein_peptide_associations)
 
             if len(peptides_for_metadata_update):
                 peptide_module.Peptide.flag_for_metadata_update(database_cursor, peptides_for_metadata_update)
@@ -435,7 +502,7 @@ class Protein:
                 
                 if len(new_peptides):
                     # Insert new peptides
-                    inserted_peptide_count = peptide_module.Peptide.bulk_insert(database_cursor, new_peptides.values())
+                    inserted_peptide_count = peptide_module.Peptide.bulk_copy(database_cursor, new_peptides.values())
 
                 # Create association values for new peptides
                 for peptide in new_peptides.values():
@@ -443,7 +510,7 @@ class Protein:
 
                 if len(protein_peptide_associations):
                     # Bulk insert new peptides
-                    ProteinPeptideAssociation.bulk_insert(database_cursor, protein_peptide_associations)
+                    ProteinPeptideAssociation.bulk_copy(database_cursor, protein_peptide_associations)
 
             if len(peptides_for_metadata_update):
                 peptide_module.Peptide.flag_for_metadata_update(database_cursor, peptides_for_metadata_update)
@@ -494,7 +561,8 @@ class Protein:
                     ) for peptide in peptides
                 ],
                 template="(%s, %s, %s)",
-                page_size=len(peptides),
+                # fetch=True collects the results of all pages
+                page_size=DEFAULT_PAGE_SIZE,
                 fetch=True
             )
         ]
@@ -508,18 +576,13 @@ class Protein:
         Iterator[ByteString]
             JSON formatted string.
         """
-        yield b"{\"accession\":\""
-        yield self.accession.encode("utf-8")
-        yield b"\",\"entry_name\":\""
-        yield self.accession.encode("utf-8")
-        yield b"\",\"name\":\""
-        yield self.name.replace("\\", "\\\\").encode("utf-8")   # Proteins with "\" in name exists (A0A084VXA8), need to escape it.
-        yield b"\",\"sequence\":\""
-        yield self.sequence.encode("utf-8")
-        yield b"\",\"taxonomy_id\":"
-        yield str(self.taxonomy_id).encode("utf-8")
-        yield b",\"proteome_id\":"
-        yield f"\"{self.proteome_id}\"".encode("utf-8") if self.proteome_id is not None else b"null"
-        yield b",\"is_reviewed\":"
-        yield b"true" if self.is_reviewed else b"false"
-        yield b"}"
\ No newline at end of file
+        # Serialize the whole protein at once, which is much faster than yielding each part and escapes the name properly
+        yield json_dumps({
+            "accession": self.accession,
+            "entry_name": self.entry_name,
+            "name": self.name,
+            "sequence": self.sequence,
+            "taxonomy_id": self.taxonomy_id,
+            "proteome_id": self.proteome_id,
+            "is_reviewed": self.is_reviewed
+        })
\ No newline at end of file
@@ -1,5 +1,6 @@
-# external imports
-from psycopg2.extras import execute_values
+# internal imports
+from macpepdb.database.binary_copy import BinaryCopyBuffer
+from macpepdb.database.bulk_insert import execute_values_with_rowcount
 
 class ProteinPeptideAssociation:
     """
@@ -15,6 +16,14 @@ class ProteinPeptideAssociation:
 
     TABLE_NAME = 'proteins_peptides'
 
+    INSERT_COLUMNS = ["protein_accession", "partition", "peptide_mass", "peptide_sequence"]
+    """Columns which are written on insert
+    """
+
+    INSERT_COLUMN_TYPES = "shqs"
+    """Column types of `INSERT_COLUMNS` for `macpepdb.database.binary_copy.BinaryCopyBuffer`
+    """
+
     def __init__(self, protein, peptide):
         self.__protein_accession = protein.accession
         self.__peptide_partition = peptide.partition
@@ -70,15 +79,34 @@ class ProteinPeptideAssociation:
             List of protein peptide associations
         """
         BULK_INSERT_QUERY = f"INSERT INTO {ProteinPeptideAssociation.TABLE_NAME} (protein_accession, partition, peptide_mass, peptide_sequence) VALUES %s;"
-        execute_values(
+        return execute_values_with_rowcount(
             database_cursor,
             BULK_INSERT_QUERY,
-            [(association.protein_accession, association.peptide_partition, association.peptide_mass, association.peptide_sequence) for association in protein_peptide_associations ],
-            page_size=len(protein_peptide_associations)
+            [(association.protein_accession, association.peptide_partition, association.peptide_mass, association.peptide_sequence) for association in protein_peptide_associations ]
         )
-        # rowcount is only accurate, because the page size is as high as the number of inserted data. If the page size would be smaller rowcount would only return the rowcount of the last processed page.
-        return database_cursor.rowcount
     
+    @staticmethod
+    def bulk_copy(database_cursor, protein_peptide_associations: list) -> int:
+        """
+        Inserts multiple associations with `COPY`, which is considerably faster than `bulk_insert()` for large numbers of associations.
+
+        Parameters
+        ----------
+        database_cursor
+            Active database cursor.
+        protein_peptide_associations : List[ProteinPeptideAssociation]
+            List of protein peptide associations
+
+        Returns
+        -------
+        Number of inserted associations
+        """
+        copy_buffer = BinaryCopyBuffer(ProteinPeptideAssociation.INSERT_COLUMN_TYPES)
+        copy_buffer.write_rows(
+            (association.protein_accession, association.peptide_partition, association.peptide_mass, association.peptide_sequence) for association in protein_peptide_associations
+        )
+        return copy_buffer.copy_to(database_cursor, ProteinPeptideAssociation.TABLE_NAME, ProteinPeptideAssociation.INSERT_COLUMNS)
+
     @staticmethod
     def delete(database_cursor, where_conditions: list):
         """
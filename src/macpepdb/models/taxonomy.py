@@ -1,12 +1,15 @@
 # internal imports
 from __future__ import annotations
 from enum import IntEnum, unique
-from typing import List
+from typing import List, Optional
 
 # external imports
-from psycopg2.extras import execute_values
 from psycopg2.extensions import cursor as DatabaseCursor
 
+# internal imports
+from macpepdb.database.bulk_insert import execute_values_with_rowcount
+from macpepdb.models.taxonomy_merge import TaxonomyMerge
+
 @unique
 class TaxonomyRank(IntEnum):
     """
@@ -183,8 +186,8 @@ class Taxonomy:
             f"INSERT INTO {cls.TABLE_NAME} (id, parent_id, name, rank) "
             "VALUES %s ON CONFLICT DO NOTHING;"
         )
-        # Bulk insert the new peptides
-        execute_values(
+        # Bulk insert the new taxonomies
+        return execute_values_with_rowcount(
             database_cursor,
             BULK_INSERT_QUERY,
             [
@@ -194,11 +197,8 @@ class Taxonomy:
                     taxonomy.name,
                     taxonomy.rank.value
                 ) for taxonomy in taxonomies
-            ],
-            page_size=len(taxonomies)
+            ]
         )
-        # rowcount is only accurate, because the page size is as high as the number of inserted data. If the page size would be smaller rowcount would only return the rowcount of the last processed page.
-        return database_cursor.rowcount
         
     @classmethod
     def select(cls, database_cursor, select_conditions: tuple = ("", []), fetchall: bool = False):
@@ -233,6 +233,36 @@ class Taxonomy:
             else:
                 return None
 
+    @classmethod
+    def select_by_id_or_merged_id(cls, database_cursor, id: int) -> Optional[Taxonomy]:
+        """
+        Selects the taxonomy with the given ID. If there is none, the taxonomy the ID was merged into is selected.
+        Both are looked up with a single query.
+
+        Parameters
+        ----------
+        database_cursor : 
+            Active database cursor
+        id : int
+            Taxonomy ID or merged taxonomy ID
+
+        Returns
+        -------
+        Taxonomy or None
+        """
+        # Prefer the taxonomy with the given ID over the merge target
+        database_cursor.execute(
+            f"SELECT id, parent_id, name, rank FROM {cls.TABLE_NAME} "
+            f"WHERE id = %s OR id = ANY(SELECT target_id FROM {TaxonomyMerge.TABLE_NAME} WHERE source_id = %s) "
+            "ORDER BY id = %s DESC LIMIT 1;",
+            (id, id, id)
+        )
+        row = database_cursor.fetchone()
+        if row:
+            return cls(row[0], row[1], row[2], row[3])
+        else:
+            return None
+
     def sub_species(self, database_cursor: DatabaseCursor) -> List[Taxonomy]:
         """
         Returns all sub taxonomies with rank TaxonomyRank.SPECIES including itself if itself has rank TaxonomyRank.SPECIES.
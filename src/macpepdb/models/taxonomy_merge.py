@@ -1,8 +1,8 @@
 # std imports
 from __future__ import annotations
 
-# external imports
-from psycopg2.extras import execute_values
+# internal imports
+from macpepdb.database.bulk_insert import execute_values_with_rowcount
 
 class TaxonomyMerge:
     """
@@ -69,8 +69,8 @@ class TaxonomyMerge:
             f"INSERT INTO {cls.TABLE_NAME} (source_id, target_id) "
             "VALUES %s ON CONFLICT DO NOTHING;"
         )
-        # Bulk insert the new peptides
-        execute_values(
+        # Bulk insert the new taxonomy merges
+        return execute_values_with_rowcount(
             database_cursor,
             BULK_INSERT_QUERY,
             [
@@ -78,11 +78,8 @@ class TaxonomyMerge:
                     taxonomy_merge.source_id, 
                     taxonomy_merge.target_id
                 ) for taxonomy_merge in taxonomy_merges
-            ],
-            page_size=len(taxonomy_merges)
+            ]
         )
-        # rowcount is only accurate, because the page size is as high as the number of inserted data. If the page size would be smaller rowcount would only return the rowcount of the last processed page.
-        return database_cursor.rowcount
     
     @classmethod
     def select(cls, database_cursor, select_conditions: tuple = ("", []), fetchall: bool = False):
@@ -223,6 +223,9 @@ KNOWN_AMINO_ACIDS = (
     X,
 )
 
+# Lookup for the mono mass of each known amino acid by one letter code (upper case only)
+MONO_MASS_LOOKUP = {amino_acid.one_letter_code: amino_acid.mono_mass for amino_acid in KNOWN_AMINO_ACIDS}
+
 # Lookup for ambigous amino acids where the differentiated amino acids actually have varying masses.
 # This is true for B and Z. 
 REPLACEABLE_AMBIGIOUS_AMINO_ACID_LOOKUP = {
@@ -1,12 +1,14 @@
 # std imports
 from __future__ import annotations
 import re
+from itertools import accumulate
 from typing import ClassVar, List
 
 # internal imports
 from macpepdb.models import peptide as peptide_mod
 from macpepdb.models import protein as protein_mod
-from macpepdb.proteomics.amino_acid import X as UnknwonAminoAcid, REPLACEABLE_AMBIGIOUS_AMINO_ACID_LOOKUP
+from macpepdb.proteomics.amino_acid import X as UnknwonAminoAcid, MONO_MASS_LOOKUP, REPLACEABLE_AMBIGIOUS_AMINO_ACID_LOOKUP
+from macpepdb.proteomics.neutral_loss import H2O
 
 class DigestEnzyme:
     """
@@ -47,7 +49,6 @@ class DigestEnzyme:
         self.__max_number_of_missed_cleavages = max_number_of_missed_cleavages
         self.__minimum_peptide_length = minimum_peptide_length
         self.__maximum_peptide_length = maximum_peptide_length
-        self.__peptide_range = range(minimum_peptide_length, maximum_peptide_length + 1) # upper border of range is excluded, so plus
 
     @property
     def max_number_of_missed_cleavages(self):
@@ -93,26 +94,56 @@ class DigestEnzyme:
         peptides = set()
         # Split protein sequence on every cleavage position
         protein_parts = self.__cleavage_regex.split(protein.sequence)
+        # Peptides are slices of the concatenated parts, so calculate the start offset of each part (and the end of the last one) once
+        # instead of concatenating the parts for each peptide.
+        concatenated_parts = "".join(protein_parts)
+        part_offsets = [0] * (len(protein_parts) + 1)
+        for part_index, part in enumerate(protein_parts):
+            part_offsets[part_index + 1] = part_offsets[part_index] + len(part)
+        # Prefix sums of the amino acid masses, so the mass of each peptide is the difference of two prefix sums plus water
+        # instead of summing up the masses of each peptide separately.
+        try:
+            mass_prefix_sums = [0] + list(accumulate(map(MONO_MASS_LOOKUP.__getitem__, concatenated_parts)))
+        except KeyError:
+            # Sequence contains lower case or unknown amino acids, let the peptides calculate their masses
+            mass_prefix_sums = None
+        water_mass = H2O.mono_mass
+        # Bind frequently used attributes to locals
+        minimum_peptide_length = self.__minimum_peptide_length
+        maximum_peptide_length = self.__maximum_peptide_length
+        max_number_of_missed_cleavages = self.__max_number_of_missed_cleavages
+        unknown_amino_acid = UnknwonAminoAcid.one_letter_code
+        is_sequence_containing_replaceable_ambigous_amino_acids = self.__class__.is_sequence_containing_replaceable_ambigous_amino_acids
+        Peptide = peptide_mod.Peptide
         # Start with every part
         for part_index in range(0, len(protein_parts)):
+            peptide_start = part_offsets[part_index]
             # Check if end of protein_parts is reached before the last missed cleavage (prevent overflow)
             last_part_to_add = min(
-                part_index + self.__max_number_of_missed_cleavages + 1,
+                part_index + max_number_of_missed_cleavages + 1,
                 len(protein_parts)
             )
-            peptide_sequence = ""
             for missed_cleavage in range(part_index, last_part_to_add):
-                peptide_sequence += protein_parts[missed_cleavage]
-                if len(peptide_sequence) in self.__peptide_range and not UnknwonAminoAcid.one_letter_code in peptide_sequence:
-                    peptides.add(peptide_mod.Peptide(peptide_sequence, missed_cleavage - part_index))
-                    if self.__class__.is_sequence_containing_replaceable_ambigous_amino_acids(peptide_sequence):
+                peptide_length = part_offsets[missed_cleavage + 1] - peptide_start
+                # Peptides only get longer with each missed cleavage
+                if peptide_length > maximum_peptide_length:
+                    break
+                if peptide_length < minimum_peptide_length:
+                    continue
+                peptide_sequence = concatenated_parts[peptide_start:part_offsets[missed_cleavage + 1]]
+                if not unknown_amino_acid in peptide_sequence:
+                    peptide_mass = None
+                    if mass_prefix_sums is not None:
+                        peptide_mass = mass_prefix_sums[part_offsets[missed_cleavage + 1]] - mass_prefix_sums[peptide_start] + water_mass
+                    peptides.add(Peptide(peptide_sequence, missed_cleavage - part_index, mass=peptide_mass))
+                    if is_sequence_containing_replaceable_ambigous_amino_acids(peptide_sequence):
                         # If there is a replaceable ambigous amino acid within the sequence, calculate each sequence combination of the actual amino acids
                         # Note: Some protein sequences in SwissProt and TrEMBL contain ambigous amino acids (B, Z). In most cases B and Z are denoted with the average mass of their encoded amino acids (D, N and E, Q).
                         # The average mass makes it difficult to create precise queries for these sequences in MaCPepDB. Therefor we calculates each differentiated version of the ambigous sequence and store it with the differentiated masses.
                         # This works only, when the actual amino acids have distinct masses like for B and Z, therefore we have to tolerate Js.
                         differentiated_sequences = self.__class__.differentiate_ambigous_sequences(peptide_sequence)
                         for sequence in differentiated_sequences:
-                            peptides.add(peptide_mod.Peptide(sequence, missed_cleavage - part_index))
+                            peptides.add(Peptide(sequence, missed_cleavage - part_index))
         return list(peptides)
 
     @classmethod
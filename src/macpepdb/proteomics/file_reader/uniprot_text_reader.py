@@ -1,6 +1,7 @@
 # std imports
 import re
 from datetime import datetime, timedelta
+from typing import BinaryIO, Iterator
 
 # internal imports
 from macpepdb.models.protein import Protein
@@ -96,6 +97,44 @@ class UniprotTextReader():
                     primary_accession = accessions.pop(0)
                     return Protein(primary_accession, accessions, entry_name, name, sequence, taxonomy_id, proteome_id, is_reviewed, self.__dt_date_to_utc_timestamp(last_update))
 
+    @staticmethod
+    def read_raw_entries(file: BinaryIO) -> Iterator[bytes]:
+        """
+        Splits the file into its entries without parsing them, e.g. to parse them in other processes with `parse_raw_entry()`.
+
+        Parameters
+        ----------
+        file : BinaryIO
+            EMBL file as file-like binary object
+
+        Yields
+        ------
+        Iterator[bytes]
+            Entry, including the terminating '//'-line
+        """
+        entry_lines = []
+        for line in file:
+            entry_lines.append(line)
+            if line.startswith(b"//"):
+                yield b"".join(entry_lines)
+                entry_lines = []
+
+    @classmethod
+    def parse_raw_entry(cls, raw_entry: bytes) -> Protein:
+        """
+        Parses an entry returned by `read_raw_entries()`.
+
+        Parameters
+        ----------
+        raw_entry : bytes
+            Entry
+
+        Returns
+        -------
+        Protein
+        """
+        return next(iter(cls(raw_entry.decode("utf-8").splitlines())))
+
     def __process_id(self, line):
         """
         Returns the the uniprot entry name and the review status (ture|false)
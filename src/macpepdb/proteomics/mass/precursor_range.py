@@ -1,3 +1,6 @@
+# std imports
+from functools import lru_cache
+
 class PrecursorRange:
     """
     Defines a precursor or mass range.
@@ -12,13 +15,34 @@ class PrecursorRange:
         Upper tolerance (ppm)
     """
 
+    __slots__ = ["__precursor", "__lower_tolerance_ppm", "__upper_tolerance_ppm", "__lower_limit", "__upper_limit"]
+
     def __init__(self, precursor: int, lower_tolerance_ppm: int, upper_tolerance_ppm: int):
         self.__precursor = precursor
         self.__lower_tolerance_ppm = lower_tolerance_ppm
         self.__upper_tolerance_ppm = upper_tolerance_ppm
         # Calculates the absolute precursor difference for the given tolerances (ppm) and add/subtract it from precursor
-        self.__lower_limit = int(self.__precursor - int(self.__precursor / 1000000.0 * lower_tolerance_ppm))
-        self.__upper_limit = int(self.__precursor + int(self.__precursor / 1000000.0 * upper_tolerance_ppm))
+        self.__lower_limit = self.__precursor - self.__class__.__tolerance(self.__precursor, lower_tolerance_ppm)
+        self.__upper_limit = self.__precursor + self.__class__.__tolerance(self.__precursor, upper_tolerance_ppm)
+
+    @staticmethod
+    def __tolerance(precursor: int, tolerance_ppm: int) -> int:
+        """
+        Calculates the absolute tolerance with integer arithmetic, truncated towards zero.
+
+        Parameters
+        ----------
+        precursor : int
+            Precursor / mass
+        tolerance_ppm : int
+            Tolerance (ppm)
+
+        Returns
+        -------
+        Absolute tolerance
+        """
+        tolerance = abs(precursor) * tolerance_ppm // 1000000
+        return tolerance if precursor >= 0 else -tolerance
 
     @property
     def precursor(self):
@@ -163,3 +187,25 @@ class PrecursorRange:
         Highest value of lower and upper tolerance
         """
         return max(self.__lower_tolerance_ppm, self.__upper_tolerance_ppm)
+
+
+@lru_cache(maxsize=4096)
+def get_precursor_range(precursor: int, lower_tolerance_ppm: int, upper_tolerance_ppm: int) -> PrecursorRange:
+    """
+    Returns a precursor range, which is cached for repeated precursors and tolerances.
+    Precursor ranges are immutable, so the cached instances can be shared.
+
+    Parameters
+    ----------
+    precursor : int
+        Precursor / mass
+    lower_tolerance_ppm : int
+        Lower tolerance (ppm)
+    upper_tolerance_ppm : int
+        Upper tolerance (ppm)
+
+    Returns
+    -------
+    PrecursorRange
+    """
+    return PrecursorRange(precursor, lower_tolerance_ppm, upper_tolerance_ppm)
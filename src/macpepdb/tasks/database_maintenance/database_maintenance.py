@@ -1,12 +1,12 @@
 # std imports
 import datetime
-import json
 import pathlib
 import shutil
 import os
 import psycopg2
 import signal
 from enum import unique, Enum
+from psycopg2.extras import Json
 
 # internal imports
 from macpepdb import process_context
@@ -224,7 +224,7 @@ class DatabaseMaintenance():
 
         now = datetime.datetime.utcnow()
         epoch = datetime.datetime(1970,1,1)
-        last_update_timestamp = (now - epoch).total_seconds()
+        last_update_timestamp = int((now - epoch).total_seconds())
         self.__set_database_status(self.__database_url, DatabaseStatus.READY, False, last_update_timestamp)
 
         # Cleanup by removing all files in the temporary work directory
@@ -247,25 +247,16 @@ class DatabaseMaintenance():
         """
         database_connection = psycopg2.connect(database_url)
         with database_connection.cursor() as database_cursor:
-            database_cursor.execute("SELECT values FROM maintenance_information WHERE key = %s;", (MaintenanceInformation.DATABASE_STATUS_KEY,))
-            database_status_row = database_cursor.fetchone()
-            if database_status_row:
-                database_status_values = database_status_row[0]
-                database_status_values['maintenance_mode'] = maintenance_mode
-                database_status_values['status'] = status.value
-                if last_update_timestamp:
-                    database_status_values['last_update'] = last_update_timestamp
-                database_cursor.execute("UPDATE maintenance_information SET values = %s WHERE key = %s;", (json.dumps(database_status_values), MaintenanceInformation.DATABASE_STATUS_KEY))
-            else:
-                database_status_values = {
-                    'status': status.value,
-                    'maintenance_mode': maintenance_mode 
-                }
-                if last_update_timestamp:
-                    database_status_values['last_update'] = last_update_timestamp
-                else:
-                    database_status_values['last_update'] = 0
-                database_cursor.execute("INSERT INTO maintenance_information (key, values) VALUES (%s, %s);", (MaintenanceInformation.DATABASE_STATUS_KEY, json.dumps(database_status_values)))
+            # Maintenance mode and last update are typed columns, so only the status needs to be merged into the JSON values.
+            # A single upsert, so there is neither a second round trip nor a race between checking and inserting.
+            database_cursor.execute(
+                (
+                    "INSERT INTO maintenance_information (key, values, maintenance_mode, last_update) VALUES (%s, %s, %s, %s) "
+                    "ON CONFLICT (key) DO UPDATE SET values = maintenance_information.values || EXCLUDED.values, maintenance_mode = EXCLUDED.maintenance_mode, "
+                    "last_update = COALESCE(%s, maintenance_information.last_update);"
+                ),
+                (MaintenanceInformation.DATABASE_STATUS_KEY, Json({'status': status.value}), maintenance_mode, last_update_timestamp if last_update_timestamp else 0, last_update_timestamp)
+            )
             database_connection.commit()
         database_connection.close()
 
@@ -1,20 +1,34 @@
 # std imports
 import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from queue import Full as FullQueueError
-from multiprocessing import Event, Queue
+from multiprocessing import Event
 from multiprocessing.connection import Connection as ProcessConnection
 from typing import List
 
 # internal imports
 from macpepdb.utilities.generic_process import GenericProcess
+from macpepdb.utilities.shared_memory_ring_buffer import SharedMemoryRingBuffer
 from macpepdb.proteomics.file_reader.uniprot_text_reader import UniprotTextReader
+from macpepdb.tasks.database_maintenance.multiprocessing.log_channel import LogChannel
 
 
 class EmblFileReaderProcess(GenericProcess):
     """
     Reads proteins from EMBL-Files and put them into a queue for further processing.
+    The entries are queued unparsed, so the parsing is done in parallel by the digestion processes.
     """
-    def __init__(self, termination_event: Event, input_file_paths: List[pathlib.Path], protein_queue: Queue, general_log: ProcessConnection):
+
+    READ_BUFFER_SIZE = 1 << 20
+    """Read buffer size in bytes (1 MiB). UniProt files are large, so the default buffer of 8 KiB results in a lot of read calls.
+    """
+
+    MAX_READER_THREADS = 4
+    """Maximum number of files which are read concurrently
+    """
+
+    def __init__(self, termination_event: Event, input_file_paths: List[pathlib.Path], protein_queue: SharedMemoryRingBuffer, general_log: LogChannel, unprocessible_protein_log: ProcessConnection):
         """
         Parameters
         ----------
@@ -22,10 +36,12 @@ class EmblFileReaderProcess(GenericProcess):
             Event for terminating the process
         input_file_paths : List[pathlib.Path]
             List of EMBL files
-        protein_queue : Queue
-            Protein queue
-        general_log : multiprocessing.connection.Connection
+        protein_queue : SharedMemoryRingBuffer
+            Queue for raw protein entries
+        general_log : LogChannel
             Conection to the log process
+        unprocessible_protein_log : multiprocessing.connection.Connection
+            Connection to the log process which logs unprocessible proteins, receives entries which are too large for the queue
 
         Returns
         -------
@@ -35,35 +51,53 @@ class EmblFileReaderProcess(GenericProcess):
         self.__input_file_paths = input_file_paths
         self.__protein_queue = protein_queue
         self.__general_log = general_log
+        self.__unprocessible_protein_log = unprocessible_protein_log
+        # The files are read by multiple threads, but a connection is not thread-safe
+        self.__unprocessible_protein_log_lock = threading.Lock()
 
     def run(self):
         """
         Starts process which reads the EMBL files and put the proteins into the queue.
+        Multiple files are read concurrently by a small thread pool, so reading one file does not wait for the other ones.
         """
         self.activate_signal_handling()
         self.__general_log.send("EMBL-file reader is online")
 
-        for input_file_path in self.__input_file_paths:
-            with input_file_path.open("r") as input_file:
-                input_file_reader = UniprotTextReader(input_file)
-                # Enqueue proteins
-                for protein in input_file_reader:
-                    # Retry lopp
-                    while not self.termination_event.is_set():
-                        try:
-                            # Try to queue a protein for digestion, wait 5 seconds for a free slot
-                            self.__protein_queue.put(protein, True, 5)
-                            # Continue with the next protein from the file
-                            break
-                        # Catch timouts of protein_queue.put()
-                        except FullQueueError:
-                            # Try again
-                            pass
-                    # Break protein read loop
-                    if self.termination_event.is_set():
-                        break
-            # Break embl files loop
-            if self.termination_event.is_set():
-                break
+        if self.__input_file_paths:
+            with ThreadPoolExecutor(max_workers=min(self.__class__.MAX_READER_THREADS, len(self.__input_file_paths))) as executor:
+                futures = {executor.submit(self.__read_file, input_file_path): input_file_path for input_file_path in self.__input_file_paths}
+                for future in as_completed(futures):
+                    error = future.exception()
+                    if error is not None:
+                        self.__general_log.send(f"Error while reading '{futures[future]}', see:\n{error}")
+
         self.__general_log.send("EMBL-file reader is offline")
-        self.__general_log.close()
\ No newline at end of file
+        self.__general_log.close()
+        self.__unprocessible_protein_log.close()
+        self.__protein_queue.close()
+
+    def __read_file(self, input_file_path: pathlib.Path):
+        """
+        Reads the given file and puts the raw protein entries into the queue. The queue is thread-safe, so multiple files can be read concurrently.
+
+        Parameters
+        ----------
+        input_file_path : pathlib.Path
+            EMBL file
+        """
+        with input_file_path.open("rb", buffering=self.__class__.READ_BUFFER_SIZE) as input_file:
+            # Enqueue proteins
+            for raw_protein_entry in UniprotTextReader.read_raw_entries(input_file):
+                # Break protein read loop
+                if self.termination_event.is_set():
+                    break
+                try:
+                    # Wait for a free slot as long as necessary. On termination the queue is aborted, which interrupts the waiting.
+                    self.__protein_queue.put(raw_protein_entry)
+                except FullQueueError:
+                    break
+                # Entry is larger than the queue's buffer, so it can never be queued. Log it and continue with the next entry.
+                except ValueError as error:
+                    self.__general_log.send(f"Unable to queue protein entry from '{input_file_path}', see:\n{error}")
+                    with self.__unprocessible_protein_log_lock:
+                        self.__unprocessible_protein_log.send_bytes(raw_protein_entry)
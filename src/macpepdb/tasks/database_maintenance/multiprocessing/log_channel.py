@@ -0,0 +1,77 @@
+# std imports
+from queue import Empty as EmptyQueueError
+from typing import Any, ClassVar, List
+
+# internal imports
+from macpepdb import process_context
+
+class LogChannel:
+    """
+    Single queue which collects the log messages of all processes for the `LoggerProcess`, instead of one pipe per process.
+    Writers use `send()` like a `multiprocessing.connection.Connection`, so a channel can be passed wherever a log connection was used before.
+
+    Because the logger can not detect the end of a queue like the EOF of a pipe, the owning process must call `stop()`
+    after all writing processes were joined. Messages put by a process are flushed into the queue before the process exits,
+    so the stop marker is always the last message the logger receives.
+
+    Parameters
+    ----------
+    context
+        Multiprocessing context for creating the queue, default: `macpepdb.process_context`.
+        Use the same context as the processes which are writing into the channel.
+    """
+
+    STOP_MARKER: ClassVar[Any] = None
+    """Message which tells the logger that all writers are finished
+    """
+
+    def __init__(self, context = process_context):
+        self.__queue = context.Queue()
+
+    def send(self, message: str):
+        """
+        Sends a message to the logger.
+
+        Parameters
+        ----------
+        message : str
+            Log message
+        """
+        self.__queue.put(message)
+
+    def close(self):
+        """
+        Called by a writer when it is done. Waits until all messages of this process are handed over to the queue.
+        """
+        self.__queue.close()
+        self.__queue.join_thread()
+
+    def stop(self):
+        """
+        Tells the logger to stop after all messages were written. Call it after all writing processes are joined.
+        """
+        self.__queue.put(self.__class__.STOP_MARKER)
+
+    def receive_batch(self, timeout: float, max_batch_size: int) -> List[Any]:
+        """
+        Waits for the next message and takes all further messages which are immediately available.
+
+        Parameters
+        ----------
+        timeout : float
+            Seconds to wait for the first message
+        max_batch_size : int
+            Maximum number of returned messages
+
+        Returns
+        -------
+        List of messages, empty if no message arrived in time. May contain the stop marker.
+        """
+        messages = []
+        try:
+            messages.append(self.__queue.get(True, timeout))
+            while len(messages) < max_batch_size:
+                messages.append(self.__queue.get_nowait())
+        except EmptyQueueError:
+            pass
+        return messages
@@ -1,17 +1,32 @@
 # std imports
 import pathlib
+import time
 from multiprocessing import Event
-from multiprocessing.connection import wait
+from typing import ClassVar
 
 # internal imports
 from macpepdb.utilities.generic_process import GenericProcess
+from macpepdb.tasks.database_maintenance.multiprocessing.log_channel import LogChannel
 
 class LoggerProcess(GenericProcess):
     """
-    Writes incoming messages from process_connections to log file. Process is running until all process connections closed by the other end (`EOFError`).
+    Writes incoming messages from the log channel to log file. Process is running until the channel is stopped (`LogChannel.stop()`).
+    Messages are written in batches and the file is flushed periodically instead of after each message.
     """
 
-    def __init__(self, termination_event: Event, log_file_path: pathlib.Path, write_mode: str, process_connections: list):
+    MAX_BATCH_SIZE: ClassVar[int] = 64
+    """Maximum number of messages which are written at once
+    """
+
+    FLUSH_PERIOD: ClassVar[float] = 1.0
+    """Seconds between flushes of the log file
+    """
+
+    WRITE_BUFFER_SIZE: ClassVar[int] = 1 << 16
+    """Buffer size of the log file, so messages are written with few system calls
+    """
+
+    def __init__(self, termination_event: Event, log_file_path: pathlib.Path, write_mode: str, log_channel: LogChannel):
         """
         termination_event : Event
             Event for terminating the process
@@ -19,34 +34,38 @@ class LoggerProcess(GenericProcess):
             Path to logfile
         write_mode : str
             See Pythons `pen()`-method
-        process_connections : List[ProcessConnection]
-            Conection from the processes
+        log_channel : LogChannel
+            Channel which collects the messages of all processes
 
         Returns
         -------
-        EmblFileReaderProcess
+        LoggerProcess
         """
         super().__init__(termination_event)
         self.__log_file_path = log_file_path
         self.__write_mode = write_mode
-        self.__process_connections = process_connections
+        self.__log_channel = log_channel
 
     def run(self):
         """
         Starts the process handling incoming messages.
         """
         self.activate_signal_handling()
-        with self.__log_file_path.open(self.__write_mode) as log_file:
+        with self.__log_file_path.open(self.__write_mode, buffering=self.__class__.WRITE_BUFFER_SIZE) as log_file:
             log_file.write("error logger is online\n")
             log_file.flush()
-            while self.__process_connections:
-                for conn in wait(self.__process_connections):
-                    try:
-                        message = conn.recv()
-                    except EOFError:
-                        self.__process_connections.remove(conn)
-                    else:
-                        log_file.write(f"{message}\n")
-                        log_file.flush()
+            last_flush = time.monotonic()
+            is_stopped = False
+            while not is_stopped:
+                messages = self.__log_channel.receive_batch(self.__class__.FLUSH_PERIOD, self.__class__.MAX_BATCH_SIZE)
+                if LogChannel.STOP_MARKER in messages:
+                    messages = [message for message in messages if message is not LogChannel.STOP_MARKER]
+                    is_stopped = True
+                if messages:
+                    log_file.write("\n".join(str(message) for message in messages))
+                    log_file.write("\n")
+                if time.monotonic() - last_flush > self.__class__.FLUSH_PERIOD:
+                    log_file.flush()
+                    last_flush = time.monotonic()
             log_file.write("error logger is stopping")
             # will be flushed on file close
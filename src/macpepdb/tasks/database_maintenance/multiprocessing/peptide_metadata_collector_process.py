@@ -1,6 +1,5 @@
 # std imports
 from multiprocessing import Queue, Event, Array
-from multiprocessing.connection import Connection as ProcessConnection
 from psycopg2.extras import execute_batch
 from queue import Empty as EmptyQueueError
 from typing import ClassVar
@@ -12,6 +11,7 @@ import psycopg2
 from macpepdb.models.peptide import Peptide
 from macpepdb.models.peptide_metadata import PeptideMetadata
 from macpepdb.utilities.generic_process import GenericProcess
+from macpepdb.tasks.database_maintenance.multiprocessing.log_channel import LogChannel
 
 
 class PeptideMetadataCollectorProcess(GenericProcess):
@@ -30,7 +30,7 @@ class PeptideMetadataCollectorProcess(GenericProcess):
         Queue for peptides
     update_counter : Array
         Counter for updates
-    log_connection : multiprocessing.connection.Connection
+    log_connection : LogChannel
         Connection to the log process
     empty_queue_and_stop_flag : Event
         Event which indicates that the process can stop as soon as the queue is empty.
@@ -61,7 +61,7 @@ class PeptideMetadataCollectorProcess(GenericProcess):
     """Query to prepare statement for flagging the peptide as updated. Order of placeholder: partition, mass, sequence
     """
 
-    def __init__(self, termination_event: Event, id: int, database_url: str, peptides_queue: Queue, update_counter: Array, log_connection: ProcessConnection, empty_queue_and_stop_flag: Event):
+    def __init__(self, termination_event: Event, id: int, database_url: str, peptides_queue: Queue, update_counter: Array, log_connection: LogChannel, empty_queue_and_stop_flag: Event):
         super().__init__(termination_event)
         self.__id = id
         self.__database_url = database_url
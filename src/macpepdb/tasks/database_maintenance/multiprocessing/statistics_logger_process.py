@@ -1,34 +1,35 @@
 # std imports
 import csv
+import operator
 import pathlib
 import time
 from multiprocessing import Array, Event
-from multiprocessing.connection import Connection as ProcessConnection
 from typing import List
 
 # internal imports
 from macpepdb.utilities.generic_process import GenericProcess
+from macpepdb.tasks.database_maintenance.multiprocessing.log_channel import LogChannel
 
 class StatisticsLoggerProcess(GenericProcess):
     """
     Logs statistics.
     """
 
-    def __init__(self, termination_event: Event, statistics: Array, statistics_file_path: pathlib.Path, write_period: int, file_header: List[str], log_connection: ProcessConnection, stop_logging_event: Event):
+    def __init__(self, termination_event: Event, statistics: List[Array], statistics_file_path: pathlib.Path, write_period: int, file_header: List[str], log_connection: LogChannel, stop_logging_event: Event):
         """
         Parameters
         ----------
         termination_event : Event
             Event for terminating the process
-        statistics : Array
-            Shared array for statistics
+        statistics : List[Array]
+            Shared arrays for statistics, e.g. one per worker so no lock is necessary. The values are summed up column-wise.
         statistics_file_path : pathlib.Path
             Path the log file
         write_period : int
             Seconds between logs
         file_header : List[str]
             CSV header should have the same length as the statistics array
-        log_connection : multiprocessing.connection.Connection
+        log_connection : LogChannel
             Connection to the logging process.
         stop_logging_event : Event
             Indicates the process to stop.
@@ -48,33 +49,42 @@ class StatisticsLoggerProcess(GenericProcess):
         self.activate_signal_handling()
         self.__log_connection.send("statistics logger is online")
         # Snapshot of last written statistic to calculate difference
-        last_statistics = [0] * len(self.__statistics)
+        last_statistics = [0] * len(self.__statistics[0])
         start_at = time.time()
         with self.__statistics_file_path.open("w") as statistics_file:
             statistics_writer = csv.writer(statistics_file)
             statistics_writer.writerow(self.__file_header)
             statistics_file.flush()
             while not self.__stop_logging_event.is_set():
-                # Prepare array for next write
-                current_statistics = []
                 # Wait for next write
                 self.__stop_logging_event.wait(self.__write_period)
                 # Calculate seconds after start
                 current_time = int(time.time() - start_at)
                 # Get current statistics
-                current_statistics = [value for value in self.__statistics]
-                # Initialize csv row
-                csv_row = [current_time]
-                # Assign current statistics to csv row
-                for value in current_statistics:
-                    csv_row.append(value)
-                # Calulate differences to last statistics (= rates)
-                for idx in range(0, len(current_statistics)):
-                    csv_row.append(current_statistics[idx] - last_statistics[idx])
+                current_statistics = self.__class__.sum_statistics(self.__statistics)
+                # Seconds, current statistics and the differences to last statistics (= rates)
+                csv_row = [current_time, *current_statistics, *map(operator.sub, current_statistics, last_statistics)]
                 # Write csv row to csv file
                 statistics_writer.writerow(csv_row)
                 statistics_file.flush()
                 # Assign new 'snapshot'
                 last_statistics = current_statistics
         self.__log_connection.send("statistics logger is offline")
-        self.__log_connection.close()
\ No newline at end of file
+        self.__log_connection.close()
+
+    @staticmethod
+    def sum_statistics(statistics: List[Array]) -> List[int]:
+        """
+        Sums up the given statistics column-wise.
+
+        Parameters
+        ----------
+        statistics : List[Array]
+            Shared arrays for statistics with equal lengths
+
+        Returns
+        -------
+        List with the sum of each column
+        """
+        # Slicing copies each array at once instead of reading it element by element
+        return [sum(column) for column in zip(*[process_statistics[:] for process_statistics in statistics])]
\ No newline at end of file
@@ -1,16 +1,30 @@
 # std imports
 import pathlib 
+import time
 from multiprocessing import Event
-from multiprocessing.connection import wait, Connection as ProcessConnection
+from typing import ClassVar
+from multiprocessing.connection import wait
 
 # internal imports
 from macpepdb.utilities.generic_process import GenericProcess
+from macpepdb.tasks.database_maintenance.multiprocessing.log_channel import LogChannel
 
 class UnprocessableProteinLoggerProcess(GenericProcess):
     """
     Writes embl entries from process_connections to log file. Process is running until all process connections closed by the other end (`EOFError`).
+    The entries are expected as raw bytes, send by `Connection.send_bytes()`.
+    The file is flushed periodically instead of after each entry.
     """
-    def __init__(self, termination_event: Event, unprocessible_proteins_fasta_path: pathlib.Path, process_connections: list, log_connection: ProcessConnection):
+
+    FLUSH_PERIOD: ClassVar[float] = 1.0
+    """Seconds between flushes of the log file
+    """
+
+    WRITE_BUFFER_SIZE: ClassVar[int] = 1 << 16
+    """Buffer size of the log file
+    """
+
+    def __init__(self, termination_event: Event, unprocessible_proteins_fasta_path: pathlib.Path, process_connections: list, log_connection: LogChannel):
         """
         Parameters
         ----------
@@ -20,7 +34,7 @@ class UnprocessableProteinLoggerProcess(GenericProcess):
             Path to logfile
         process_connections : List[]
             List of read only from other processes
-        log_connection : multiprocessing.connection.Connection
+        log_connection : LogChannel
             Connection to log process
 
         Returns
@@ -38,15 +52,21 @@ class UnprocessableProteinLoggerProcess(GenericProcess):
         """
         self.activate_signal_handling()
         self.__log_connection.send("unprocessible proteins logger is online")
-        with self.__unprocessible_proteins_fasta_path.open("w") as unprocessible_proteins_file:
+        with self.__unprocessible_proteins_fasta_path.open("wb", buffering=self.__class__.WRITE_BUFFER_SIZE) as unprocessible_proteins_file:
+            last_flush = time.monotonic()
             while self.__process_connections:
-                for conn in wait(self.__process_connections):
+                # The timeout makes sure the file is flushed even if no entries arrive
+                for conn in wait(self.__process_connections, self.__class__.FLUSH_PERIOD):
                     try:
-                        embl_entry = conn.recv()
+                        embl_entry = conn.recv_bytes()
                     except EOFError:
                         self.__process_connections.remove(conn)
                     else:
-                        unprocessible_proteins_file.write(embl_entry + "\n")
-                        unprocessible_proteins_file.flush()
+                        unprocessible_proteins_file.write(embl_entry)
+                        if not embl_entry.endswith(b"\n"):
+                            unprocessible_proteins_file.write(b"\n")
+                if time.monotonic() - last_flush > self.__class__.FLUSH_PERIOD:
+                    unprocessible_proteins_file.flush()
+                    last_flush = time.monotonic()
         self.__log_connection.send("unprocessible proteins logger is stopping")
         self.__log_connection.close()
@@ -9,6 +9,7 @@ from multiprocessing import Event, Value, Queue
 
 # internal imports
 from macpepdb import process_context
+from macpepdb.tasks.database_maintenance.multiprocessing.log_channel import LogChannel
 from macpepdb.tasks.database_maintenance.multiprocessing.logger_process import LoggerProcess
 from macpepdb.tasks.database_maintenance.multiprocessing.peptide_metadata_collector_process import PeptideMetadataCollectorProcess
 from macpepdb.tasks.database_maintenance.multiprocessing.statistics_logger_process import StatisticsLoggerProcess
@@ -67,42 +68,25 @@ class PeptideMetadataCollector:
         # Counter for updates
         update_counter = process_context.Array(c_ulonglong, 1)
 
-        log_connections = []
+        # One channel for the log messages of all processes
+        general_log = LogChannel()
 
         # Start digest worker
         peptide_update_processes = []
         for worker_id in range(0, self.__number_of_threads):
-            general_log_connection_read, general_log_connection_write = process_context.Pipe(duplex=False)
-            log_connections.append(general_log_connection_read)
-            update_peptide_worker = PeptideMetadataCollectorProcess(self.__termination_event, worker_id, database_url, peptide_queue, update_counter, general_log_connection_write, finish_update_event)
+            update_peptide_worker = PeptideMetadataCollectorProcess(self.__termination_event, worker_id, database_url, peptide_queue, update_counter, general_log, finish_update_event)
             update_peptide_worker.start()
             peptide_update_processes.append(update_peptide_worker)
-            # Close these copies of the writeable site of the channel, so only the processes have working copies.
-            general_log_connection_write.close()
-
-        # Start logger for unprocessible proteins
-        general_log_connection_read, general_log_connection_write = process_context.Pipe(duplex=False)
-        log_connections.append(general_log_connection_read)
-        # Close this copy
-        general_log_connection_write.close()
 
         # Statistic writer
-        general_log_connection_read, general_log_connection_write = process_context.Pipe(duplex=False)
-        statistics_logger_process = StatisticsLoggerProcess(self.__termination_event, update_counter, self.__statistics_csv_file_path, self.__statistics_write_period, self.__class__.STATISTIC_FILE_HEADER, general_log_connection_write, logger_stop_event)
+        statistics_logger_process = StatisticsLoggerProcess(self.__termination_event, [update_counter], self.__statistics_csv_file_path, self.__statistics_write_period, self.__class__.STATISTIC_FILE_HEADER, general_log, logger_stop_event)
         statistics_logger_process.start()
-        log_connections.append(general_log_connection_read)
-        # Close this copy
-        general_log_connection_write.close()
 
         # Updatable peptide collector
-        general_log_connection_read, general_log_connection_write = process_context.Pipe(duplex=False)
-        updatable_peptide_collector_process = UpdatablePeptideCollectorProcess(self.__termination_event, database_url, peptide_queue, general_log_connection_write)
+        updatable_peptide_collector_process = UpdatablePeptideCollectorProcess(self.__termination_event, database_url, peptide_queue, general_log)
         updatable_peptide_collector_process.start()
-        log_connections.append(general_log_connection_read)
-        # Close this copy
-        general_log_connection_write.close()
 
-        logger_process = LoggerProcess(self.__termination_event, self.__log_file_path, "w", log_connections)
+        logger_process = LoggerProcess(self.__termination_event, self.__log_file_path, "w", general_log)
         logger_process.start()
 
         while updatable_peptide_collector_process.is_alive():
@@ -125,7 +109,10 @@ class PeptideMetadataCollector:
         self.print_status(update_counter, peptide_queue, status="stopping logger ...")
 
         statistics_logger_process.join()
+        updatable_peptide_collector_process.join()
 
+        # All writers are finished, so the logger can stop after writing the remaining messages
+        general_log.stop()
         logger_process.join()
 
         self.print_status(update_counter, peptide_queue, is_updatable=False)
@@ -3,8 +3,7 @@ import pathlib
 import time
 import random
 import signal
-from multiprocessing import Process, Event, Queue, Pipe, get_context as get_processing_context
-from multiprocessing.connection import Connection, wait
+from multiprocessing import Process, Event, Queue, get_context as get_processing_context
 from queue import Full as QueueFullError, Empty as QueueEmptyError
 from typing import Tuple
 
@@ -12,6 +11,7 @@ from typing import Tuple
 import psycopg2
 
 # internal imports
+from macpepdb.tasks.database_maintenance.multiprocessing.log_channel import LogChannel
 from macpepdb.tasks.database_maintenance.multiprocessing.logger_process import LoggerProcess
 from macpepdb.models.taxonomy import Taxonomy, TaxonomyRank
 from macpepdb.models.taxonomy_merge import TaxonomyMerge
@@ -75,21 +75,21 @@ class TaxonomyTree:
         """
         self.__termination_event.set()
 
-    def __start_work_and_logger_processes(self, work_function, logger_write_mode) -> Tuple[list, Process, Queue, Event]:
+    def __start_work_and_logger_processes(self, work_function, logger_write_mode) -> Tuple[list, Process, Queue, Event, LogChannel]:
         """
         This will create working processes and one logger processes. The worker processes are connected with the logger process.
-        Make sure the worker function has the following argument list: id (int), database_url (str), stop_flag (Event) and log_connection (Connection).
+        Make sure the worker function has the following argument list: id (int), database_url (str), stop_flag (Event), queue (Queue) and log_connection (LogChannel).
         
         Parameters
         ----------
-        work_function : Callable[int, str, Event, Connection]
+        work_function : Callable[int, str, Event, Queue, LogChannel]
             Function which is executed by the worker processes
         logger_write_mode : str
             Write mode for the logger (see write mode for Pythons `open()`-function)
 
         Returns
         -------
-        Tuple (array of worker processes, the logger process, the work queue, and a stop flag for the worker processes)
+        Tuple (array of worker processes, the logger process, the work queue, a stop flag for the worker processes and the log channel)
         """
         # Build processing context
         processing_context = get_processing_context("spawn")
@@ -99,24 +99,21 @@ class TaxonomyTree:
         # Initialize stop flag
         stop_flag = processing_context.Event()
 
+        # One channel for the log messages of all processes
+        log_channel = LogChannel(processing_context)
+
         # Array to collect procs
         procs = []
-        # Array to collect 
-        log_connections = []
 
         for id in range(self.__number_of_threads):
-            log_connection_read, log_connection_write = processing_context.Pipe(duplex=False)
-            log_connections.append(log_connection_read)
-            proc = processing_context.Process(target=work_function, args=(id, self.__database_url, stop_flag, queue, log_connection_write,))
+            proc = processing_context.Process(target=work_function, args=(id, self.__database_url, stop_flag, queue, log_channel,))
             proc.start()
-            # Close this handle of the writeable end to ensure only the process has one
-            log_connection_write.close()
             procs.append(proc)
 
-        logger = LoggerProcess(self.__termination_event, self.__log_file, logger_write_mode, log_connections)
+        logger = LoggerProcess(self.__termination_event, self.__log_file, logger_write_mode, log_channel)
         logger.start()
 
-        return procs, logger, queue, stop_flag
+        return procs, logger, queue, stop_flag, log_channel
 
 
     def __build_taxonomies(self):
@@ -129,7 +126,7 @@ class TaxonomyTree:
             if self.__names_dmp_path.is_dir():
                 raise AssertionError(f"'{self.__names_dmp_path}' is a directory, not a file.")
 
-            procs, logger, queue, stop_flag = self.__start_work_and_logger_processes(self.process_new_taxonomies, "w")
+            procs, logger, queue, stop_flag, log_channel = self.__start_work_and_logger_processes(self.process_new_taxonomies, "w")
 
             print("Build taxonomy tree ...")
             # Map taxonomy_id -> taxonomy
@@ -191,6 +188,7 @@ class TaxonomyTree:
                 proc.join()
 
             # Wait for logger to stop
+            log_channel.stop()
             logger.join()
 
             if len(taxonomies):
@@ -209,7 +207,7 @@ class TaxonomyTree:
             if self.__merge_dmp_path.is_dir():
                 raise AssertionError(f"'{self.__merge_dmp_path}' is a directory, not a file.")
 
-            procs, logger, queue, stop_flag = self.__start_work_and_logger_processes(self.process_taxonomy_merge, "a+")
+            procs, logger, queue, stop_flag, log_channel = self.__start_work_and_logger_processes(self.process_taxonomy_merge, "a+")
 
             print("Process taxonomy merges ...")
             # Open file with node merges.
@@ -254,6 +252,7 @@ class TaxonomyTree:
                 proc.join()
 
             # Wait for logger to stop
+            log_channel.stop()
             logger.join()
 
     def __delete_taxonomies(self):
@@ -263,7 +262,7 @@ class TaxonomyTree:
         if self.__delete_dmp_path.exists():
             if self.__delete_dmp_path.is_dir():
                 raise AssertionError(f"'{self.__delete_dmp_path}' is a directory, not a file.")
-            procs, logger, queue, stop_flag = self.__start_work_and_logger_processes(self.process_taxonomy_deletion, "a+")
+            procs, logger, queue, stop_flag, log_channel = self.__start_work_and_logger_processes(self.process_taxonomy_deletion, "a+")
 
             print("Process taxonomy deletions ...")
             # Open file
@@ -291,10 +290,11 @@ class TaxonomyTree:
                 proc.join()
 
             # Wait for logger to stop
+            log_channel.stop()
             logger.join()
 
     @staticmethod
-    def process_new_taxonomies(id: int, database_url: str, stop_flag: Event, queue: Queue, log_connection: Connection):
+    def process_new_taxonomies(id: int, database_url: str, stop_flag: Event, queue: Queue, log_connection: LogChannel):
         """
         Inserts new taxonomies into the tree
 
@@ -308,8 +308,8 @@ class TaxonomyTree:
             Multiprocessing event to stop the processes
         queue : Queue
             Multiprocessing queue for queuing the new nodes
-        log_connection : Connection
-            Multiprocessing connection to send logs to the logger
+        log_connection : LogChannel
+            Channel to send logs to the logger
         """
         log_connection.send(f"insert worker {id} is online")
         database_connection = None
@@ -348,7 +348,7 @@ class TaxonomyTree:
 
 
     @staticmethod
-    def process_taxonomy_merge(id: int, database_url: str, stop_flag: Event, queue: Queue, log_connection: Connection):
+    def process_taxonomy_merge(id: int, database_url: str, stop_flag: Event, queue: Queue, log_connection: LogChannel):
         """
         Processes taxonomy merges from a queue.
 
@@ -362,8 +362,8 @@ class TaxonomyTree:
             Multiprocessing event to stop the processes
         queue : Queue
             Multiprocessing queue for queuing the merges
-        log_connection : Connection
-            Multiprocessing connection to send logs to the logger
+        log_connection : LogChannel
+            Channel to send logs to the logger
         """
         log_connection.send(f"merge worker {id} is online")
         database_connection = None
@@ -401,7 +401,7 @@ class TaxonomyTree:
         log_connection.close()
 
     @staticmethod
-    def process_taxonomy_deletion(id: int, database_url: str, stop_flag: Event, queue: Queue, log_connection: Connection):
+    def process_taxonomy_deletion(id: int, database_url: str, stop_flag: Event, queue: Queue, log_connection: LogChannel):
         """
         Processes taxonomy merges from a queue.
 
@@ -415,8 +415,8 @@ class TaxonomyTree:
             Multiprocessing event to stop the processes
         queue : Queue
             Multiprocessing queue for queuing the merges
-        log_connection : Connection
-            Multiprocessing connection to send logs to the logger
+        log_connection : LogChannel
+            Channel to send logs to the logger
         """
         log_connection.send(f"deletion worker {id} is online")
         database_connection = None
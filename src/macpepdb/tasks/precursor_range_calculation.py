@@ -2,8 +2,8 @@
 import pathlib
 
 # internal imports
-from macpepdb.proteomics.mass.precursor_range import PrecursorRange
-from macpepdb.proteomics.mass.convert import to_float as mass_to_float, to_int as mass_to_int
+from macpepdb.proteomics.mass.precursor_range import get_precursor_range
+from macpepdb.proteomics.mass.convert import to_int as mass_to_int
 from macpepdb.proteomics.modification_collection import ModificationCollection
 from macpepdb.models.modification_combination_list import ModificationCombinationList
 
@@ -29,7 +29,7 @@ class PrecursorRangeCalculation:
     """
 
     def __init__(self, precursor: int, lower_precursor_tolerance_ppm: int, upper_precursor_tolerance_ppm: int, modification_collection: ModificationCollection, max_number_of_variable_modifications: int, with_partition: bool):
-        self.__precursor_range = PrecursorRange(precursor, lower_precursor_tolerance_ppm, upper_precursor_tolerance_ppm)
+        self.__precursor_range = get_precursor_range(precursor, lower_precursor_tolerance_ppm, upper_precursor_tolerance_ppm)
         self.__max_number_of_variable_modifications = max_number_of_variable_modifications
         self.__with_partition = with_partition
         self.__modification_collection_list = ModificationCombinationList(
@@ -39,25 +39,24 @@ class PrecursorRangeCalculation:
             lower_precursor_tolerance_ppm,
             self.__max_number_of_variable_modifications
         )
+        # Cache for __str__()
+        self.__rendered = None
 
     def __str__(self):
-        result = ""
-        for combination in self.__modification_collection_list:
-            mass = ""
-            amino_acid_counts = []
+        # The calculation does not change, so render it only once
+        if self.__rendered is None:
+            self.__rendered = self.__render()
+        return self.__rendered
 
-            for condition in combination.where_conditions:
-                if not self.__with_partition and condition.column_name == "partition":
-                    continue
-                output = f"{condition.column_name} {condition.operator}"
-                if condition.column_name == "mass":
-                    mass = output % tuple([mass_to_float(mass) for mass in condition.values])
-                else:
-                    amino_acid_counts.append(output % condition.values)
-            amino_acid_counts.sort()
-            result += f"{mass} ({' & '.join(amino_acid_counts)})"
-            result += "\n"
-        return result .replace(" BETWEEN", ":").replace("AND", "-")
+    def __render(self) -> str:
+        """
+        Renders the mass range and amino acid conditions of each modification combination.
+
+        Returns
+        -------
+        One line per modification combination
+        """
+        return "".join(f"{mass} ({amino_acid_counts})\n" for mass, amino_acid_counts in self.__modification_collection_list.format_rows(self.__with_partition))
 
     @classmethod
     def start_from_comand_line(cls, args):
@@ -0,0 +1,38 @@
+# std imports
+from typing import ByteString, Iterable, Iterator
+
+DEFAULT_BUFFER_SIZE: int = 65536
+"""Default minimum size in bytes of the yielded chunks
+"""
+
+def buffered_stream(chunks: Iterable[ByteString], buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[bytes]:
+    """
+    Collects the given chunks and yields them in larger pieces, e.g. to reduce the number of writes of a streamed response.
+
+    Parameters
+    ----------
+    chunks : Iterable[ByteString]
+        Chunks, e.g. from a generator
+    buffer_size : int
+        Minimum size of the yielded pieces, except the last one, by default DEFAULT_BUFFER_SIZE
+
+    Yields
+    ------
+    Iterator[bytes]
+        Concatenated chunks
+    """
+    buffer = bytearray()
+    append_to_buffer = buffer.extend
+    try:
+        for chunk in chunks:
+            append_to_buffer(chunk)
+            if len(buffer) >= buffer_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        # Close a wrapped generator right away when the stream is closed early, so it can release its resources, e.g. database connections
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
@@ -23,7 +23,8 @@ class GenericProcess(process_context.Process):
 
     def activate_signal_handling(self):
         """
-        Handles SIGINT and SIGTERM
+        Handles SIGINT and SIGTERM.
+        Call it at the beginning of `run()`, forked processes inherit the signal handlers of the parent process otherwise.
         """
         signal.signal(signal.SIGINT, self.stop_signal_handler)
         signal.signal(signal.SIGTERM, self.stop_signal_handler)
@@ -31,6 +32,8 @@ class GenericProcess(process_context.Process):
     def stop_signal_handler(self, signal_number, frame):
         """
         Sets the termination event. Callback for `activate_signal_handling`
+        Further SIGINT and SIGTERM are ignored afterwards, as the process is already terminating. So a parent which broadcasts signals
+        repeatedly does not interrupt the process with a Python handler call each time.
 
         Argument
         ========
@@ -39,4 +42,6 @@ class GenericProcess(process_context.Process):
         frame
             Signal frame
         """
-        self.termination_event.set()
\ No newline at end of file
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        self.termination_event.set()
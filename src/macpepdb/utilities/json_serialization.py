@@ -0,0 +1,26 @@
+"""
+Fast JSON serialization to bytes. Uses `orjson` if installed (optional dependency `macpepdb[json]`), otherwise the standard library.
+"""
+
+# std imports
+import json
+from typing import Any
+
+try:
+    # external imports
+    from orjson import dumps
+except ImportError:
+    def dumps(obj: Any) -> bytes:
+        """
+        Serializes the given object to compact, UTF-8 encoded JSON.
+
+        Parameters
+        ----------
+        obj : Any
+            JSON serializable object, e.g. dict, list, str, int, float, bool or None
+
+        Returns
+        -------
+        JSON
+        """
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,152 @@
+# std imports
+import hashlib
+import math
+from multiprocessing import shared_memory
+from typing import ClassVar, Iterable, Iterator
+
+# internal imports
+from macpepdb import process_context
+
+class SharedMemoryBloomFilter:
+    """
+    Bloom filter for strings with its bit array in shared memory, so it can be filled once and queried by multiple processes.
+    A negative answer is always correct, a positive answer is wrong with a probability of about the given error rate
+    as long as no more than `capacity` items were added.
+
+    Parameters
+    ----------
+    capacity : int
+        Expected number of items
+    error_rate : float
+        Probability of false positives, default: 0.01
+    """
+
+    DIGEST_SIZE: ClassVar[int] = 16
+    """Size of the hash (blake2b). It is split into two 64 bit integers from which all bit positions are derived (double hashing).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.__number_of_bits = self.__class__.calculate_number_of_bits(capacity, error_rate)
+        self.__number_of_hashes = max(round(self.__number_of_bits / capacity * math.log(2)), 1)
+        # New shared memory is zero-filled, so all bits are unset
+        self.__shared_memory = shared_memory.SharedMemory(create=True, size=math.ceil(self.__number_of_bits / 8))
+        # Setting bits is a read-modify-write of a whole byte, so concurrent writers need a lock.
+        self.__add_lock = process_context.Lock()
+
+    @staticmethod
+    def calculate_number_of_bits(capacity: int, error_rate: float = 0.01) -> int:
+        """
+        Calculates the size of the bit array for the given capacity and error rate,
+        e.g. to check if enough shared memory is available before creating the filter.
+
+        Parameters
+        ----------
+        capacity : int
+            Expected number of items
+        error_rate : float
+            Probability of false positives, default: 0.01
+
+        Returns
+        -------
+        Number of bits, the shared memory has an eighth of it in bytes
+        """
+        return max(math.ceil(-max(capacity, 1) * math.log(error_rate) / math.log(2) ** 2), 8)
+
+    @property
+    def number_of_bits(self) -> int:
+        """
+        Returns
+        -------
+        Size of the bit array
+        """
+        return self.__number_of_bits
+
+    @property
+    def number_of_hashes(self) -> int:
+        """
+        Returns
+        -------
+        Number of bit positions per item
+        """
+        return self.__number_of_hashes
+
+    def __bit_positions(self, item: str) -> Iterator[int]:
+        """
+        Calculates the bit positions of the given item.
+
+        Parameters
+        ----------
+        item : str
+            Item
+
+        Returns
+        -------
+        Iterator of bit positions
+        """
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=self.__class__.DIGEST_SIZE).digest()
+        first_hash = int.from_bytes(digest[:8], "little")
+        second_hash = int.from_bytes(digest[8:], "little")
+        for hash_idx in range(self.__number_of_hashes):
+            yield (first_hash + hash_idx * second_hash) % self.__number_of_bits
+
+    def add(self, item: str):
+        """
+        Adds an item.
+
+        Parameters
+        ----------
+        item : str
+            Item
+        """
+        buffer = self.__shared_memory.buf
+        with self.__add_lock:
+            for bit_position in self.__bit_positions(item):
+                buffer[bit_position >> 3] |= 1 << (bit_position & 7)
+
+    def add_many(self, items: Iterable[str]):
+        """
+        Adds multiple items while holding the lock only once, which is much faster than adding them one by one.
+
+        Parameters
+        ----------
+        items : Iterable[str]
+            Items
+        """
+        buffer = self.__shared_memory.buf
+        with self.__add_lock:
+            for item in items:
+                for bit_position in self.__bit_positions(item):
+                    buffer[bit_position >> 3] |= 1 << (bit_position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        """
+        Implements 'in'-operator, e.g. item in self
+
+        Parameters
+        ----------
+        item : str
+            Item
+
+        Returns
+        -------
+        False if the item was definitely not added, True if it was probably added.
+        """
+        buffer = self.__shared_memory.buf
+        for bit_position in self.__bit_positions(item):
+            if not buffer[bit_position >> 3] & (1 << (bit_position & 7)):
+                return False
+        return True
+
+    def close(self):
+        """
+        Closes the access to the shared memory for this process.
+        """
+        self.__shared_memory.close()
+
+    def unlink(self):
+        """
+        Closes and releases the shared memory. Call this only once after all processes have stopped using the filter.
+        """
+        self.__shared_memory.close()
+        self.__shared_memory.unlink()
@@ -0,0 +1,215 @@
+# std imports
+import struct
+import time
+from ctypes import c_ulonglong
+from multiprocessing import shared_memory
+from queue import Empty as EmptyQueueError, Full as FullQueueError
+from typing import ClassVar, Optional
+
+# internal imports
+from macpepdb import process_context
+
+class SharedMemoryRingBuffer:
+    """
+    FIFO queue for byte strings which are stored in a shared memory ring buffer instead of being pickled and sent through a pipe
+    like `multiprocessing.Queue` does. Supports multiple producers and consumers. The interface is similar to `multiprocessing.Queue`,
+    so `queue.Full` and `queue.Empty` are raised on timeouts.
+
+    Each item is stored as 8 byte length header followed by the data. If an item does not fit into the remaining space at the end
+    of the buffer, a wrap marker is written and the item is stored at the beginning.
+
+    Parameters
+    ----------
+    size : int
+        Size of the buffer in bytes
+    max_items : int
+        Maximum number of queued items, regardless of the used bytes
+    """
+
+    ITEM_HEADER: ClassVar[struct.Struct] = struct.Struct("Q")
+    """Length header of each item
+    """
+
+    WRAP_MARKER: ClassVar[int] = 2**64 - 1
+    """Header value which indicates that the next item starts at the beginning of the buffer
+    """
+
+    WRITE_POSITION: ClassVar[int] = 0
+    READ_POSITION: ClassVar[int] = 1
+    ITEM_COUNT: ClassVar[int] = 2
+    IS_ABORTED: ClassVar[int] = 3
+    """Indexes of the state array
+    """
+
+    def __init__(self, size: int, max_items: int):
+        self.__size = size
+        self.__max_items = max_items
+        self.__shared_memory = shared_memory.SharedMemory(create=True, size=size)
+        # [write position, read position, number of items, aborted flag]
+        self.__state = process_context.Array(c_ulonglong, 4, lock=False)
+        self.__condition = process_context.Condition()
+
+    @property
+    def max_items(self) -> int:
+        """
+        Returns
+        -------
+        Maximum number of queued items
+        """
+        return self.__max_items
+
+    def put(self, data: bytes, block: bool = True, timeout: Optional[float] = None):
+        """
+        Appends data to the buffer.
+
+        Parameters
+        ----------
+        data : bytes
+            Data
+        block : bool
+            Wait for free space, default: True
+        timeout : Optional[float]
+            Maximum seconds to wait for free space, waits forever if None
+
+        Raises
+        ------
+        ValueError
+            If the data is larger than the buffer
+        queue.Full
+            If the data could not be stored in time or the buffer was aborted
+        """
+        item_size = self.__class__.ITEM_HEADER.size + len(data)
+        if item_size > self.__size:
+            raise ValueError(f"item of {item_size} bytes is larger than the buffer ({self.__size} bytes)")
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.__condition:
+            while True:
+                if self.__state[self.__class__.IS_ABORTED]:
+                    raise FullQueueError()
+                write_position = self.__reserve(item_size)
+                if write_position is not None:
+                    break
+                remaining_time = deadline - time.monotonic() if deadline is not None else None
+                if not block or (remaining_time is not None and remaining_time <= 0):
+                    raise FullQueueError()
+                self.__condition.wait(remaining_time)
+            self.__class__.ITEM_HEADER.pack_into(self.__shared_memory.buf, write_position, len(data))
+            data_start = write_position + self.__class__.ITEM_HEADER.size
+            self.__shared_memory.buf[data_start:data_start + len(data)] = data
+            self.__state[self.__class__.WRITE_POSITION] = write_position + item_size
+            self.__state[self.__class__.ITEM_COUNT] += 1
+            self.__condition.notify_all()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> bytes:
+        """
+        Removes and returns the oldest item from the buffer.
+
+        Parameters
+        ----------
+        block : bool
+            Wait for an item, default: True
+        timeout : Optional[float]
+            Maximum seconds to wait for an item, waits forever if None
+
+        Returns
+        -------
+        Data
+
+        Raises
+        ------
+        queue.Empty
+            If no item was available in time
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.__condition:
+            while self.__state[self.__class__.ITEM_COUNT] == 0:
+                remaining_time = deadline - time.monotonic() if deadline is not None else None
+                if not block or (remaining_time is not None and remaining_time <= 0):
+                    raise EmptyQueueError()
+                self.__condition.wait(remaining_time)
+            read_position = self.__state[self.__class__.READ_POSITION]
+            if self.__size - read_position < self.__class__.ITEM_HEADER.size \
+                or self.__class__.ITEM_HEADER.unpack_from(self.__shared_memory.buf, read_position)[0] == self.__class__.WRAP_MARKER:
+                read_position = 0
+            data_length = self.__class__.ITEM_HEADER.unpack_from(self.__shared_memory.buf, read_position)[0]
+            data_start = read_position + self.__class__.ITEM_HEADER.size
+            data = bytes(self.__shared_memory.buf[data_start:data_start + data_length])
+            self.__state[self.__class__.READ_POSITION] = data_start + data_length
+            self.__state[self.__class__.ITEM_COUNT] -= 1
+            self.__condition.notify_all()
+            return data
+
+    def __reserve(self, item_size: int) -> Optional[int]:
+        """
+        Returns the position where an item of the given size can be written. Must be called while holding the condition.
+
+        Parameters
+        ----------
+        item_size : int
+            Item size, including the header
+
+        Returns
+        -------
+        Write position or None if there is not enough contiguous space.
+        """
+        item_count = self.__state[self.__class__.ITEM_COUNT]
+        if item_count >= self.__max_items:
+            return None
+        if item_count == 0:
+            # Buffer is empty, so start at the beginning again
+            self.__state[self.__class__.WRITE_POSITION] = 0
+            self.__state[self.__class__.READ_POSITION] = 0
+            return 0
+        write_position = self.__state[self.__class__.WRITE_POSITION]
+        read_position = self.__state[self.__class__.READ_POSITION]
+        if write_position > read_position:
+            # Free space is at the end and before the read position
+            if self.__size - write_position >= item_size:
+                return write_position
+            if read_position >= item_size:
+                if self.__size - write_position >= self.__class__.ITEM_HEADER.size:
+                    self.__class__.ITEM_HEADER.pack_into(self.__shared_memory.buf, write_position, self.__class__.WRAP_MARKER)
+                return 0
+            return None
+        # Writer already wrapped around, free space is between write and read position
+        if read_position - write_position >= item_size:
+            return write_position
+        return None
+
+    def abort(self):
+        """
+        Wakes up all blocked producers and makes all current and future calls of `put()` raise `queue.Full`, e.g. on termination
+        when the consumers are gone and producers would wait forever. Queued items can still be taken.
+        """
+        with self.__condition:
+            self.__state[self.__class__.IS_ABORTED] = 1
+            self.__condition.notify_all()
+
+    def qsize(self) -> int:
+        """
+        Returns
+        -------
+        Number of queued items
+        """
+        return self.__state[self.__class__.ITEM_COUNT]
+
+    def empty(self) -> bool:
+        """
+        Returns
+        -------
+        True if no items are queued
+        """
+        return self.qsize() == 0
+
+    def close(self):
+        """
+        Closes the access to the shared memory for this process.
+        """
+        self.__shared_memory.close()
+
+    def unlink(self):
+        """
+        Closes and releases the shared memory. Call this only once after all processes have stopped using the buffer.
+        """
+        self.__shared_memory.close()
+        self.__shared_memory.unlink()
@@ -0,0 +1,64 @@
+# std imports
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class TTLCache:
+    """
+    Thread safe cache whose entries expire after a given time. If the cache is full, the least recently used entry is dropped.
+
+    Parameters
+    ----------
+    ttl : float
+        Seconds until an entry expires
+    max_size : int
+        Maximum number of entries
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.__ttl = ttl
+        self.__max_size = max_size
+        # key => (expiration time, value)
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get_or_set(self, key: Hashable, value_factory: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for the given key. If there is no valid entry, the value is created by the value factory and cached.
+        `None` is returned but not cached, so missing values (e.g. not found lookups) are created again on the next call.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key
+        value_factory : Callable[[], Any]
+            Function which creates the value
+
+        Returns
+        -------
+        Cached or created value
+        """
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.__entries.move_to_end(key)
+                return entry[1]
+        # Create the value outside of the lock, so slow factories (e.g. database queries) do not block other keys.
+        value = value_factory()
+        if value is None:
+            return value
+        with self.__lock:
+            self.__entries[key] = (now + self.__ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self.__lock:
+            self.__entries.clear()
@@ -2,20 +2,24 @@ from __future__ import annotations
 from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum, unique
+import itertools
 import json
-import math
+from operator import methodcaller
 import traceback
-from typing import ByteString, Callable, Iterator, List, Iterable, Optional, Any
+from typing import ByteString, Callable, ClassVar, Dict, Iterator, List, Iterable, Optional, Any, Tuple
 
-from flask import jsonify, Response
+from flask import Response
 from macpepdb.database.query_helpers.where_condition import WhereCondition
-from macpepdb.proteomics.mass.convert import to_int as mass_to_int
+from macpepdb.proteomics.mass.convert import to_float as mass_to_float, to_int as mass_to_int
 from macpepdb.proteomics.modification import Modification
 from macpepdb.proteomics.modification_collection import ModificationCollection
 from macpepdb.models.modification_combination_list import ModificationCombinationList
 from macpepdb.models.taxonomy import Taxonomy
 from macpepdb.models.peptide import Peptide
 from macpepdb.helpers.metadata_condition import MetadataCondition
+from macpepdb.utilities.buffered_stream import buffered_stream
+from macpepdb.utilities.ttl_cache import TTLCache
+from macpepdb.web.utility.json_response import jsonify
 from macpepdb.web.server import get_database_connection, macpepdb_pool, app
 from macpepdb.web.controllers.application_controller import ApplicationController
 
@@ -36,28 +40,71 @@ class OutputFormat(Enum):
 
     @classmethod
     def from_value(cls, value: str) -> OutputFormat:
-        lower_value = value.lower()
-        for format in cls:
-            if format.value == lower_value:
-                return format
-        raise KeyError(f"f{value} not found")
+        output_format = OUTPUT_FORMATS_BY_VALUE.get(value.lower())
+        if output_format is None:
+            raise KeyError(f"f{value} not found")
+        return output_format
+
+OUTPUT_FORMATS_BY_VALUE: Dict[str, OutputFormat] = {output_format.value: output_format for output_format in OutputFormat}
+"""Lookup for output formats by value, e.g. "application/json"
+"""
 
 class ApiAbstractPeptideController(ApplicationController):
     SUPPORTED_ORDER_COLUMNS = ['mass', 'length', 'sequence', 'number_of_missed_cleavages']
     SUPPORTED_ORDER_DIRECTIONS = ['asc', 'desc']
     FASTA_SEQUENCE_LEN = 60
 
+    ORDER_BY_INSTRUCTIONS: ClassVar[Dict[Tuple[str, str], str]] = {
+        (column, direction): f"{column} {direction}, sequence ASC" for column, direction in itertools.product(SUPPORTED_ORDER_COLUMNS, SUPPORTED_ORDER_DIRECTIONS)
+    }
+    """Precomputed ORDER BY instructions for each supported column and direction. Only these constant strings are passed into the SQL query.
+    """
+
     PEPTIDE_QUERY_DEFAULT_COLUMNS = ["mass", "sequence", "number_of_missed_cleavages", "length", "is_swiss_prot", "is_trembl", "taxonomy_ids", "unique_taxonomy_ids", "proteome_ids"]
 
+    PEPTIDE_SEARCH_FETCH_SIZE = 10000
+    """Number of peptides which are fetched at once from the server side cursor of the peptide search
+    """
+
+    SUB_SPECIES_CACHE = TTLCache(3600, 1024)
+    """Caches the sub species IDs of searched taxonomies for an hour, so the recursive query runs only once for frequently searched taxonomies.
+    The taxonomy tree changes only with a database maintenance. Unknown taxonomies are not cached, so taxonomies added by a maintenance are found immediately.
+    """
+
+    @staticmethod
+    def _select_sub_species_ids(database_connection, taxonomy_id: int) -> Optional[Tuple[int, ...]]:
+        """
+        Selects the IDs of all sub species of the given taxonomy.
+
+        Parameters
+        ----------
+        database_connection
+            Database connection
+        taxonomy_id : int
+            Taxonomy ID
+
+        Returns
+        -------
+        Tuple of sub species IDs or None if the taxonomy does not exist
+        """
+        with database_connection.cursor() as database_cursor:
+            taxonomy = Taxonomy.select(
+                database_cursor,
+                (
+                    "id = %s",
+                    (taxonomy_id, )
+                )
+            )
+            if taxonomy is None:
+                return None
+            return tuple(sub.id for sub in taxonomy.sub_species(database_cursor))
+
     @staticmethod
     def _search(request, file_extension: str):
         errors = defaultdict(list)
-        data = None
-        if request.headers.get("Content-Type", "") == "application/json":
-            data = request.get_json()
-        elif request.headers.get("Content-Type", "") == "application/x-www-form-urlencoded":
-            # For use with classical form-tag. The JSON-formatted search parameters should be provided in the form parameter "search_params"
-            data = json.loads(request.form.get("search_params", "{}"))
+        # get_json() accepts every JSON content type (e.g. with charset) and returns None for other requests.
+        # For use with classical form-tag. The JSON-formatted search parameters should be provided in the form parameter "search_params"
+        data = request.get_json(silent=True) or json.loads(request.form.get("search_params", "{}"))
 
         include_count = False
         if 'include_count' in data and isinstance(data['include_count'], bool):
@@ -145,18 +192,14 @@ class ApiAbstractPeptideController(ApplicationController):
                     # List of metadata conditions
                     if "taxonomy_id" in data:
                         if isinstance(data["taxonomy_id"], int):
-                            with database_connection.cursor() as database_cursor:
-                                taxonomy = Taxonomy.select(
-                                    database_cursor,
-                                    (
-                                        "id = %s",
-                                        (data["taxonomy_id"], )
-                                    )
-                                )
-                                if taxonomy is not None:
-                                    metadata_condition.taxonomy_ids = [sub.id for sub in taxonomy.sub_species(database_cursor)]
-                                else:
-                                    errors["taxonomy_id"].append("not found")
+                            sub_species_ids = ApiAbstractPeptideController.SUB_SPECIES_CACHE.get_or_set(
+                                data["taxonomy_id"],
+                                lambda: ApiAbstractPeptideController._select_sub_species_ids(database_connection, data["taxonomy_id"])
+                            )
+                            if sub_species_ids is not None:
+                                metadata_condition.taxonomy_ids = list(sub_species_ids)
+                            else:
+                                errors["taxonomy_id"].append("not found")
 
                         else:
                             errors["taxonomy_id"].append("must be an integer")
@@ -179,7 +222,7 @@ class ApiAbstractPeptideController(ApplicationController):
                     # Sort by `order_by`
                     order_by_instruction = "sequence ASC"
                     if order_by and not output_style == OutputFormat.text:
-                        order_by_instruction = f"{order_by} {data['order_direction']}, sequence ASC"
+                        order_by_instruction = ApiAbstractPeptideController.ORDER_BY_INSTRUCTIONS[(order_by, data.get("order_direction", "asc"))]
 
                     # Note about offset and limit: It is much faster to fetch data from server and discard rows below the offset and stop the fetching when the limit is reached, instead of applying LIMIT and OFFSET directly to the query.
                     # Even on high offsets, which discards a lot of rows, this approach is faster.
@@ -187,10 +230,11 @@ class ApiAbstractPeptideController(ApplicationController):
                     # Applying OFFSET and LIMIT to query: 49 - 52 seconds
                     # Discarding rows which are below the offset and stop the fetching early: a few hundred miliseconds (not printed by curl).
                     offset = 0
-                    limit = math.inf
+                    limit = None
                     if "limit" in data:
                         if isinstance(data["limit"], int):
-                            limit = data["limit"]
+                            # Limits below 1 were never applied, so they mean no limit
+                            limit = data["limit"] if data["limit"] > 0 else None
                         else:
                             errors["limit"].append("must be an integer")
                     if "offset" in data:
@@ -211,37 +255,56 @@ class ApiAbstractPeptideController(ApplicationController):
 
         include_metadata = include_metadata or metadata_condition.has_conditions()
 
-        peptide_conversion = lambda _, __: (b"",)       # lambda to convert peptide to output type
+        # Text, CSV and FASTA output without metadata only need sequence, mass and missed cleavages, which are formatted directly from the rows
+        use_raw_rows = not include_metadata and output_style in (OutputFormat.text, OutputFormat.csv, OutputFormat.fasta)
+
+        peptide_conversion = lambda _: (b"",)           # function to convert peptide to output type
         delimiter = b""                                 # delimiter between each converted peptide
         pre_peptide_content = b""                       # content before peptide
         post_peptide_content = lambda _, __, ___: b""   # content after peptides
 
+        # methodcaller() is implemented in C, so it is cheaper per peptide than a lambda calling the method
         if output_style == OutputFormat.json:
-            peptide_conversion = lambda _, peptide: peptide.to_json()
+            peptide_conversion = methodcaller("to_json")
             delimiter = b","
             pre_peptide_content = b"{\"peptides\":["
             post_peptide_content = lambda _, __, ___: b"]}"
             if include_count:
-                post_peptide_content = lambda database_cursor, where_condition, metadata_condition: f"],\"count\":{Peptide.count_on_stream(database_cursor, where_condition, metadata_condition)}}}".encode("utf-8")
+                post_peptide_content = lambda database_cursor, where_condition, metadata_condition: b"],\"count\":%d}" % Peptide.count_on_stream(database_cursor, where_condition, metadata_condition)
         elif output_style == OutputFormat.stream:
-            peptide_conversion = lambda _, peptide: peptide.to_json()
+            peptide_conversion = methodcaller("to_json")
             delimiter = b"\n"
         elif output_style == OutputFormat.fasta:
-            peptide_conversion = lambda peptide_idx, peptide: peptide.to_fasta_entry(f"P{peptide_idx}".encode())
+            # Peptides are numbered consecutively, starting after the offset
+            peptide_numbers = itertools.count(max(offset, 0) + 1)
+            sequence_to_fasta_entry = Peptide.sequence_to_fasta_entry
+            if use_raw_rows:
+                peptide_conversion = lambda row: sequence_to_fasta_entry(row[0], b"P%d" % next(peptide_numbers))
+            else:
+                peptide_conversion = lambda peptide: sequence_to_fasta_entry(peptide.sequence, b"P%d" % next(peptide_numbers))
             delimiter = b"\n"
         elif output_style == OutputFormat.csv:
-            peptide_conversion = lambda _, peptide: peptide.to_csv_row()
+            if use_raw_rows:
+                csv_row_format = Peptide.CSV_ROW_FORMAT
+                peptide_conversion = lambda row: ((csv_row_format % (mass_to_float(row[2]), row[0], row[1])).encode("utf-8"),)
+            else:
+                csv_row_formatter = Peptide.csv_row_formatter(include_metadata)
+                peptide_conversion = lambda peptide: (csv_row_formatter(peptide),)
             delimiter = b"\n"
             pre_peptide_content = (
                 ",".join(Peptide.CSV_HEADER).encode("utf-8") if not include_metadata else \
                 ",".join(Peptide.CSV_HEADER + Peptide.METADATA_CSV_HEADER).encode("utf-8")
             ) + b"\n"
         elif output_style == OutputFormat.text:
-            peptide_conversion = lambda _, peptide: peptide.to_plain_text()
+            if use_raw_rows:
+                peptide_conversion = lambda row: (row[0].encode("utf-8"),)
+            else:
+                peptide_conversion = methodcaller("to_plain_text")
             delimiter = b"\n"
 
+        # Collect the many small chunks of the stream, so the server writes fewer but larger chunks
         return Response(
-            ApiAbstractPeptideController.stream(
+            buffered_stream(ApiAbstractPeptideController.stream(
                 peptide_conversion,
                 delimiter,
                 pre_peptide_content,
@@ -251,22 +314,23 @@ class ApiAbstractPeptideController(ApplicationController):
                 offset,
                 limit,
                 include_metadata,
-                metadata_condition
-            ),
+                metadata_condition,
+                use_raw_rows
+            )),
             content_type=f"{output_style}; charset=utf-8"
         )
 
     @staticmethod
-    def stream(peptide_conversion: Callable[[int, Peptide], Iterator[ByteString]], delimiter: ByteString, pre_peptide_content: ByteString, post_peptide_content: Callable[[Any, WhereCondition, MetadataCondition], ByteString],
-        where_condition: WhereCondition, order_by_instruction: str, offset: int, limit: int, include_metadata: bool,
-        metadata_condition: MetadataCondition) -> Iterable[ByteString]:
+    def stream(peptide_conversion: Callable[[Peptide], Iterator[ByteString]], delimiter: ByteString, pre_peptide_content: ByteString, post_peptide_content: Callable[[Any, WhereCondition, MetadataCondition], ByteString],
+        where_condition: WhereCondition, order_by_instruction: str, offset: int, limit: Optional[int], include_metadata: bool,
+        metadata_condition: MetadataCondition, raw_rows: bool = False) -> Iterable[ByteString]:
         """
         Queries peptides and yields content for a stream response.
 
         Parameters
         ----------
-        peptide_conversion : Callable[[int, Peptide], Iterator[ByteString]]
-            Function with peptide index and peptide as input and yields the given peptide as bytes string for the response.
+        peptide_conversion : Callable[[Peptide], Iterator[ByteString]]
+            Function with peptide as input and yields the given peptide as bytes string for the response.
         delimiter : ByteString
             Delimiter between peptides
         pre_peptide_content : ByteString
@@ -280,12 +344,15 @@ class ApiAbstractPeptideController(ApplicationController):
             OrderBy instruction for SQL query
         offset : int
             Search offset
-        limit : int
-            Return limit
+        limit : Optional[int]
+            Return limit, None for no limit
         include_metadata : bool
             If ture metadata will be included.
         metadata_condition : MetadataCondition
             Conditions for metadata. If not empty it sets metadata to true.
+        raw_rows : bool
+            If true `peptide_conversion` is called with the raw rows `(sequence, number_of_missed_cleavages, mass)` instead of peptides.
+            Not supported in combination with `include_metadata`.
 
         Yields
         ------
@@ -300,22 +367,30 @@ class ApiAbstractPeptideController(ApplicationController):
         try:
             yield pre_peptide_content
             with database_connection.cursor(name="peptide_search") as database_cursor:
-                # Counter for written peptides necessary of manual limit offset handling
-                written_peptides = 0
-                matching_peptides = 0
-                for peptide in Peptide.select(database_cursor, where_condition, order_by=order_by_instruction, include_metadata=include_metadata, stream=True):
-                    if do_metadata_checks and not metadata_condition.validate(peptide.metadata):
-                        continue
-                    matching_peptides += 1
-                    if matching_peptides <= offset:
-                        continue
-                    if written_peptides > 0:
-                        yield delimiter
-                    yield from peptide_conversion(matching_peptides, peptide)
-                    written_peptides += 1
-                    # Break peptide cursor loop if limit is hit
-                    if written_peptides == limit:
-                        break
+                database_cursor.itersize = ApiAbstractPeptideController.PEPTIDE_SEARCH_FETCH_SIZE
+                # Metadata conditions are part of the query, so all returned peptides are matching
+                peptides = Peptide.select(
+                    database_cursor,
+                    where_condition,
+                    order_by=order_by_instruction,
+                    include_metadata=include_metadata,
+                    stream=True,
+                    metadata_condition=metadata_condition if do_metadata_checks else None,
+                    raw=raw_rows
+                )
+                # Let islice skip the peptides below the offset and stop fetching when the limit is hit
+                offset = max(offset, 0)
+                stop = offset + limit if limit is not None else None
+                matching_peptides = itertools.islice(peptides, offset, stop)
+                # Local name for the hot loop
+                convert = peptide_conversion
+                for peptide in matching_peptides:
+                    yield from convert(peptide)
+                    # Delimiter is only needed between peptides, so the first one is handled separately
+                    break
+                for peptide in matching_peptides:
+                    yield delimiter
+                    yield from convert(peptide)
             with database_connection.cursor() as database_cursor:
                 yield post_peptide_content(database_cursor, where_condition, metadata_condition if do_metadata_checks else None)
         except BaseException as e:
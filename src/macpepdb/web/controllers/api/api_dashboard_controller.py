@@ -2,43 +2,76 @@
 from typing import Dict, Any
 
 # 3rd party imports
-from flask import jsonify
+from flask import Response
 from macpepdb.models.maintenance_information import MaintenanceInformation
 
 # internal imports
+from macpepdb.utilities.json_serialization import dumps as json_dumps
+from macpepdb.utilities.ttl_cache import TTLCache
 from macpepdb.web.server import app, get_database_connection
 from macpepdb.web.controllers.application_controller import ApplicationController
 
 class ApiDashboardController(ApplicationController):
+    RESPONSE_CACHE = TTLCache(5, 2)
+    """Caches the serialized responses for a few seconds, so polling dashboards do not query the database on each request.
+    """
+
     @staticmethod
     def status():
+        return Response(
+            ApiDashboardController.RESPONSE_CACHE.get_or_set("status", ApiDashboardController.__status_json),
+            content_type="application/json"
+        )
+
+    @staticmethod
+    def __status_json() -> bytes:
+        """
+        Returns
+        -------
+        Cluster and database status as JSON
+        """
         database_connection = get_database_connection()
         with database_connection.cursor() as database_cursor:
             database_cursor.execute("SELECT count(*) from pg_dist_node");
             number_of_nodes = database_cursor.fetchone()[0]
 
-            database_cursor.execute("SELECT * FROM get_rebalance_progress()");
-            rebalance_job_rows = database_cursor.fetchall()
-            finished_rebalance_job_rows = list(filter(lambda row: row[8] == 2, rebalance_job_rows))
-            running_rebalance_job_rows = list(filter(lambda row: row[8] == 1, rebalance_job_rows))
+            # Let the database count the rebalance jobs by progress (1 = moving, 2 = moved) instead of transferring all rows
+            database_cursor.execute("SELECT count(*), count(*) FILTER (WHERE progress = 2), count(*) FILTER (WHERE progress = 1) FROM get_rebalance_progress()");
+            number_of_rebalance_jobs, number_of_finished_rebalance_jobs, number_of_running_rebalance_jobs = database_cursor.fetchone()
             database_status = MaintenanceInformation.select(database_cursor, MaintenanceInformation.DATABASE_STATUS_KEY)
             status: Dict[str, Any] = {
                 "number_of_nodes": number_of_nodes,
-                "number_of_rebalance_jobs": len(rebalance_job_rows),
-                "number_of_finished_rebalance_jobs": len(finished_rebalance_job_rows),
-                "number_of_running_rebalance_jobs": len(running_rebalance_job_rows),
+                "number_of_rebalance_jobs": number_of_rebalance_jobs,
+                "number_of_finished_rebalance_jobs": number_of_finished_rebalance_jobs,
+                "number_of_running_rebalance_jobs": number_of_running_rebalance_jobs,
             }
             status.update(database_status.values)
-            return jsonify(status)
+            return json_dumps(status)
 
     @staticmethod
     def maintenance():
+        return Response(
+            ApiDashboardController.RESPONSE_CACHE.get_or_set("maintenance", ApiDashboardController.__maintenance_json),
+            content_type="application/json"
+        )
+
+    @staticmethod
+    def __maintenance_json() -> bytes:
+        """
+        Returns
+        -------
+        Comment and digestion parameters as JSON
+        """
         database_connection = get_database_connection()
         with database_connection.cursor() as database_cursor:
-            comment = MaintenanceInformation.select(database_cursor, MaintenanceInformation.COMMENT_KEY)
-            digestion_parameter = MaintenanceInformation.select(database_cursor, MaintenanceInformation.DIGESTION_PARAMTERS_KEY)
+            maintenance_information = MaintenanceInformation.select_many(
+                database_cursor,
+                (MaintenanceInformation.COMMENT_KEY, MaintenanceInformation.DIGESTION_PARAMTERS_KEY)
+            )
+            comment = maintenance_information.get(MaintenanceInformation.COMMENT_KEY)
+            digestion_parameter = maintenance_information[MaintenanceInformation.DIGESTION_PARAMTERS_KEY]
 
-            return jsonify({
+            return json_dumps({
                 "comment": comment.values["comment"] if comment is not None else None,
                 "digestion_parameters": digestion_parameter.values
             })
@@ -8,20 +8,30 @@ from flask import send_file
 class ApiDocumentsController:
     DOCUMENTS_FOLDER: ClassVar[Path] = Path(__file__).parent.parent.parent.parent
     INCREASING_PERFORMANCE_POSTER_PATH: ClassVar[Path] = DOCUMENTS_FOLDER.joinpath("documents/20220314-macpepdb__increasing-performance.pdf")
-    INCREASING_PERFORMANCE_POSTER_PATH: ClassVar[Path] = DOCUMENTS_FOLDER.joinpath("documents/20220331-enhancement_of_macpepdb.pdf")
+    ENHANCEMENT_POSTER_PATH: ClassVar[Path] = DOCUMENTS_FOLDER.joinpath("documents/20220331-enhancement_of_macpepdb.pdf")
+    # send_file() converts paths to strings on each call, so keep the strings
+    INCREASING_PERFORMANCE_POSTER_PATH_STR: ClassVar[str] = str(INCREASING_PERFORMANCE_POSTER_PATH)
+    ENHANCEMENT_POSTER_PATH_STR: ClassVar[str] = str(ENHANCEMENT_POSTER_PATH)
+    CACHE_TIMEOUT: ClassVar[int] = 86400
+    """Seconds clients may cache the documents. They are static, so conditional requests are answered with 304 Not Modified.
+    """
 
     @staticmethod
     def increasing_performance():
         return send_file(
-            ApiDocumentsController.INCREASING_PERFORMANCE_POSTER_PATH,
+            ApiDocumentsController.INCREASING_PERFORMANCE_POSTER_PATH_STR,
             as_attachment=True,
-            attachment_filename=ApiDocumentsController.INCREASING_PERFORMANCE_POSTER_PATH.name
+            attachment_filename=ApiDocumentsController.INCREASING_PERFORMANCE_POSTER_PATH.name,
+            conditional=True,
+            cache_timeout=ApiDocumentsController.CACHE_TIMEOUT
         )
 
     @staticmethod
     def enhancement():
         return send_file(
-            ApiDocumentsController.INCREASING_PERFORMANCE_POSTER_PATH,
+            ApiDocumentsController.ENHANCEMENT_POSTER_PATH_STR,
             as_attachment=True,
-            attachment_filename=ApiDocumentsController.INCREASING_PERFORMANCE_POSTER_PATH.name
+            attachment_filename=ApiDocumentsController.ENHANCEMENT_POSTER_PATH.name,
+            conditional=True,
+            cache_timeout=ApiDocumentsController.CACHE_TIMEOUT
         )
\ No newline at end of file
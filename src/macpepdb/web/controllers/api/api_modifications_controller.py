@@ -1,13 +1,18 @@
-from flask import jsonify
+from flask import Response
 
 from macpepdb.proteomics.modification import ModificationPosition
+from macpepdb.utilities.json_serialization import dumps as json_dumps
 
 from macpepdb.web.server import app
 from macpepdb.web.controllers.application_controller import ApplicationController
 
 class ApiModificationsController(ApplicationController):
+    MODIFICATION_POSITIONS_JSON = json_dumps({
+        "modification_positions": sorted([str(position) for position in ModificationPosition])
+    })
+    """Response body of `modification_positions()`. The positions are constant, so it is serialized only once.
+    """
+
     @staticmethod
     def modification_positions():
-        return jsonify({
-            "modification_positions": sorted([str(position) for position in ModificationPosition])
-        })
\ No newline at end of file
+        return Response(ApiModificationsController.MODIFICATION_POSITIONS_JSON, content_type="application/json")
@@ -1,23 +1,55 @@
 # std imports
 from collections import defaultdict
-import itertools
-from typing import ClassVar, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+import os
+from typing import ClassVar, Iterator, List, Set, Tuple
 
 # 3rd party imports
-from flask import request, jsonify, Response
+from flask import request, Response
 from macpepdb.database.query_helpers.where_condition import WhereCondition
 from macpepdb.models.peptide import Peptide
 from macpepdb.models.protein import Protein
 from macpepdb.models.protein_peptide_association import ProteinPeptideAssociation
 from macpepdb.proteomics.mass.convert import to_float as mass_to_float
 from macpepdb.proteomics.enzymes import get_digestion_enzyme_by_name
+from macpepdb.utilities.buffered_stream import buffered_stream
+from macpepdb.web.utility.json_response import jsonify
 from macpepdb.web.server import app, get_database_connection, macpepdb_pool
 from macpepdb.web.controllers.api.api_abstract_peptide_controller import ApiAbstractPeptideController
 from macpepdb.web.controllers.api.api_digestion_controller import ApiDigestionController
 
+@lru_cache(maxsize=100000)
+def get_partition_and_mass(sequence: str) -> Tuple[int, int]:
+    """
+    Calculates partition and mass of the given sequence. The results are cached, as lookups often contain the same sequences.
+
+    Parameters
+    ----------
+    sequence : str
+        Upper case amino acid sequence
+
+    Returns
+    -------
+    Tuple of partition and mass
+    """
+    mass = Peptide.calculate_mass(sequence)
+    return Peptide.get_partition(mass), mass
 
 class ApiPeptidesController(ApiAbstractPeptideController):
     PEPTIDE_LOOKUP_CHUNKS: ClassVar[int] = 500
+    """Number of peptides which are looked up with one query
+    """
+
+    MAX_LOOKUP_SEQUENCES: ClassVar[int] = 50000
+    """Maximum number of sequences per lookup request, so a single request can not occupy the connection pool for minutes
+    """
+
+    FETCH_ITERSIZE: ClassVar[int] = int(os.getenv("MACPEPDB_WEB_FETCH_ITERSIZE", "1024"))
+    """Number of rows which are fetched at once by the server side cursor of the sequence lookup, independent of `PEPTIDE_LOOKUP_CHUNKS`.
+    Can be set with the environment variable `MACPEPDB_WEB_FETCH_ITERSIZE`.
+    """
 
     @staticmethod
     def search(file_extension: str = None):
@@ -46,12 +78,15 @@ class ApiPeptidesController(ApiAbstractPeptideController):
                         "sequence": ["not found"]
                     }
                 }), 404
-            # Return peptide if is_reviewed is not requested (None),
+            # Return peptide if is_reviewed is not requested (None), which is the common case, so it is checked first,
             # or is_reviewed is requested and True and metadata is_swiss_prot is also True
             # or is_reviewed is requested and False and metadata is_trembl is True
-            if is_reviewed is None \
-                or is_reviewed and peptide.metadata.is_swiss_prot \
-                or not is_reviewed and peptide.metadata.is_trembl:
+            if is_reviewed is None:
+                return Response(
+                    peptide.to_json(),
+                    content_type="application/json"
+                )
+            if (is_reviewed and peptide.metadata.is_swiss_prot) or (not is_reviewed and peptide.metadata.is_trembl):
                 return Response(
                     peptide.to_json(),
                     content_type="application/json"
@@ -78,18 +113,8 @@ class ApiPeptidesController(ApiAbstractPeptideController):
                 True
             )
 
-            reviewed_proteins = []
-            unreviewed_proteins = []
-
-            for protein in proteins:
-                if protein.is_reviewed:
-                    reviewed_proteins.append(
-                        protein
-                    )
-                else:
-                    unreviewed_proteins.append(
-                        protein
-                    )
+            reviewed_proteins = [protein for protein in proteins if protein.is_reviewed]
+            unreviewed_proteins = [protein for protein in proteins if not protein.is_reviewed]
 
             def json_stream() -> Iterator[bytes]:
                 yield b"{\"reviewed_proteins\": ["
@@ -105,7 +130,7 @@ class ApiPeptidesController(ApiAbstractPeptideController):
                 yield b"]}"
                 
             return Response(
-                json_stream(),
+                buffered_stream(json_stream()),
                 content_type="application/json"
             )
 
@@ -139,16 +164,23 @@ class ApiPeptidesController(ApiAbstractPeptideController):
             if "do_database_search" in data and isinstance(data["do_database_search"], bool) and data["do_database_search"]:
                 database_connection = get_database_connection()           
                 with database_connection.cursor() as database_cursor:
+                    # Pass the keys as three arrays, so the query string stays the same regardless of the number of peptides
                     database_peptides = Peptide.select(
                         database_cursor,
                         WhereCondition(
-                            ["(partition, mass, sequence) IN %s"],
-                            (tuple((peptide.partition, peptide.mass, peptide.sequence) for peptide in digestion_peptides),)
+                            ["(partition, mass, sequence) IN (SELECT * FROM UNNEST(%s::INT[], %s::BIGINT[], %s::VARCHAR[]))"],
+                            [
+                                [peptide.partition for peptide in digestion_peptides],
+                                [peptide.mass for peptide in digestion_peptides],
+                                [peptide.sequence for peptide in digestion_peptides]
+                            ]
                         ),
                         fetchall=True
                     )
                 database_peptides.sort(key = lambda peptide: peptide.mass)
-                digestion_peptides = [peptide for peptide in digestion_peptides if peptide not in database_peptides]
+                # Set of keys for constant time lookups, instead of scanning the database peptides for each digestion peptide
+                database_peptide_keys = {(peptide.mass, peptide.sequence) for peptide in database_peptides}
+                digestion_peptides = [peptide for peptide in digestion_peptides if (peptide.mass, peptide.sequence) not in database_peptide_keys]
 
             digestion_peptides.sort(key = lambda peptide: peptide.mass)
 
@@ -164,10 +196,10 @@ class ApiPeptidesController(ApiAbstractPeptideController):
                     if peptide_idx > 0:
                         yield b","
                     yield from peptide.to_json()
-                yield f"],\"count\": {len(database_peptides) +  len(digestion_peptides)}}}".encode("utf-8")
+                yield b"],\"count\": %d}" % (len(database_peptides) + len(digestion_peptides))
                 
             return Response(
-                json_stream(),
+                buffered_stream(json_stream()),
                 content_type="application/json"
             )
 
@@ -177,6 +209,48 @@ class ApiPeptidesController(ApiAbstractPeptideController):
             }), 422
 
 
+    @staticmethod
+    def __lookup_partition(partition: int, peptide_keys: List[Tuple[int, str]]) -> Set[str]:
+        """
+        Looks up the given peptides of a partition in chunks of `PEPTIDE_LOOKUP_CHUNKS` with a separate database connection.
+
+        Parameters
+        ----------
+        partition : int
+            Partition of the peptides
+        peptide_keys : List[Tuple[int, str]]
+            Mass and sequence of the peptides to look up
+
+        Returns
+        -------
+        Found sequences
+        """
+        found_sequences = set()
+        database_connection = macpepdb_pool.getconn()
+        try:
+            for chunk_start in range(0, len(peptide_keys), ApiPeptidesController.PEPTIDE_LOOKUP_CHUNKS):
+                chunk = peptide_keys[chunk_start:(chunk_start + ApiPeptidesController.PEPTIDE_LOOKUP_CHUNKS)]
+                # A named (server side) cursor can only execute one query, so each chunk gets its own.
+                # Otherwise the client side cursor would buffer the whole result.
+                with database_connection.cursor(name="sequence_lookup") as database_cursor:
+                    database_cursor.itersize = ApiPeptidesController.FETCH_ITERSIZE
+                    # Masses and sequences are passed as two arrays, so the query string is the same for each chunk
+                    # and the database joins the keys instead of evaluating a long list of alternatives.
+                    # Only the sequence is needed, so it is selected directly without creating peptides.
+                    database_cursor.execute(
+                        f"SELECT sequence FROM {Peptide.TABLE_NAME} WHERE partition = %s AND (mass, sequence) IN (SELECT * FROM UNNEST(%s::BIGINT[], %s::VARCHAR[]));",
+                        (
+                            partition,
+                            [mass for mass, _ in chunk],
+                            [sequence for _, sequence in chunk]
+                        )
+                    )
+                    # Iterating the named cursor fetches the rows in batches of its itersize
+                    found_sequences.update(row[0] for row in database_cursor)
+        finally:
+            macpepdb_pool.putconn(database_connection)
+        return found_sequences
+
     @staticmethod
     def sequence_lookup():
         """
@@ -194,47 +268,56 @@ class ApiPeptidesController(ApiAbstractPeptideController):
             errors["sequences"].append("cannot be empty")
         elif not isinstance(data["sequences"], list):
             errors["sequences"].append("must be a list")
-
-        peptides = [Peptide(sequence, 0) for sequence in data["sequences"]]
-        # Sort peptides by partition
-        partitions = defaultdict(list)
-        for peptide in peptides:
-            partitions[peptide.partition].append(peptide)
+        elif len(data["sequences"]) > ApiPeptidesController.MAX_LOOKUP_SEQUENCES:
+            errors["sequences"].append(f"must not contain more than {ApiPeptidesController.MAX_LOOKUP_SEQUENCES} sequences")
 
         if len(errors) > 0:
             return jsonify({
                 "errors": errors
             }), 422
 
+        # Nothing to look up, so do not take a connection from the pool
+        if not data["sequences"]:
+            return Response(b"", content_type="text/plain")
+
+        # Sort the lookup keys by partition. Only mass and partition are needed, so no peptides are created.
+        # The dictionaries remove duplicate sequences while keeping the order of the request.
+        partitions = defaultdict(dict)
+        sequence_partitions = {}
+        for sequence in data["sequences"]:
+            sequence = sequence.upper()
+            partition, mass = get_partition_and_mass(sequence)
+            partitions[partition][sequence] = mass
+            sequence_partitions[sequence] = partition
+        partitions = {partition: [(mass, sequence) for sequence, mass in sequence_masses.items()] for partition, sequence_masses in partitions.items()}
+
         def generate_text_stream() -> Iterator[str]:
-            database_connection = macpepdb_pool.getconn()
+            # The partitions are independent, so they are looked up concurrently, each with its own connection from the pool.
+            # Keep half of the pool for other requests. This generator holds no connection itself, so the workers can not starve it.
+            max_workers = max(min(len(partitions), macpepdb_pool.maxconn // 2), 1)
+            executor = ThreadPoolExecutor(max_workers=max_workers)
             try:
-                with database_connection.cursor() as database_cursor:
-                    database_cursor.itersize = ApiPeptidesController.PEPTIDE_LOOKUP_CHUNKS
-                    # Request each partition in a separate query
-                    for partition, part_peptides in partitions.items():
-                        # Chunk the peptides in 500 
-                        chunk_start = 0
-                        while chunk_start < len(part_peptides):
-                            chunk = part_peptides[chunk_start:(chunk_start + ApiPeptidesController.PEPTIDE_LOOKUP_CHUNKS)]
-                            for peptide_idx, peptide in enumerate(Peptide.select(
-                                database_cursor,
-                                WhereCondition(
-                                    [
-                                        "partition = %s",
-                                        "AND"
-                                        "(mass, sequence) IN (" + ",".join(["(%s, %s)"] * len(chunk)) + ")"
-                                    ],
-                                    [partition] + list(itertools.chain(*[(peptide.mass, peptide.sequence) for peptide in chunk])),
-                                ),
-                                stream=True
-                            )):
-                                if peptide_idx > 0:
-                                    yield "\n"
-                                yield peptide.sequence
-                            chunk_start += ApiPeptidesController.PEPTIDE_LOOKUP_CHUNKS
-
+                lookups = {
+                    partition: executor.submit(ApiPeptidesController.__lookup_partition, partition, part_peptides)
+                    for partition, part_peptides in partitions.items()
+                }
+                # The found sequences are returned in the order of the request. Waiting for the lookup of a sequence's partition
+                # does not stop the other lookups, so the output starts as soon as the partition of the first sequences is done.
+                # Errors of the lookups are raised by `result()`.
+                found_sequences = (
+                    sequence for sequence, partition in sequence_partitions.items()
+                    if sequence in lookups[partition].result()
+                )
+                is_first_chunk = True
+                chunk = list(islice(found_sequences, ApiPeptidesController.PEPTIDE_LOOKUP_CHUNKS))
+                while chunk:
+                    if not is_first_chunk:
+                        yield "\n"
+                    is_first_chunk = False
+                    yield "\n".join(chunk)
+                    chunk = list(islice(found_sequences, ApiPeptidesController.PEPTIDE_LOOKUP_CHUNKS))
             finally:
-                macpepdb_pool.putconn(database_connection)
+                # Do not start pending lookups if the client is gone
+                executor.shutdown(wait=True, cancel_futures=True)
 
         return Response(generate_text_stream(), content_type="text/plain")
@@ -1,12 +1,14 @@
 from typing import ClassVar, Iterator, Optional, Tuple
-from flask import request, jsonify, Response, request
+from flask import request, Response
 
 from macpepdb.database.query_helpers.where_condition import WhereCondition
 from macpepdb.proteomics.amino_acid import AminoAcid
 from macpepdb.models.protein import Protein
 from macpepdb.models.peptide import Peptide
 from macpepdb.models.protein_peptide_association import ProteinPeptideAssociation
-from macpepdb.web.server import app, get_database_connection
+from macpepdb.utilities.buffered_stream import buffered_stream
+from macpepdb.web.utility.json_response import jsonify
+from macpepdb.web.server import app, get_database_connection, macpepdb_pool
 from macpepdb.web.controllers.application_controller import ApplicationController
 from macpepdb.web.controllers.api.api_digestion_controller import ApiDigestionController
 from macpepdb.web.utility.content_type import ContentType
@@ -17,6 +19,10 @@ class ApiProteinsController(ApplicationController):
         ContentType.json
     )
 
+    PEPTIDES_FETCH_SIZE: ClassVar[int] = 1024
+    """Number of peptides which are fetched at once when streaming the peptides of a protein
+    """
+
     @staticmethod
     def show(accession: str):
         accession = accession.upper()
@@ -46,55 +52,77 @@ class ApiProteinsController(ApplicationController):
                 }), 404
 
     @staticmethod
-    def peptides(accession: str, file_extension: Optional[str] = None):
-        database_connection = get_database_connection()
-        with database_connection.cursor() as database_cursor:
-                peptides = Peptide.select(
+    def __stream_peptides(accession: str) -> Iterator[Peptide]:
+        """
+        Yields the peptides of the given protein ordered by mass, fetched in batches by a server side cursor.
+        In a generator the response is already returned and the app context is teared down, so a connection from the pool is used.
+
+        Parameters
+        ----------
+        accession : str
+            Protein accession
+
+        Yields
+        ------
+        Iterator[Peptide]
+            Peptides
+        """
+        database_connection = macpepdb_pool.getconn()
+        try:
+            with database_connection.cursor(name="protein_peptides") as database_cursor:
+                database_cursor.itersize = ApiProteinsController.PEPTIDES_FETCH_SIZE
+                yield from Peptide.select(
                     database_cursor,
                     WhereCondition(
                         [f"(peps.partition, peps.mass, peps.sequence) IN (SELECT partition, peptide_mass, peptide_sequence FROM {ProteinPeptideAssociation.TABLE_NAME} as ppa WHERE ppa.protein_accession = %s)"],
                         [accession]
                     ),
-                    fetchall=True,
+                    order_by="mass",
+                    stream=True,
                     include_metadata= False
                 )
-                peptides.sort(key = lambda peptide: peptide.mass)
+        finally:
+            macpepdb_pool.putconn(database_connection)
 
-                content_type: Optional[str] = ContentType.get_content_type_by_request(
-                    request,
-                    permitted_content_types=ApiProteinsController.PEPTIDES_PERMITTED_CONTENT_TYPES,
-                    default=ContentType.json
-                )
-                    
-                if content_type == ContentType.json:
-                    def json_stream() -> Iterator[bytes]:
-                        yield b"{\"peptides\": ["
-                        for peptide_idx, peptide in enumerate(peptides):
-                            if peptide_idx > 0:
-                                yield b","
-                            yield from peptide.to_json()
-                        yield b"]}"
-                        
-                    return Response(
-                        json_stream(),
-                        content_type=f"{content_type}; charset=utf-8"
-                    )
-                elif content_type == ContentType.csv:
-                    def csv_stream() -> Iterator[bytes]:
-                        yield ",".join(Peptide.CSV_HEADER + Peptide.METADATA_CSV_HEADER).encode()
+    @staticmethod
+    def peptides(accession: str, file_extension: Optional[str] = None):
+        content_type: Optional[str] = ContentType.get_content_type_by_request(
+            request,
+            permitted_content_types=ApiProteinsController.PEPTIDES_PERMITTED_CONTENT_TYPES,
+            default=ContentType.json
+        )
+            
+        if content_type == ContentType.json:
+            def json_stream() -> Iterator[bytes]:
+                yield b"{\"peptides\": ["
+                for peptide_idx, peptide in enumerate(ApiProteinsController.__stream_peptides(accession)):
+                    if peptide_idx > 0:
+                        yield b","
+                    yield from peptide.to_json()
+                yield b"]}"
+                
+            return Response(
+                buffered_stream(json_stream()),
+                content_type=f"{content_type}; charset=utf-8"
+            )
+        elif content_type == ContentType.csv:
+            def csv_stream() -> Iterator[bytes]:
+                yield ",".join(Peptide.CSV_HEADER + Peptide.METADATA_CSV_HEADER).encode()
+                yield b"\n"
+                # The peptides are selected without metadata, so choose the formatter once instead of creating a generator per peptide
+                csv_row_formatter = Peptide.csv_row_formatter(False)
+                for peptide_idx, peptide in enumerate(ApiProteinsController.__stream_peptides(accession)):
+                    if peptide_idx > 0:
                         yield b"\n"
-                        for peptide_idx, peptide in enumerate(peptides):
-                            if peptide_idx > 0:
-                                yield b"\n"
-                            yield from peptide.to_csv_row()
-                    return Response(
-                        csv_stream(),
-                        content_type=f"{content_type}; charset=utf-8",
-                        headers={
-                            "Content-Disposition": f"attachment; filename={accession}_peptides.csv"
-                        }
+                    yield csv_row_formatter(peptide)
+            return Response(
+                buffered_stream(csv_stream()),
+                content_type=f"{content_type}; charset=utf-8",
+                headers={
+                    "Content-Disposition": f"attachment; filename={accession}_peptides.csv"
+                }
 
-                    )
+            )
 
     @staticmethod
     def digest():
@@ -120,12 +148,14 @@ class ApiProteinsController(ApplicationController):
                     False
                 )
                 if protein:
-                    peptides = list(filter(
-                        lambda peptide: peptide.number_of_missed_cleavages <= data["maximum_number_of_missed_cleavages"] \
-                            and data["minimum_peptide_length"] <= peptide.length <= data["maximum_peptide_length"],
-                        protein.peptides(database_cursor)
-                    ))
-                    peptides.sort(key = lambda peptide: peptide.mass)
+                    # Filter and sort in the database, so only the requested peptides are transferred
+                    peptides = protein.peptides(
+                        database_cursor,
+                        order_by="mass",
+                        minimum_length=data["minimum_peptide_length"],
+                        maximum_length=data["maximum_peptide_length"],
+                        maximum_number_of_missed_cleavages=data["maximum_number_of_missed_cleavages"]
+                    )
                 else:
                     errors["accession"].append("not found")
 
@@ -136,9 +166,9 @@ class ApiProteinsController(ApplicationController):
                     if peptide_idx > 0:
                         yield b","
                     yield from peptide.to_json()
-                yield f"], \"count\": {len(peptides)}}}".encode("utf-8 ")
+                yield b"], \"count\": %d}" % len(peptides)
             return Response(
-                json_stream(),
+                buffered_stream(json_stream()),
                 content_type="application/json"
             )
         else:
@@ -1,10 +1,10 @@
 from collections import defaultdict
-from sqlalchemy.orm import sessionmaker, selectinload, exc as sqlalchemy_exceptions
-from flask import json, request, jsonify, url_for
+from flask import json, request, url_for
 
 from macpepdb.models.taxonomy import Taxonomy
 from macpepdb.models.taxonomy_merge import TaxonomyMerge
 
+from macpepdb.web.utility.json_response import jsonify
 from macpepdb.web.server import app, get_database_connection
 from macpepdb.web.controllers.application_controller import ApplicationController
 
@@ -51,13 +51,7 @@ class ApiTaxonomiesController(ApplicationController):
     def show(id):
         database_connection = get_database_connection()
         with database_connection.cursor() as database_cursor:
-            taxonomy = Taxonomy.select(database_cursor, ("id = %s", [id]))
-
-            if not taxonomy:
-                taxonomy_merge = TaxonomyMerge.select(database_cursor, ("source_id = %s", [id]))
-                if taxonomy_merge:
-                    taxonomy = Taxonomy.select(database_cursor, ("id = %s", [taxonomy_merge.target_id]))
-
+            taxonomy = Taxonomy.select_by_id_or_merged_id(database_cursor, id)
 
             response = None
             if taxonomy:
@@ -77,12 +71,7 @@ class ApiTaxonomiesController(ApplicationController):
     def sub_species(id):
         database_connection = get_database_connection()
         with database_connection.cursor() as database_cursor:
-            taxonomy = Taxonomy.select(database_cursor, ("id = %s", [id]))
-
-            if taxonomy is None:
-                taxonomy_merge = TaxonomyMerge.select(database_cursor, ("source_id = %s", [id]))
-                if taxonomy_merge:
-                    taxonomy = Taxonomy.select(database_cursor, ("id = %s", [taxonomy_merge.target_id]))
+            taxonomy = Taxonomy.select_by_id_or_merged_id(database_cursor, id)
 
             if taxonomy is not None:
                 return jsonify({
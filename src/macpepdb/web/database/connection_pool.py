@@ -3,31 +3,50 @@ Implements connection pooling for the database.
 """
 # std imports
 from threading import Semaphore
+from typing import Optional
 
 # external imports
-from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+
+class PoolTimeoutError(PoolError):
+    """
+    Raised if no connection becomes available within the timeout.
+    """
+    pass
 
 class ConnectionPool(ThreadedConnectionPool):
     """
     Extends psycopg2.pool.ThreadedConnectionPool by a semaphore,
     forcing a thread to wait if no connection is available.
 
+    `maxconn` should reflect the concurrency the database can actually handle,
+    a common starting point is `number_of_database_cores * 2 + number_of_disks`.
+
     Parameters
     ----------
     minconn : int
         Minimum amount of connections
     maxconn : int
         Maximum amount of connections
+    timeout : Optional[float]
+        Seconds to wait for a connection before `PoolTimeoutError` is raised, None waits forever (default)
     """
 
-    def __init__(self, minconn, maxconn, *args, **kwargs):
+    def __init__(self, minconn, maxconn, *args, timeout: Optional[float] = None, **kwargs):
         self._semaphore = Semaphore(maxconn)
+        self.__timeout = timeout
         super().__init__(minconn, maxconn, *args, **kwargs)
 
     def getconn(self, *args, **kwargs):
-        self._semaphore.acquire()
-        return super().getconn(*args, **kwargs)
+        if not self._semaphore.acquire(timeout=self.__timeout):
+            raise PoolTimeoutError(f"no database connection available within {self.__timeout} seconds")
+        try:
+            return super().getconn(*args, **kwargs)
+        except BaseException:
+            # Connecting failed, so give the permit back. Otherwise the pool shrinks with every failed connection.
+            self._semaphore.release()
+            raise
 
     def putconn(self, *args, **kwargs):
         super().putconn(*args, **kwargs)
-        self._semaphore.release()
\ No newline at end of file
+        self._semaphore.release()
@@ -1,3 +1,6 @@
+# std imports
+from typing import Callable, Optional, Tuple
+
 # 3rd party imports
 from flask import Flask
 
@@ -10,7 +13,43 @@ from macpepdb.web.controllers.api.api_peptides_controller import ApiPeptidesCont
 from macpepdb.web.controllers.api.api_proteins_controller import ApiProteinsController
 from macpepdb.web.controllers.api.api_taxonomies_controller import ApiTaxonomiesController
 
+ROUTES: Tuple[Tuple[str, Callable, Optional[Tuple[str, ...]], Optional[str]], ...] = (
+    # Dashboard controller
+    ("/api/dashboard/status", ApiDashboardController.status, None, None),
+    ("/api/dashboard/maintenance", ApiDashboardController.maintenance, None, None),
+
+    # Modifications controller
+    ("/api/modifications/positions", ApiModificationsController.modification_positions, None, None),
+
+    # Proteins controller
+    ("/api/proteins/<string:accession>", ApiProteinsController.show, None, "protein_show"),
+    ("/api/proteins/<string:accession>/peptides", ApiProteinsController.peptides, None, None),
+    ("/api/proteins/<string:accession>/peptides.<string:file_extension>", ApiProteinsController.peptides, None, "protein_peptides_file_ext"),
+    ("/api/proteins/digest", ApiProteinsController.digest, ("POST",), "protein_digest"),
+    ("/api/proteins/amino-acids", ApiProteinsController.amino_acids, None, None),
 
+    # Peptides controller
+    ("/api/peptides/search", ApiPeptidesController.search, ("POST",), "peptide_search"),
+    ("/api/peptides/search.<string:file_extension>", ApiPeptidesController.search, ("POST",), "peptide_search_file_ext"),
+    ("/api/peptides/<string:sequence>", ApiPeptidesController.show, ("GET",), "peptide_show"),
+    ("/api/peptides/<string:sequence>/proteins", ApiPeptidesController.proteins, ("GET",), None),
+    ("/api/peptides/mass/<string:sequence>", ApiPeptidesController.sequence_mass, ("GET",), None),
+    ("/api/peptides/digest", ApiPeptidesController.digest, ("POST",), "peptide_digest"),
+    ("/api/peptides/lookup", ApiPeptidesController.sequence_lookup, ("POST",), None),
+
+    # Taxonomy controller
+    ("/api/taxonomies/search", ApiTaxonomiesController.search, ("POST",), "taxonomy_search"),
+    ("/api/taxonomies/<int:id>", ApiTaxonomiesController.show, None, "taxonomy_show"),
+    ("/api/taxonomies/<int:id>/sub-species", ApiTaxonomiesController.sub_species, None, None),
+    ("/api/taxonomies/by/ids", ApiTaxonomiesController.by_ids, ("POST",), None),
+
+    # Documents controller
+    ("/api/documents/20220314-macpepdb__increasing-performance.pdf", ApiDocumentsController.increasing_performance, None, None),
+    ("/api/documents/20220331-enhancement_of_macpepdb.pdf", ApiDocumentsController.enhancement, None, None),
+)
+"""Routes as tuples of URL rule, view function, HTTP methods (None for GET) and endpoint name (None to derive it from the view function).
+If multiple functions assigned to view_func have the same name, regardless of the controller name, they need a distinct endpoint name.
+"""
 
 def register_routes(app: Flask):
     """
@@ -21,39 +60,5 @@ def register_routes(app: Flask):
     app : Flask
         Flask app
     """
-    # If multiple function assigned to view_func of app.add_url_rule has the same name, regardless of the controller name,
-    # you have to give them a distinct endpioint name.
-
-    # Dashboard controller
-    app.add_url_rule("/api/dashboard/status", view_func=ApiDashboardController.status)
-    app.add_url_rule("/api/dashboard/maintenance", view_func=ApiDashboardController.maintenance)
-    
-    # Modifications controller
-    app.add_url_rule("/api/modifications/positions", view_func=ApiModificationsController.modification_positions)
-
-    # Proteins controller
-    app.add_url_rule("/api/proteins/<string:accession>", view_func=ApiProteinsController.show, endpoint="protein_show")
-    app.add_url_rule("/api/proteins/<string:accession>/peptides", view_func=ApiProteinsController.peptides)
-    app.add_url_rule("/api/proteins/<string:accession>/peptides.<string:file_extension>", view_func=ApiProteinsController.peptides, endpoint="protein_peptides_file_ext")
-    app.add_url_rule("/api/proteins/digest", view_func=ApiProteinsController.digest, methods=["POST"], endpoint="protein_digest")
-    app.add_url_rule("/api/proteins/amino-acids", view_func=ApiProteinsController.amino_acids)
-
-    # Peptides controller
-    app.add_url_rule("/api/peptides/search", view_func=ApiPeptidesController.search, methods=["POST"], endpoint="peptide_search")
-    app.add_url_rule("/api/peptides/search.<string:file_extension>", view_func=ApiPeptidesController.search, methods=["POST"], endpoint="peptide_search_file_ext")
-    app.add_url_rule("/api/peptides/<string:sequence>", view_func=ApiPeptidesController.show, methods=["GET"], endpoint="peptide_show")
-    app.add_url_rule("/api/peptides/<string:sequence>/proteins", view_func=ApiPeptidesController.proteins, methods=["GET"])
-    app.add_url_rule("/api/peptides/mass/<string:sequence>", view_func=ApiPeptidesController.sequence_mass, methods=["GET"])
-    app.add_url_rule("/api/peptides/digest", view_func=ApiPeptidesController.digest, methods=["POST"], endpoint="peptide_digest")
-    app.add_url_rule("/api/peptides/lookup", view_func=ApiPeptidesController.sequence_lookup, methods=["POST"])
-
-    # Taxonomy controller
-    app.add_url_rule("/api/taxonomies/search", view_func=ApiTaxonomiesController.search, methods=["POST"], endpoint="taxonomy_search")
-    app.add_url_rule("/api/taxonomies/<int:id>", view_func=ApiTaxonomiesController.show, endpoint="taxonomy_show")
-    app.add_url_rule("/api/taxonomies/<int:id>/sub-species", view_func=ApiTaxonomiesController.sub_species)
-    app.add_url_rule("/api/taxonomies/by/ids", view_func=ApiTaxonomiesController.by_ids, methods=["POST"])
-
-    # Documents controller
-    app.add_url_rule("/api/documents/20220314-macpepdb__increasing-performance.pdf", view_func=ApiDocumentsController.increasing_performance)
-    app.add_url_rule("/api/documents/20220331-enhancement_of_macpepdb.pdf", view_func=ApiDocumentsController.enhancement)
-    
+    for rule, view_func, methods, endpoint in ROUTES:
+        app.add_url_rule(rule, endpoint=endpoint, view_func=view_func, methods=methods)
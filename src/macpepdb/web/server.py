@@ -1,10 +1,10 @@
 # std imports
 import argparse
+import atexit
 import json
 from pathlib import Path
 import re
 import traceback
-from threading import Thread
 from typing import Optional, Union, Dict, Any, List
 
 # 3rd part imports
@@ -13,10 +13,10 @@ from werkzeug.exceptions import HTTPException
 from werkzeug.middleware.proxy_fix import ProxyFix
 
 # internal imports
-from macpepdb.web.database.connection_pool import ConnectionPool
+from macpepdb.web.database.connection_pool import ConnectionPool, PoolTimeoutError
 from macpepdb.web.utility.configuration import Configuration, Environment
 from macpepdb.web.utility.headers.cross_origin_resource_sharing import add_allow_cors_headers
-from macpepdb.web.utility.matomo import track_request as matomo_track_request
+from macpepdb.web.utility.matomo import TrackingWorker as MatomoTrackingWorker
 
 app: Optional[Flask] = None
 """Flask application used for serving request
@@ -111,12 +111,29 @@ def get_app(config_file: Optional[Union[Path, str]] = None, environment: Optiona
             x_prefix=1
         )
 
-    macpepdb_pool = ConnectionPool(1, Configuration.values()['macpepdb']['pool_size'], Configuration.values()['macpepdb']['url'])
+    macpepdb_pool = ConnectionPool(
+        1,
+        Configuration.values()['macpepdb']['pool_size'],
+        Configuration.values()['macpepdb']['url'],
+        timeout=Configuration.values()['macpepdb'].get('pool_timeout')
+    )
 
-    @app.before_request
-    def track_request():
-        if  Configuration.values()["matomo"]["enabled"]:
-            track_thread = Thread(target=matomo_track_request, args=(
+    # The configuration does not change after initialization, so read the values used per request only once
+    is_debug: bool = Configuration.values()['debug']
+    matomo_config: Dict[str, Any] = Configuration.values()["matomo"]
+
+    if matomo_config["enabled"]:
+        matomo_url: str = matomo_config["url"]
+        matomo_site_id: int = matomo_config["site_id"]
+        matomo_auth_token: str = matomo_config["auth_token"]
+        # A single background thread sends the tracking requests, so the request handling never waits for Matomo
+        matomo_tracking_worker = MatomoTrackingWorker()
+        matomo_tracking_worker.start()
+        atexit.register(matomo_tracking_worker.stop)
+
+        @app.before_request
+        def track_request():
+            matomo_tracking_worker.track(
                 request.headers.get("User-Agent", ""),
                 request.remote_addr,
                 request.headers.get("Referer", ""),
@@ -125,14 +142,12 @@ def get_app(config_file: Optional[Union[Path, str]] = None, environment: Optiona
                 request.full_path,
                 request.query_string,
                 request.url.startswith("https"),
-                Configuration.values()["matomo"]["url"],
-                Configuration.values()["matomo"]["site_id"],
-                Configuration.values()["matomo"]["auth_token"], 
+                matomo_url,
+                matomo_site_id,
+                matomo_auth_token,
                 app,
-                Configuration.values()["debug"]
-            ))
-            track_thread.start()
-            request_store.track_thread = track_thread 
+                is_debug
+            )
 
     @app.teardown_appcontext
     def return_database_connection_to_pool(exception=None):
@@ -143,12 +158,6 @@ def get_app(config_file: Optional[Union[Path, str]] = None, environment: Optiona
         if database_connection:
             macpepdb_pool.putconn(database_connection)
 
-    @app.teardown_appcontext
-    def wait_for_track_request(exception=None):
-        track_thread = request_store.pop("track_thread", None)
-        if track_thread:
-            track_thread.join()
-
     @app.errorhandler(Exception)
     def handle_exception(e):
         response = None
@@ -164,6 +173,17 @@ def get_app(config_file: Optional[Union[Path, str]] = None, environment: Optiona
                 }
             })
             response.content_type = "application/json"
+        elif isinstance(e, PoolTimeoutError):
+            # All connections are busy, so the client should try again later
+            response = app.response_class(
+                response=json.dumps({
+                    "errors": {
+                        "general": str(e)
+                    }
+                }),
+                status=503,
+                mimetype='application/json'
+            )
         else:
             response = app.response_class(
                 response=json.dumps({
@@ -174,12 +194,12 @@ def get_app(config_file: Optional[Union[Path, str]] = None, environment: Optiona
                 status=500,
                 mimetype='application/json'
             )
-        if  Configuration.values()['debug']:
+        if is_debug:
             app.logger.error(traceback.format_exc())
             response = add_allow_cors_headers(response)
         return response
 
-    if  Configuration.values()['debug']:
+    if is_debug:
         @app.after_request
         def add_cors_header_in_development_mode(response):
             return add_allow_cors_headers(response)
@@ -1,7 +1,7 @@
 # std imports
 from __future__ import annotations
 from enum import Enum, unique
-from typing import Optional, Iterable, List
+from typing import Dict, FrozenSet, Optional, Iterable, List
 
 # 3rd party imports
 from flask import Request
@@ -70,11 +70,10 @@ class ContentType(Enum):
         KeyError
             If not found
         """
-        lower_value = value.lower()
-        for format in cls:
-            if format.value == lower_value:
-                return format
-        raise KeyError(f"f{value} not found")
+        content_type = CONTENT_TYPES_BY_VALUE.get(value.lower())
+        if content_type is None:
+            raise KeyError(f"f{value} not found")
+        return content_type
 
     @classmethod
     def get_content_type_by_request(cls, request: Request, permitted_content_types: Optional[Iterable[ContentType]] = None, default: Optional[ContentType] = None) -> ContentType:
@@ -96,7 +95,7 @@ class ContentType(Enum):
             Found content type
         """
         if permitted_content_types is None:
-            permitted_content_types = list(ContentType)
+            permitted_content_types = ALL_CONTENT_TYPES
         if default is None:
             default = ContentType.json
         accept_header: Optional[str] = request.headers.get("Accept", None)
@@ -107,13 +106,21 @@ class ContentType(Enum):
                     return accepted_content_type
             except KeyError:
                 pass
-        last_path_segment: str = request.path.split("/")[-1]
-        if "." in last_path_segment:
-            file_extension: str = last_path_segment.split(".")[-1]
+        _, _, last_path_segment = request.path.rpartition("/")
+        _, dot, file_extension = last_path_segment.rpartition(".")
+        if dot:
             try:
                 requested_content_type: ContentType = ContentType.from_name(file_extension)
                 if requested_content_type in permitted_content_types:
                     return requested_content_type
             except KeyError:
                 pass
-        return default
\ No newline at end of file
+        return default
+
+CONTENT_TYPES_BY_VALUE: Dict[str, ContentType] = {content_type.value: content_type for content_type in ContentType}
+"""Lookup for content types by value, e.g. "application/json"
+"""
+
+ALL_CONTENT_TYPES: FrozenSet[ContentType] = frozenset(ContentType)
+"""All content types, used if no permitted content types are given
+"""
@@ -0,0 +1,25 @@
+# std imports
+from typing import Any
+
+# 3rd party imports
+from flask import Response
+
+# internal imports
+from macpepdb.utilities.json_serialization import dumps as json_dumps
+
+def jsonify(obj: Any) -> Response:
+    """
+    Replacement for `flask.jsonify` which serializes with `macpepdb.utilities.json_serialization.dumps`,
+    which uses `orjson` if installed.
+
+    Parameters
+    ----------
+    obj : Any
+        JSON serializable object
+
+    Returns
+    -------
+    Response
+        JSON response
+    """
+    return Response(json_dumps(obj), content_type="application/json")
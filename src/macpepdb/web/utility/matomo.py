@@ -1,12 +1,73 @@
+from queue import Full as FullQueueError, Queue
+from threading import Thread
 import traceback
+from typing import Optional
 
 from flask import Flask
+from piwikapi.exceptions import ConfigurationError
 from piwikapi.tracking import PiwikTracker
+import urllib3
 from piwikapi.tests.request import FakeRequest
 
 from macpepdb.web.utility.headers.accept_language import AcceptLanguage
 
-def track_request(user_agent: str, client_ip: str, referer: str, accept_language_header: str, server_name: str, url_path: str, query_string: str, is_https: bool, matomo_url: str, matomo_site_id: int, matomo_auth_token: str, app: Flask, is_debug: bool):
+class PooledPiwikTracker(PiwikTracker):
+    """
+    Piwik tracker which sends the tracking requests over the given connection pool instead of opening a new connection for each request.
+
+    Parameters
+    ----------
+    id_site : int
+        Matomo site ID
+    request
+        Request to track
+    http_pool : urllib3.PoolManager
+        Connection pool which keeps the connection to Matomo alive
+    """
+
+    def __init__(self, id_site: int, request, http_pool: urllib3.PoolManager):
+        super().__init__(id_site, request)
+        self.__http_pool = http_pool
+
+    def _send_request(self, url: str) -> str:
+        """
+        Sends the tracking request and returns the response body.
+
+        Parameters
+        ----------
+        url : str
+            Encoded query string of the tracking request
+
+        Returns
+        -------
+        Response body
+        """
+        if not self.api_url:
+            raise ConfigurationError('API URL not set')
+        headers = {
+            'User-Agent': self.user_agent,
+            'Accept-Language': self.accept_language
+        }
+        if not self.cookie_support:
+            self.request_cookie = ''
+        elif self.request_cookie != '':
+            headers['Cookie'] = self.request_cookie
+        response = self.__http_pool.request("GET", f"{self.api_url}?{url}", headers=headers)
+        return response.data.decode("utf-8", errors="replace")
+
+
+def build_http_pool() -> urllib3.PoolManager:
+    """
+    Returns a connection pool for the tracking requests. Retries are disabled and the timeouts are short, so an unreachable Matomo does not stall the tracking.
+
+    Returns
+    -------
+    Connection pool
+    """
+    return urllib3.PoolManager(num_pools=1, maxsize=4, retries=False, timeout=urllib3.Timeout(connect=1.0, read=2.0))
+
+
+def track_request(user_agent: str, client_ip: str, referer: str, accept_language_header: str, server_name: str, url_path: str, query_string: str, is_https: bool, matomo_url: str, matomo_site_id: int, matomo_auth_token: str, app: Flask, is_debug: bool, http_pool: Optional[urllib3.PoolManager] = None):
     try:
         accept_languages = AcceptLanguage.parse(accept_language_header)
         accept_language_code = ""
@@ -22,7 +83,10 @@ def track_request(user_agent: str, client_ip: str, referer: str, accept_language
             'QUERY_STRING': query_string,
             'HTTPS': is_https
         })
-        piwiktracker = PiwikTracker(matomo_site_id, matomo_request)
+        if http_pool is not None:
+            piwiktracker = PooledPiwikTracker(matomo_site_id, matomo_request, http_pool)
+        else:
+            piwiktracker = PiwikTracker(matomo_site_id, matomo_request)
         piwiktracker.set_api_url(f"{matomo_url}/matomo.php")
         piwiktracker.set_ip(client_ip) # Optional, to override the IP
         piwiktracker.set_token_auth(matomo_auth_token)  # Optional, to override the IP
@@ -30,3 +94,89 @@ def track_request(user_agent: str, client_ip: str, referer: str, accept_language
     except:
         if is_debug:
             app.logger.error(traceback.format_exc()) # pylint: disable=no-member
+
+
+class TrackingWorker:
+    """
+    Sends tracking requests to Matomo in a single background thread, so the request handling does not wait for the tracking.
+    Tracking requests are dropped when the queue is full.
+
+    Parameters
+    ----------
+    max_queue_size : int
+        Maximum number of queued tracking requests
+    """
+
+    def __init__(self, max_queue_size: int = 1000):
+        self.__queue = Queue(maxsize=max_queue_size)
+        self.__dropped_requests = 0
+        self.__http_pool: Optional[urllib3.PoolManager] = None
+        self.__thread = Thread(target=self.__run, name="matomo_tracking", daemon=True)
+
+    @property
+    def dropped_requests(self) -> int:
+        """
+        Returns
+        -------
+        Number of tracking requests which were dropped because the queue was full
+        """
+        return self.__dropped_requests
+
+    def start(self):
+        """
+        Creates the connection pool and starts the background thread.
+        """
+        self.__http_pool = build_http_pool()
+        self.__thread.start()
+
+    def track(self, *track_request_args) -> bool:
+        """
+        Queues a tracking request without blocking.
+
+        Parameters
+        ----------
+        *track_request_args
+            Arguments for `track_request()`
+
+        Returns
+        -------
+        True if the tracking request was queued, False if it was dropped
+        """
+        try:
+            self.__queue.put_nowait(track_request_args)
+            return True
+        except FullQueueError:
+            self.__dropped_requests += 1
+            return False
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """
+        Sends the remaining tracking requests and stops the background thread.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            Seconds to wait for the background thread, by default 5.0
+        """
+        if not self.__thread.is_alive():
+            return
+        try:
+            # None signals the thread to stop after the queued tracking requests
+            self.__queue.put(None, timeout=timeout)
+        except FullQueueError:
+            return
+        self.__thread.join(timeout)
+        if not self.__thread.is_alive():
+            self.__http_pool.clear()
+
+    def __run(self):
+        """
+        Sends the queued tracking requests until None is received.
+        """
+        while True:
+            track_request_args = self.__queue.get()
+            if track_request_args is None:
+                break
+            # track_request() catches and logs all errors, so the thread keeps running.
+            # The pool keeps the connection to Matomo alive, so only the first tracking request pays for the TCP/TLS handshake.
+            track_request(*track_request_args, http_pool=self.__http_pool)
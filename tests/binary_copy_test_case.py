@@ -0,0 +1,26 @@
+# std imports
+import struct
+import unittest
+
+# internal imports
+from macpepdb.database.binary_copy import BinaryCopyBuffer
+
+class BinaryCopyBufferTestCase(unittest.TestCase):
+    def test_format(self):
+        copy_buffer = BinaryCopyBuffer("hqs")
+        copy_buffer.write_row((1, 1234567890123, "PEPTIDE"))
+        copy_buffer.write_row((2, None, "ÄB"))
+        self.assertEqual(copy_buffer.row_count, 2)
+
+        expected_data = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+        expected_data += struct.pack(">hihiqi", 3, 2, 1, 8, 1234567890123, 7) + b"PEPTIDE"
+        expected_data += struct.pack(">hihii", 3, 2, 2, -1, 3) + "ÄB".encode("utf-8")
+        expected_data += struct.pack(">h", -1)
+        self.assertEqual(copy_buffer.getvalue(), expected_data)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            BinaryCopyBuffer("hx")
+        copy_buffer = BinaryCopyBuffer("hh")
+        with self.assertRaises(ValueError):
+            copy_buffer.write_row((1,))
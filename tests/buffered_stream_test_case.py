@@ -0,0 +1,29 @@
+# std imports
+import unittest
+
+# internal imports
+from macpepdb.utilities.buffered_stream import buffered_stream
+
+class BufferedStreamTestCase(unittest.TestCase):
+    def test_buffered_stream(self):
+        chunks = [b"a" * 3, b"b" * 3, b"c" * 3, b"d"]
+        buffered_chunks = list(buffered_stream(iter(chunks), 5))
+        self.assertEqual([b"aaabbb", b"cccd"], buffered_chunks)
+        self.assertEqual(b"".join(chunks), b"".join(buffered_chunks))
+
+        self.assertEqual([], list(buffered_stream(iter([]))))
+        self.assertEqual([b"abc"], list(buffered_stream(iter([b"a", b"b", b"c"]))))
+
+    def test_close(self):
+        closed = []
+        def chunks():
+            try:
+                while True:
+                    yield b"a"
+            finally:
+                closed.append(True)
+
+        stream = buffered_stream(chunks(), 5)
+        self.assertEqual(b"aaaaa", next(stream))
+        stream.close()
+        self.assertEqual([True], closed)
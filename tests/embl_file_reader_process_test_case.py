@@ -0,0 +1,38 @@
+# std imports
+import pathlib
+import tempfile
+import unittest
+
+# internal imports
+from macpepdb import process_context
+from macpepdb.tasks.database_maintenance.multiprocessing.embl_file_reader_process import EmblFileReaderProcess
+from macpepdb.tasks.database_maintenance.multiprocessing.log_channel import LogChannel
+from macpepdb.utilities.shared_memory_ring_buffer import SharedMemoryRingBuffer
+
+class EmblFileReaderProcessTestCase(unittest.TestCase):
+    def test_entry_larger_than_queue(self):
+        small_entries = [b"ID   SMALL1\n//\n", b"ID   SMALL2\n//\n"]
+        large_entry = b"ID   LARGE\nSQ   " + b"A" * 1024 + b"\n//\n"
+        protein_queue = SharedMemoryRingBuffer(256, 16)
+        try:
+            with tempfile.TemporaryDirectory() as temporary_dir:
+                input_file_path = pathlib.Path(temporary_dir).joinpath("proteins.txt")
+                input_file_path.write_bytes(small_entries[0] + large_entry + small_entries[1])
+
+                unprocessible_connection_read, unprocessible_connection_write = process_context.Pipe(duplex=False)
+                embl_file_reader_process = EmblFileReaderProcess(process_context.Event(), [input_file_path], protein_queue, LogChannel(), unprocessible_connection_write)
+                embl_file_reader_process.start()
+                unprocessible_connection_write.close()
+
+                # The large entry is skipped, the file is read to the end
+                for small_entry in small_entries:
+                    self.assertEqual(small_entry, protein_queue.get(True, 5))
+                # The large entry is logged as unprocessible
+                self.assertEqual(large_entry, unprocessible_connection_read.recv_bytes())
+                with self.assertRaises(EOFError):
+                    unprocessible_connection_read.recv_bytes()
+
+                embl_file_reader_process.join(5)
+                self.assertFalse(embl_file_reader_process.is_alive())
+        finally:
+            protein_queue.unlink()
@@ -0,0 +1,61 @@
+# std imports
+import unittest
+
+# internal imports
+from macpepdb.models.peptide import Peptide # Import Peptide first to resolve the circular import of MetadataCondition
+from macpepdb.models.peptide_metadata import PeptideMetadata
+from macpepdb.helpers.metadata_condition import MetadataCondition
+
+class MetadataConditionTestCase(unittest.TestCase):
+    def test_validate(self):
+        metadata = PeptideMetadata(True, False, [1, 2, 3], [3], ["UP000000001"])
+
+        metadata_condition = MetadataCondition()
+        self.assertFalse(metadata_condition.has_conditions())
+        self.assertTrue(metadata_condition.validate(metadata))
+
+        metadata_condition.taxonomy_ids = [3, 4]
+        self.assertTrue(metadata_condition.validate(metadata))
+        metadata_condition.taxonomy_ids = [4, 5]
+        self.assertFalse(metadata_condition.validate(metadata))
+
+        metadata_condition.taxonomy_ids = None
+        metadata_condition.unique_taxonomy_ids = [3]
+        metadata_condition.proteome_id = "UP000000001"
+        metadata_condition.is_swiss_prot = True
+        self.assertTrue(metadata_condition.validate(metadata))
+        metadata_condition.proteome_id = "UP000000002"
+        self.assertFalse(metadata_condition.validate(metadata))
+
+    def test_is_intersecting(self):
+        self.assertTrue(MetadataCondition.is_intersecting([1, 2], (2, 3)))
+        self.assertFalse(MetadataCondition.is_intersecting([1, 2], (3, 4)))
+        self.assertFalse(MetadataCondition.is_intersecting([], (3, 4)))
+
+    def test_has_conditions(self):
+        metadata_condition = MetadataCondition()
+        metadata_condition.proteome_id = "UP000000001"
+        metadata_condition.is_trembl = False
+        self.assertTrue(metadata_condition.has_conditions())
+        self.assertEqual(MetadataCondition.PROTEOME_ID_CONDITION | MetadataCondition.IS_TREMBL_CONDITION, metadata_condition.condition_mask)
+        # Resetting the conditions clears the mask
+        metadata_condition.proteome_id = None
+        metadata_condition.is_trembl = None
+        self.assertFalse(metadata_condition.has_conditions())
+        self.assertEqual(0, metadata_condition.condition_mask)
+
+    def test_to_where_condition(self):
+        metadata_condition = MetadataCondition()
+        where_condition = metadata_condition.to_where_condition()
+        self.assertEqual([], where_condition.condition)
+        self.assertEqual([], where_condition.values)
+
+        metadata_condition.is_swiss_prot = True
+        metadata_condition.taxonomy_ids = [1, 2]
+        metadata_condition.proteome_id = "UP000000001"
+        where_condition = metadata_condition.to_where_condition()
+        self.assertEqual(
+            "meta.is_swiss_prot = %s AND meta.taxonomy_ids && %s::INT[] AND meta.proteome_ids @> %s::VARCHAR[]",
+            where_condition.get_condition_str(table="meta")
+        )
+        self.assertEqual([True, [1, 2], ["UP000000001"]], where_condition.values)
@@ -1,12 +1,35 @@
 # std imports
+import json
 import unittest
 
 # internal imports
 from macpepdb.models.peptide import Peptide
+from macpepdb.models.peptide_metadata import PeptideMetadata
 from macpepdb.proteomics.amino_acid import AminoAcid
 from macpepdb.proteomics.mass.convert import to_float as mass_to_float
 from macpepdb.proteomics.neutral_loss import H2O
 
+class FakeCursor:
+    """
+    Cursor which returns the given rows, to test how peptides are built from rows without a database.
+    """
+    def __init__(self, rows):
+        self.rows = rows
+        self.itersize = 2
+
+    def execute(self, query, values):
+        self.query = query
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
 # Fictional sequence 
 FICTIONAL_SEQUENCE = "AZVPIRKVJQODDEEWWTBKTLIKTUOIVCTRINDISHTJQSCCVSSKQRVTGJLDFYIPGLOHPLLBSLSKMCDWWOQTLA"
 
@@ -106,3 +129,45 @@ class PeptideTestCase(unittest.TestCase):
 
         self.assertEqual(mass, fictional_peptide.mass)
 
+    def test_to_json(self):
+        peptide = Peptide("PEPTIDEK", 1, PeptideMetadata(True, False, [9606, 1], [9606], ["UP000005640"]))
+        self.assertEqual(
+            b'{"mass":927.454927354,"sequence":"PEPTIDEK","length":8,"number_of_missed_cleavages":1,"metadata":'
+            b'{"is_swiss_prot":true,"is_trembl":false,"taxonomy_ids":[9606,1],"unique_taxonomy_ids":[9606],"proteome_ids":["UP000005640"]}}',
+            b"".join(peptide.to_json())
+        )
+
+        peptide = Peptide("PEPTIDEK", 1)
+        self.assertEqual(
+            {"mass": mass_to_float(peptide.mass), "sequence": "PEPTIDEK", "length": 8, "number_of_missed_cleavages": 1, "metadata": None},
+            json.loads(b"".join(peptide.to_json()))
+        )
+
+    def test_to_csv_row(self):
+        peptide = Peptide("PEPTIDEK", 1, PeptideMetadata(True, False, [9606, 1], [9606], ["UP000005640", "UP000000625"]))
+        self.assertEqual(
+            b'927.454927354,"PEPTIDEK",1,"true","false","9606,1","9606","UP000005640,UP000000625"',
+            b"".join(peptide.to_csv_row())
+        )
+        self.assertEqual(b'927.454927354,"PEPTIDEK",1', Peptide.csv_row_formatter(False)(peptide))
+        # Peptides without metadata have only the peptide columns
+        self.assertEqual(b'927.454927354,"PEPTIDEK",1', Peptide.csv_row_formatter(True)(Peptide("PEPTIDEK", 1)))
+
+    def test_select(self):
+        rows = [("PEPTIDEK", 1, 927454927354), ("PEPTIDER", 0, 955461075354), ("PEPK", 0, 471263150654)]
+
+        peptides = Peptide.select(FakeCursor(list(rows)), fetchall=True)
+        peptide = Peptide.select(FakeCursor(list(rows)))
+        streamed_peptides = list(Peptide.select(FakeCursor(list(rows)), stream=True))
+        for selected_peptides in [peptides, [peptide], streamed_peptides]:
+            for selected_peptide, row in zip(selected_peptides, rows):
+                self.assertEqual(row[0], selected_peptide.sequence)
+                self.assertEqual(row[1], selected_peptide.number_of_missed_cleavages)
+                # The stored mass is used, the metadata is not set
+                self.assertEqual(row[2], selected_peptide.mass)
+                self.assertIsNone(selected_peptide.metadata)
+                self.assertIsNone(json.loads(b"".join(selected_peptide.to_json()))["metadata"])
+        self.assertEqual(len(rows), len(streamed_peptides))
+
+        self.assertEqual(rows, Peptide.select(FakeCursor(list(rows)), fetchall=True, raw=True))
+        self.assertIsNone(Peptide.select(FakeCursor([])))
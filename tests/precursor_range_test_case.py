@@ -2,7 +2,7 @@
 import unittest
 
 # internal imports
-from macpepdb.proteomics.mass.precursor_range import PrecursorRange
+from macpepdb.proteomics.mass.precursor_range import PrecursorRange, get_precursor_range
 
 PRECURSOR = 1325887444084
 PRECURSOR_TOLERANCE = 5
@@ -65,4 +65,10 @@ class PrecursorRangeTestCase(unittest.TestCase):
         self.assertEqual(PRECURSOR, precursor_range)
         self.assertEqual(UPPER_LIMIT, precursor_range)
         self.assertNotEqual(LOWER_LIMIT-1, precursor_range)
-        self.assertNotEqual(UPPER_LIMIT+1, precursor_range)
\ No newline at end of file
+        self.assertNotEqual(UPPER_LIMIT+1, precursor_range)
+
+    def test_cached_precursor_range(self):
+        precursor_range = get_precursor_range(PRECURSOR, PRECURSOR_TOLERANCE, PRECURSOR_TOLERANCE)
+        self.assertEqual(LOWER_LIMIT, precursor_range.lower_limit)
+        self.assertEqual(UPPER_LIMIT, precursor_range.upper_limit)
+        self.assertIs(precursor_range, get_precursor_range(PRECURSOR, PRECURSOR_TOLERANCE, PRECURSOR_TOLERANCE))
@@ -0,0 +1,50 @@
+# std imports
+import unittest
+
+# internal imports
+from macpepdb import process_context
+from macpepdb.utilities.shared_memory_bloom_filter import SharedMemoryBloomFilter
+
+def add_accessions(bloom_filter: SharedMemoryBloomFilter, accessions: list):
+    for accession in accessions:
+        bloom_filter.add(accession)
+    bloom_filter.close()
+
+class SharedMemoryBloomFilterTestCase(unittest.TestCase):
+    def test_membership(self):
+        bloom_filter = SharedMemoryBloomFilter(1000, 0.01)
+        try:
+            added_accessions = [f"P{accession_idx:05}" for accession_idx in range(1000)]
+            for accession in added_accessions:
+                bloom_filter.add(accession)
+            # No false negatives
+            for accession in added_accessions:
+                self.assertIn(accession, bloom_filter)
+            # False positive rate roughly as requested
+            false_positives = sum(1 for accession_idx in range(10000) if f"Q{accession_idx:05}" in bloom_filter)
+            self.assertLess(false_positives, 300)
+        finally:
+            bloom_filter.unlink()
+
+    def test_shared_between_processes(self):
+        bloom_filter = SharedMemoryBloomFilter(100)
+        try:
+            accessions = [f"P{accession_idx:05}" for accession_idx in range(100)]
+            process = process_context.Process(target=add_accessions, args=(bloom_filter, accessions))
+            process.start()
+            process.join()
+            for accession in accessions:
+                self.assertIn(accession, bloom_filter)
+        finally:
+            bloom_filter.unlink()
+
+    def test_add_many(self):
+        bloom_filter = SharedMemoryBloomFilter(1000, 0.01)
+        try:
+            self.assertEqual(SharedMemoryBloomFilter.calculate_number_of_bits(1000, 0.01), bloom_filter.number_of_bits)
+            accessions = [f"P{accession_idx:05}" for accession_idx in range(1000)]
+            bloom_filter.add_many(accession for accession in accessions)
+            for accession in accessions:
+                self.assertIn(accession, bloom_filter)
+        finally:
+            bloom_filter.unlink()
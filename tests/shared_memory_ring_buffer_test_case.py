@@ -0,0 +1,83 @@
+# std imports
+import unittest
+from queue import Empty as EmptyQueueError, Full as FullQueueError
+
+# internal imports
+from macpepdb import process_context
+from macpepdb.utilities.shared_memory_ring_buffer import SharedMemoryRingBuffer
+
+def produce(ring_buffer: SharedMemoryRingBuffer, number_of_items: int):
+    for item_idx in range(number_of_items):
+        ring_buffer.put(str(item_idx).encode() * (item_idx % 7 + 1), True, 5)
+    ring_buffer.close()
+
+def produce_until_aborted(ring_buffer: SharedMemoryRingBuffer):
+    try:
+        while True:
+            ring_buffer.put(b"item")
+    except FullQueueError:
+        pass
+    ring_buffer.close()
+
+class SharedMemoryRingBufferTestCase(unittest.TestCase):
+    def test_fifo_with_wrap_around(self):
+        ring_buffer = SharedMemoryRingBuffer(64, 10)
+        try:
+            # Each item needs 8 bytes header + 20 bytes data
+            items = [bytes([item_idx]) * 20 for item_idx in range(10)]
+            ring_buffer.put(items[0])
+            ring_buffer.put(items[1])
+            with self.assertRaises(FullQueueError):
+                ring_buffer.put(items[2], False)
+            self.assertEqual(ring_buffer.get(), items[0])
+            # Wraps around
+            ring_buffer.put(items[2])
+            self.assertEqual(ring_buffer.qsize(), 2)
+            for item in items[1:3]:
+                self.assertEqual(ring_buffer.get(), item)
+            self.assertTrue(ring_buffer.empty())
+            with self.assertRaises(EmptyQueueError):
+                ring_buffer.get(True, 0.1)
+            with self.assertRaises(ValueError):
+                ring_buffer.put(b"x" * 64)
+        finally:
+            ring_buffer.unlink()
+
+    def test_max_items(self):
+        ring_buffer = SharedMemoryRingBuffer(1024, 2)
+        try:
+            ring_buffer.put(b"a")
+            ring_buffer.put(b"b")
+            with self.assertRaises(FullQueueError):
+                ring_buffer.put(b"c", True, 0.1)
+        finally:
+            ring_buffer.unlink()
+
+    def test_multiprocessing(self):
+        number_of_items = 1000
+        ring_buffer = SharedMemoryRingBuffer(256, 16)
+        try:
+            producer = process_context.Process(target=produce, args=(ring_buffer, number_of_items))
+            producer.start()
+            for item_idx in range(number_of_items):
+                self.assertEqual(ring_buffer.get(True, 5), str(item_idx).encode() * (item_idx % 7 + 1))
+            producer.join()
+        finally:
+            ring_buffer.unlink()
+
+    def test_abort(self):
+        ring_buffer = SharedMemoryRingBuffer(1024, 2)
+        try:
+            producer = process_context.Process(target=produce_until_aborted, args=(ring_buffer,))
+            producer.start()
+            # Producer blocks on the full buffer until it is aborted
+            producer.join(0.5)
+            self.assertTrue(producer.is_alive())
+            ring_buffer.abort()
+            producer.join(5)
+            self.assertFalse(producer.is_alive())
+            # Queued items are still available
+            self.assertEqual(ring_buffer.qsize(), 2)
+            self.assertEqual(ring_buffer.get(False), b"item")
+        finally:
+            ring_buffer.unlink()
@@ -0,0 +1,16 @@
+# std imports
+import unittest
+
+# internal imports
+from macpepdb.tasks.statistics import PARTITION_BOUND_REGEX
+
+class StatisticsTestCase(unittest.TestCase):
+    def test_partition_bound_regex(self):
+        # Bounds as returned by pg_get_expr(relpartbound, oid, true)
+        # bigint partition key (e.g. peptides.mass), which is quoted
+        self.assertEqual(("0", "100"), PARTITION_BOUND_REGEX.match("FOR VALUES FROM ('0') TO ('100')").groups())
+        # int partition key, negative values are quoted
+        self.assertEqual(("-50", "0"), PARTITION_BOUND_REGEX.match("FOR VALUES FROM ('-50') TO (0)").groups())
+        self.assertEqual(("0", "1000"), PARTITION_BOUND_REGEX.match("FOR VALUES FROM (0) TO (1000)").groups())
+        # Not an integer range bound
+        self.assertIsNone(PARTITION_BOUND_REGEX.match("FOR VALUES FROM (MINVALUE) TO ('100')"))
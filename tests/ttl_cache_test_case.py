@@ -0,0 +1,40 @@
+# std imports
+import time
+import unittest
+
+# internal imports
+from macpepdb.utilities.ttl_cache import TTLCache
+
+class TTLCacheTestCase(unittest.TestCase):
+    def test_get_or_set(self):
+        cache = TTLCache(60, 2)
+        calls = []
+        def factory(value):
+            calls.append(value)
+            return value
+
+        self.assertEqual(1, cache.get_or_set("a", lambda: factory(1)))
+        # Cached value is returned without calling the factory
+        self.assertEqual(1, cache.get_or_set("a", lambda: factory(2)))
+        self.assertEqual([1], calls)
+
+        # Least recently used entry ("b") is dropped when the cache is full
+        cache.get_or_set("b", lambda: factory(3))
+        cache.get_or_set("a", lambda: factory(4))
+        cache.get_or_set("c", lambda: factory(5))
+        self.assertEqual(6, cache.get_or_set("b", lambda: factory(6)))
+        self.assertEqual([1, 3, 5, 6], calls)
+
+        cache.clear()
+        self.assertEqual(7, cache.get_or_set("a", lambda: factory(7)))
+
+        # None is not cached
+        self.assertIsNone(cache.get_or_set("d", lambda: factory(None)))
+        self.assertEqual(8, cache.get_or_set("d", lambda: factory(8)))
+        self.assertEqual([1, 3, 5, 6, 7, None, 8], calls)
+
+    def test_expiration(self):
+        cache = TTLCache(0.05, 10)
+        self.assertEqual(1, cache.get_or_set("a", lambda: 1))
+        time.sleep(0.1)
+        self.assertEqual(2, cache.get_or_set("a", lambda: 2))
@@ -25,4 +25,26 @@ class UniprotTextReaderTestCase(unittest.TestCase):
         id_line_matches = id_line_regex.findall(test_file_plain_content)
 
         # Make sure all proteins are read
-        self.assertEqual(len(id_line_matches), len(proteins))
\ No newline at end of file
+        self.assertEqual(len(id_line_matches), len(proteins))
+
+    def test_raw_entry_reading(self):
+        test_file_path = pathlib.Path("./test_files/proteins.txt")
+
+        with test_file_path.open("r") as test_file:
+            proteins = list(UniprotTextReader(test_file))
+
+        with test_file_path.open("rb") as test_file:
+            raw_entries = list(UniprotTextReader.read_raw_entries(test_file))
+
+        self.assertEqual(len(proteins), len(raw_entries))
+        for protein, raw_entry in zip(proteins, raw_entries):
+            parsed_protein = UniprotTextReader.parse_raw_entry(raw_entry)
+            self.assertEqual(protein.accession, parsed_protein.accession)
+            self.assertEqual(protein.secondary_accessions, parsed_protein.secondary_accessions)
+            self.assertEqual(protein.entry_name, parsed_protein.entry_name)
+            self.assertEqual(protein.name, parsed_protein.name)
+            self.assertEqual(protein.sequence, parsed_protein.sequence)
+            self.assertEqual(protein.taxonomy_id, parsed_protein.taxonomy_id)
+            self.assertEqual(protein.proteome_id, parsed_protein.proteome_id)
+            self.assertEqual(protein.is_reviewed, parsed_protein.is_reviewed)
+            self.assertEqual(protein.updated_at, parsed_protein.updated_at)